@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+"""
+desc: |
+	A scaling benchmark for documentation generation. Synthetic packages of
+	increasing size (from 10 to 10,000 documented objects) are generated and
+	documented, and the time per object is measured end to end
+	(`DocFactory()` and `str()`) and separately for the following phases:
+
+	- parse: parsing the YAML docstrings
+	- introspect: creating doc objects and document models for the whole
+	  tree, with the parse cache warm
+	- render: generating Markdown from the tree, with the parse cache warm
+
+	Per-object times should be roughly constant across sizes. The results
+	are written as JSON and compared against a baseline, and the benchmark
+	fails if the per-object time grows more with size than in the baseline,
+	which indicates super-linear behavior.
+
+	~~~
+	python benchmarks/bench_scaling.py [--sizes 10 100 1000 10000]
+		[--output results.json] [--baseline FILE] [--update-baseline]
+	~~~
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import importlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+	__file__))))
+import yamldoc
+from yamldoc._cache import parseCache
+from yamldoc._diskcache import disableDiskCache
+
+timer = getattr(time, u'perf_counter', time.time)
+baselinePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+	u'baseline_scaling.json')
+# The package shapes (modules, classes per module, methods per class) for
+# each size, such that modules * (1 + classes * (1 + methods)) == size. The
+# package itself is documented as well.
+shapes = {
+	10		: (1, 3, 2),
+	100		: (1, 9, 10),
+	1000	: (10, 9, 10),
+	10000	: (100, 9, 10),
+	}
+phases = [u'parse', u'introspect', u'render', u'total']
+
+moduleTemplate = u'''
+"""
+desc:
+	Module number %(i)d, which contains %(nClasses)d classes. This is a
+	description that spans multiple lines, like most descriptions.
+"""
+
+'''
+
+classTemplate = u'''
+class Class%(i)d(object):
+
+	"""
+	desc:
+		Class number %(i)d of module %(module)d, which does something useful
+		with [Class%(i)d.method0].
+		It has a description that spans multiple lines, like most
+		descriptions.
+
+	example: |
+		obj = Class%(i)d()
+		obj.method0(1, u'x')
+	"""
+
+'''
+
+methodTemplate = u'''
+	def method%(i)d(self, a, b, c=None, d=u'default', *args, **kwargs):
+
+		"""
+		desc:
+			Method number %(i)d of class %(cls)d of module %(module)d, which
+			does something useful with `a` and `b`.
+			It has a description that spans multiple lines, like most
+			descriptions.
+
+		arguments:
+			a:
+				desc:	The first argument.
+				type:	[int, float]
+			b:
+				desc:	The second argument.
+				type:	[str, unicode]
+				valid:	[x, y, z]
+
+		keywords:
+			c:
+				desc:	A keyword with a default value.
+				type:	[int, NoneType]
+			d:
+				desc:	Another keyword.
+				type:	[str, unicode]
+
+		argument-list:
+			args:	Additional arguments.
+
+		keyword-dict:
+			kwargs:	Additional keywords.
+
+		returns:
+			desc:	A value %(i)d.
+			type:	bool
+		"""
+
+		return True
+'''
+
+def generatePackage(folder, name, nModules, nClasses, nMethods):
+
+	"""
+	desc:
+		Writes a synthetic package to a folder.
+
+	arguments:
+		folder:		The folder in which the package is created.
+		name:		The name of the package.
+		nModules:	The number of modules.
+		nClasses:	The number of classes per module.
+		nMethods:	The number of methods per class.
+	"""
+
+	pkgFolder = os.path.join(folder, name)
+	os.mkdir(pkgFolder)
+	modules = [u'module%d' % i for i in range(nModules)]
+	with open(os.path.join(pkgFolder, u'__init__.py'), u'w') as fd:
+		fd.write(u'"""\ndesc:\n\tA synthetic package.\n"""\n\n')
+		for module in modules:
+			fd.write(u'from %s import %s\n' % (name, module))
+	for i, module in enumerate(modules):
+		src = [moduleTemplate % {u'i': i, u'nClasses': nClasses}]
+		for j in range(nClasses):
+			# Docstrings are unique, so that they are not parsed only once
+			src.append(classTemplate % {u'i': j, u'module': i})
+			for k in range(nMethods):
+				src.append(methodTemplate % {u'i': k, u'cls': j,
+					u'module': i})
+		with open(os.path.join(pkgFolder, module + u'.py'), u'w') as fd:
+			fd.write(u''.join(src))
+
+def docStrings(df):
+
+	"""
+	desc:
+		Collects the docstrings of a doc object and its descendants.
+
+	arguments:
+		df:		A doc object.
+
+	returns:
+		desc:	A list of docstrings.
+		type:	list
+	"""
+
+	l = []
+	stack = [df]
+	while stack:
+		df = stack.pop()
+		docStr = df.docString()
+		if docStr is not None:
+			l.append(docStr)
+		stack.extend(df.children(df.model()))
+	return l
+
+def introspect(df):
+
+	"""
+	desc:
+		Creates the document models of a doc object and its descendants,
+		without rendering them. The children of each doc object are pinned,
+		so that the tree can subsequently be rendered without introspecting
+		the objects again.
+
+	arguments:
+		df:		A doc object.
+
+	returns:
+		desc:	The number of documented objects.
+		type:	int
+	"""
+
+	n = 0
+	stack = [df]
+	while stack:
+		df = stack.pop()
+		node = df.model()
+		if node.visible:
+			n += 1
+		children = list(df.children(node))
+		df.children = lambda node, children=children: iter(children)
+		stack.extend(children)
+	return n
+
+def measure(pkg, repeat):
+
+	"""
+	desc:
+		Measures the time of each phase for a package, as the best of several
+		repetitions.
+
+	arguments:
+		pkg:		The package module.
+		repeat:		The number of repetitions.
+
+	returns:
+		desc:	A dict with phases as keys and times in seconds as values,
+				and the number of documented objects.
+		type:	tuple
+	"""
+
+	best = dict((phase, float(u'inf')) for phase in phases)
+	for i in range(repeat):
+		parseCache.clear()
+		t0 = timer()
+		str(yamldoc.DocFactory(pkg))
+		best[u'total'] = min(best[u'total'], timer() - t0)
+		l = docStrings(yamldoc.DocFactory(pkg))
+		parseCache.clear()
+		t0 = timer()
+		for docStr in l:
+			try:
+				parseCache.load(docStr)
+			except Exception:
+				pass
+		best[u'parse'] = min(best[u'parse'], timer() - t0)
+		# The parse cache is now warm
+		df = yamldoc.DocFactory(pkg)
+		t0 = timer()
+		n = introspect(df)
+		best[u'introspect'] = min(best[u'introspect'], timer() - t0)
+		# The document models and children are now pinned
+		t0 = timer()
+		str(df)
+		best[u'render'] = min(best[u'render'], timer() - t0)
+	return best, n
+
+def run(sizes, repeat):
+
+	"""
+	desc:
+		Runs the benchmark for a number of sizes.
+
+	arguments:
+		sizes:		A list of sizes, which must be keys of `shapes`.
+		repeat:		The minimum number of repetitions.
+
+	returns:
+		desc:	The results.
+		type:	dict
+	"""
+
+	disableDiskCache()
+	# Make sure that the largest package fits in the parse cache
+	parseCache.resize(2 * max(sizes))
+	folder = tempfile.mkdtemp(prefix=u'yamldoc-bench-')
+	sys.path.insert(0, folder)
+	results = []
+	try:
+		for size in sizes:
+			nModules, nClasses, nMethods = shapes[size]
+			name = u'benchpkg%d' % size
+			generatePackage(folder, name, nModules, nClasses, nMethods)
+			pkg = importlib.import_module(name)
+			# Small packages are measured more often, because their timings
+			# are noisier.
+			times, n = measure(pkg, max(repeat, 1000 // size))
+			results.append({
+				u'size'		: size,
+				u'objects'	: n,
+				u'shape'	: [nModules, nClasses, nMethods],
+				u'seconds'	: times,
+				u'perObject': dict((phase, times[phase] / n) for phase in
+					phases),
+				})
+			print(u'%6d objects:  %s' % (n, u'  '.join(
+				u'%s %.1f us' % (phase, 1e6 * times[phase] / n) for phase in
+				phases)))
+	finally:
+		sys.path.remove(folder)
+		shutil.rmtree(folder)
+	return {
+		u'yamldoc'	: yamldoc.version,
+		u'python'	: platform.python_version(),
+		u'platform'	: platform.platform(),
+		u'repeat'	: repeat,
+		u'results'	: results,
+		}
+
+def growth(results, phase):
+
+	"""
+	desc:
+		Gets the growth of the per-object time of a phase, relative to the
+		smallest size with at least 100 objects, which is less noisy than the
+		smallest size.
+
+	arguments:
+		results:	A list of results per size.
+		phase:		The phase.
+
+	returns:
+		desc:	A dict with sizes as keys and growth factors as values.
+		type:	dict
+	"""
+
+	ref = [r for r in results if r[u'objects'] >= 100] or results
+	ref = ref[0][u'perObject'][phase]
+	return dict((r[u'size'], r[u'perObject'][phase] / ref) for r in results)
+
+def compare(current, baseline, tolerance):
+
+	"""
+	desc:
+		Compares results against a baseline. The growth of per-object times
+		with size is compared, because it does not depend much on the
+		machine, and an increase indicates super-linear behavior. Absolute
+		per-object times are compared as well, but because they depend on the
+		machine, differences are only reported as warnings.
+
+	arguments:
+		current:	The current results.
+		baseline:	The baseline results.
+		tolerance:	The factor by which a value may exceed the baseline.
+
+	returns:
+		desc:	A list of regressions.
+		type:	list
+	"""
+
+	regressions = []
+	baseResults = dict((r[u'size'], r) for r in baseline[u'results'])
+	for phase in phases:
+		currentGrowth = growth(current[u'results'], phase)
+		baseGrowth = growth(baseline[u'results'], phase)
+		for r in current[u'results']:
+			size = r[u'size']
+			if size not in baseResults:
+				continue
+			# Linear scaling is always acceptable, also if the per-object
+			# time decreased with size in the baseline.
+			if currentGrowth[size] > tolerance * max(1, baseGrowth[size]):
+				regressions.append(
+					u'%s at %d objects: per-object time grows %.2fx (baseline: %.2fx)' \
+					% (phase, r[u'objects'], currentGrowth[size],
+					baseGrowth[size]))
+			t = r[u'perObject'][phase]
+			tBase = baseResults[size][u'perObject'][phase]
+			if t > tolerance * tBase:
+				print(u'warning: %s at %d objects: %.1f us per object (baseline: %.1f us)' \
+					% (phase, r[u'objects'], 1e6 * t, 1e6 * tBase))
+	return regressions
+
+if __name__ == u'__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument(u'--sizes', type=int, nargs=u'*',
+		default=sorted(shapes), choices=sorted(shapes))
+	parser.add_argument(u'--repeat', type=int, default=3)
+	parser.add_argument(u'--output', default=None,
+		help=u'The file to which the results are written')
+	parser.add_argument(u'--baseline', default=baselinePath)
+	parser.add_argument(u'--update-baseline', action=u'store_true')
+	parser.add_argument(u'--tolerance', type=float, default=1.5)
+	args = parser.parse_args()
+	current = run(args.sizes, args.repeat)
+	if args.output is not None:
+		with open(args.output, u'w') as fd:
+			json.dump(current, fd, indent=1, sort_keys=True)
+	if args.update_baseline:
+		with open(args.baseline, u'w') as fd:
+			json.dump(current, fd, indent=1, sort_keys=True)
+		print(u'Baseline written to %s' % args.baseline)
+		sys.exit(0)
+	if not os.path.exists(args.baseline):
+		print(u'No baseline found at %s' % args.baseline)
+		sys.exit(0)
+	with open(args.baseline) as fd:
+		baseline = json.load(fd)
+	regressions = compare(current, baseline, args.tolerance)
+	for regression in regressions:
+		print(u'regression: %s' % regression)
+	sys.exit(1 if regressions else 0)
@@ -0,0 +1,457 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+"""
+desc: |
+	A micro-benchmark for the per-call overhead of `@yamldoc.validate`. Each
+	case calls a decorated function and the undecorated original, and
+	reports the overhead of validation in nanoseconds per call, in memory
+	blocks that remain allocated per call, and in peak bytes allocated
+	during a call. The cases are:
+
+	- positional: constrained arguments that are passed by position
+	- keywords: constrained arguments that are passed by keyword
+	- valid: arguments that are constrained by `valid:`
+	- method: a method, so that `self` is skipped
+	- returns: a function with a checked return value
+	- yields: a generator with a `yields:` section, which is wrapped but
+	  not consumed
+	- threads: the positional case, called from a thread pool
+
+	The results are written as JSON and compared against a baseline. Because
+	absolute timings depend on the machine, the benchmark fails if the
+	overhead relative to the cost of calling the undecorated function
+	exceeds the baseline by more than a tolerance. If the baseline was
+	recorded with the same Python version, allocations are compared with
+	the same tolerance as well.
+
+	~~~
+	python benchmarks/bench_validate.py [--calls N] [--output results.json]
+		[--baseline FILE] [--update-baseline]
+	~~~
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+	__file__))))
+import yamldoc
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+timer = getattr(time, u'perf_counter', time.time)
+baselinePath = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+	u'baseline_validate.json')
+nThreads = 4
+
+def positional(a, b, c):
+
+	"""
+	desc:
+		A function with constrained arguments.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+		b:
+			desc:	A float.
+			type:	[int, float]
+		c:
+			desc:	A string.
+			type:	[str, unicode]
+	"""
+
+	pass
+
+def keywords(a=0, b=0., c=u'', d=None, e=False):
+
+	"""
+	desc:
+		A function with constrained keywords.
+
+	keywords:
+		a:
+			desc:	An int.
+			type:	int
+		b:
+			desc:	A float.
+			type:	[int, float]
+		c:
+			desc:	A string.
+			type:	[str, unicode]
+		d:
+			desc:	A list or None.
+			type:	[list, NoneType]
+		e:
+			desc:	A bool.
+			type:	bool
+	"""
+
+	pass
+
+def valid(a, b):
+
+	"""
+	desc:
+		A function with arguments that are constrained by `valid:`.
+
+	arguments:
+		a:
+			desc:	One of a few strings.
+			valid:	[x, y, z]
+		b:
+			desc:	One of a few ints.
+			type:	int
+			valid:	[1, 2, 3]
+	"""
+
+	pass
+
+class Object(object):
+
+	"""
+	desc:
+		A class with a validated method.
+	"""
+
+	def method(self, a, b):
+
+		"""
+		desc:
+			A method with constrained arguments.
+
+		arguments:
+			a:
+				desc:	An int.
+				type:	int
+			b:
+				desc:	A string.
+				type:	[str, unicode]
+		"""
+
+		pass
+
+def returns(a):
+
+	"""
+	desc:
+		A function with a checked return value.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+
+	returns:
+		desc:	A bool.
+		type:	bool
+	"""
+
+	return True
+
+def yields(a):
+
+	"""
+	desc:
+		A generator with checked items.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+
+	yields:
+		desc:	An int.
+		type:	int
+	"""
+
+	yield a
+
+def cases():
+
+	"""
+	desc:
+		Creates the benchmark cases.
+
+	returns:
+		desc:	A list of (name, undecorated, decorated, args, kwargs, threaded)
+				tuples.
+		type:	list
+	"""
+
+	obj = Object()
+	validatedMethod = yamldoc.validate(Object.method)
+	return [
+		(u'positional', positional, yamldoc.validate(positional), (1, 2.,
+			u'x'), {}, False),
+		(u'keywords', keywords, yamldoc.validate(keywords), (), {u'a': 1,
+			u'b': 2., u'c': u'x', u'd': [], u'e': True}, False),
+		(u'valid', valid, yamldoc.validate(valid), (u'y', 2), {}, False),
+		(u'method', Object.method, validatedMethod, (obj, 1, u'x'), {},
+			False),
+		(u'returns', returns, yamldoc.validate(returns), (1,), {}, False),
+		(u'yields', yields, yamldoc.validate(yields), (1,), {}, False),
+		(u'threads', positional, yamldoc.validate(positional), (1, 2.,
+			u'x'), {}, True),
+		]
+
+def callLoop(func, args, kwargs, calls):
+
+	"""
+	desc:
+		Calls a function a number of times.
+
+	returns:
+		desc:	The duration in seconds.
+		type:	float
+	"""
+
+	loop = range(calls)
+	t0 = timer()
+	for i in loop:
+		func(*args, **kwargs)
+	return timer() - t0
+
+def threadedLoop(func, args, kwargs, calls):
+
+	"""
+	desc:
+		Calls a function a number of times, divided over a number of threads
+		that run concurrently.
+
+	returns:
+		desc:	The duration in seconds.
+		type:	float
+	"""
+
+	threads = [threading.Thread(target=callLoop, args=(func, args, kwargs,
+		calls // nThreads)) for i in range(nThreads)]
+	t0 = timer()
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	return timer() - t0
+
+def blocksPerCall(func, args, kwargs, calls):
+
+	"""
+	desc:
+		Measures the number of memory blocks that remain allocated after a
+		call, such as the blocks of the return value, as the difference
+		between `tracemalloc` snapshots before and after many calls. The
+		return values are kept until the second snapshot has been taken.
+		Temporary allocations are freed before the snapshot, and are
+		measured by `allocatedPerCall()` instead.
+
+	returns:
+		desc:	The average number of blocks per call, or None if
+				`tracemalloc` is not available.
+		type:	[float, NoneType]
+	"""
+
+	if tracemalloc is None:
+		return None
+	func(*args, **kwargs)
+	results = [None] * calls
+	# Allocations by tracemalloc itself, such as the first snapshot, are
+	# ignored.
+	filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+	tracemalloc.start()
+	try:
+		before = tracemalloc.take_snapshot().filter_traces(filters)
+		for i in range(calls):
+			results[i] = func(*args, **kwargs)
+		after = tracemalloc.take_snapshot().filter_traces(filters)
+	finally:
+		tracemalloc.stop()
+	blocks = sum(stat.count_diff for stat in after.compare_to(before,
+		u'filename'))
+	return float(blocks) / calls
+
+def allocatedPerCall(func, args, kwargs):
+
+	"""
+	desc:
+		Measures the peak memory that is allocated during a call, which is
+		freed again afterwards.
+
+	returns:
+		desc:	The number of bytes, or None if `tracemalloc` is not
+				available.
+		type:	[int, NoneType]
+	"""
+
+	if tracemalloc is None:
+		return None
+	# Call once, so that lazily initialized state is not counted
+	func(*args, **kwargs)
+	tracemalloc.start()
+	try:
+		current = tracemalloc.get_traced_memory()[0]
+		func(*args, **kwargs)
+		return tracemalloc.get_traced_memory()[1] - current
+	finally:
+		tracemalloc.stop()
+
+def measure(case, calls, repeat, allocCalls=1000):
+
+	"""
+	desc:
+		Measures a single case, as the best of several repetitions.
+
+	returns:
+		desc:	The results of the case.
+		type:	dict
+	"""
+
+	name, func, decorated, args, kwargs, threaded = case
+	loop = threadedLoop if threaded else callLoop
+	# The decorated and undecorated functions are measured in alternation,
+	# so that both are affected equally by fluctuations in machine load.
+	tFunc = tDecorated = float(u'inf')
+	for i in range(repeat):
+		tFunc = min(tFunc, loop(func, args, kwargs, calls))
+		tDecorated = min(tDecorated, loop(decorated, args, kwargs, calls))
+	nsFunc = 1e9 * tFunc / calls
+	nsDecorated = 1e9 * tDecorated / calls
+	bytesFunc = allocatedPerCall(func, args, kwargs)
+	bytesDecorated = allocatedPerCall(decorated, args, kwargs)
+	blocksFunc = blocksPerCall(func, args, kwargs, allocCalls)
+	blocksDecorated = blocksPerCall(decorated, args, kwargs, allocCalls)
+	return {
+		u'nsPerCall'		: nsFunc,
+		u'nsPerValidatedCall'	: nsDecorated,
+		u'nsOverhead'		: nsDecorated - nsFunc,
+		u'relativeOverhead'	: (nsDecorated - nsFunc) / nsFunc,
+		u'bytesOverhead'	: None if bytesFunc is None else \
+			bytesDecorated - bytesFunc,
+		u'blocksOverhead'	: None if blocksFunc is None else \
+			blocksDecorated - blocksFunc,
+		}
+
+def run(calls, repeat):
+
+	"""
+	desc:
+		Runs all cases.
+
+	returns:
+		desc:	The results.
+		type:	dict
+	"""
+
+	yamldoc.setValidationMode(u'on')
+	yamldoc.setInstrumentation(False)
+	results = {}
+	for case in cases():
+		r = measure(case, calls, repeat)
+		results[case[0]] = r
+		print(u'%-12s%8.0f ns/call overhead (%4.1fx)  %s bytes/call  '
+			u'%s blocks/call' % (case[0], r[u'nsOverhead'],
+			r[u'relativeOverhead'], r[u'bytesOverhead'],
+			r[u'blocksOverhead']))
+	return {
+		u'yamldoc'	: yamldoc.version,
+		u'python'	: platform.python_version(),
+		u'platform'	: platform.platform(),
+		u'calls'	: calls,
+		u'results'	: results,
+		}
+
+def compare(current, baseline, tolerance):
+
+	"""
+	desc:
+		Compares results against a baseline.
+
+	arguments:
+		current:	The current results.
+		baseline:	The baseline results.
+		tolerance:	The factor by which a value may exceed the baseline.
+					Allocations may also exceed the baseline by one block,
+					or by 64 bytes, because the baseline is often zero.
+
+	returns:
+		desc:	A list of regressions.
+		type:	list
+	"""
+
+	regressions = []
+	sameVersion = current[u'python'].split(u'.')[:2] == \
+		baseline[u'python'].split(u'.')[:2]
+	for name, r in sorted(current[u'results'].items()):
+		base = baseline[u'results'].get(name)
+		if base is None:
+			continue
+		if r[u'relativeOverhead'] > tolerance * base[u'relativeOverhead']:
+			regressions.append(
+				u'%s: overhead is %.1fx the undecorated call (baseline: %.1fx)' \
+				% (name, r[u'relativeOverhead'], base[u'relativeOverhead']))
+		if not sameVersion:
+			continue
+		for key, slack, unit in ((u'bytesOverhead', 64, u'bytes'),
+			(u'blocksOverhead', 1, u'blocks')):
+			if r.get(key) is None or base.get(key) is None:
+				continue
+			if r[key] > tolerance * max(0, base[key]) + slack:
+				regressions.append(
+					u'%s: %.2f %s allocated per call (baseline: %.2f)' % (
+					name, r[key], unit, base[key]))
+	return regressions
+
+if __name__ == u'__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument(u'--calls', type=int, default=100000)
+	parser.add_argument(u'--repeat', type=int, default=7)
+	parser.add_argument(u'--output', default=None,
+		help=u'The file to which the results are written')
+	parser.add_argument(u'--baseline', default=baselinePath)
+	parser.add_argument(u'--update-baseline', action=u'store_true')
+	parser.add_argument(u'--tolerance', type=float, default=2.)
+	args = parser.parse_args()
+	current = run(args.calls, args.repeat)
+	if args.output is not None:
+		with open(args.output, u'w') as fd:
+			json.dump(current, fd, indent=1, sort_keys=True)
+	if args.update_baseline:
+		with open(args.baseline, u'w') as fd:
+			json.dump(current, fd, indent=1, sort_keys=True)
+		print(u'Baseline written to %s' % args.baseline)
+		sys.exit(0)
+	if not os.path.exists(args.baseline):
+		print(u'No baseline found at %s' % args.baseline)
+		sys.exit(0)
+	with open(args.baseline) as fd:
+		baseline = json.load(fd)
+	regressions = compare(current, baseline, args.tolerance)
+	for regression in regressions:
+		print(u'regression: %s' % regression)
+	sys.exit(1 if regressions else 0)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import time
+import yaml
+from collections import OrderedDict
+from yamldoc._yaml import orderedLoad, libyaml
+
+docTemplate = u"""
+desc:
+	Function number %(i)d, which does something useful with [%(name)s]. It
+	has a description that spans multiple lines, like most descriptions.
+
+example: |
+	from mypackage import %(name)s
+	%(name)s(1, b=u'x')
+
+arguments:
+	a:
+		desc:	The first argument.
+		type:	[int, float]
+	b:
+		desc:	The second argument.
+		type:	[str, unicode]
+		valid:	[x, y, z]
+
+keywords:
+	c:
+		desc:	A keyword with a default value.
+		type:	[int, NoneType]
+
+argument-list:
+	args:	Additional arguments.
+
+keyword-dict:
+	kwargs:	Additional keywords.
+
+returns:
+	desc:	A value %(i)d.
+	type:	bool
+"""
+
+def legacyLoad(stream):
+
+	"""
+	desc:
+		The implementation of `orderedLoad()` in yamldoc 0.2.0, which creates
+		a new loader class for every docstring, and uses the pure-Python
+		loader.
+	"""
+
+	class OrderedLoader(yaml.Loader):
+		pass
+	def construct_mapping(loader, node):
+		loader.flatten_mapping(node)
+		return OrderedDict(loader.construct_pairs(node))
+	OrderedLoader.add_constructor(
+		yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+		construct_mapping)
+	return yaml.load(stream, OrderedLoader)
+
+def bench(load, docStrings):
+
+	t0 = time.time()
+	results = [load(docStr) for docStr in docStrings]
+	return time.time() - t0, results
+
+if __name__ == u'__main__':
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+	docStrings = [docTemplate.expandtabs() % {u'i': i, u'name': u'func%d' % i}
+		for i in range(n)]
+	tLegacy, legacy = bench(legacyLoad, docStrings)
+	tNew, new = bench(orderedLoad, docStrings)
+	assert legacy == new
+	print(u'Parsing %d docstrings (libyaml: %s)' % (n, libyaml))
+	print(u'legacy orderedLoad():\t%.3f s' % tLegacy)
+	print(u'orderedLoad():\t\t%.3f s' % tNew)
+	print(u'speedup:\t\t%.1fx' % (tLegacy / tNew))
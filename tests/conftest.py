@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+
+testDir = os.path.dirname(os.path.abspath(__file__))
+# The package itself and the fixture packages are imported from the source
+# tree, so that the tests don't depend on an installed copy.
+for path in (os.path.dirname(testDir), os.path.join(testDir, u'fixtures')):
+	if path not in sys.path:
+		sys.path.insert(0, path)
+
+# The golden files in tests/golden are snapshots of the current output. Set
+# YAMLDOC_UPDATE_GOLDEN=1 to rewrite them instead of comparing against them,
+# for example after changing a docstring. The files in tests/golden/baseline
+# were generated by the original renderer, and are never rewritten.
+updateGolden = os.environ.get(u'YAMLDOC_UPDATE_GOLDEN', u'') == u'1'
+
+def golden(name, output):
+
+	"""
+	desc:
+		Compares output against a golden file in `tests/golden`, or rewrites
+		the golden file if YAMLDOC_UPDATE_GOLDEN is set.
+
+	arguments:
+		name:	The name of the golden file.
+		output:	The output to compare.
+	"""
+
+	import io
+	path = os.path.join(testDir, u'golden', name)
+	if updateGolden:
+		with io.open(path, u'w', encoding=u'utf-8', newline=u'') as fd:
+			fd.write(output)
+		return
+	with io.open(path, encoding=u'utf-8', newline=u'') as fd:
+		expected = fd.read()
+	assert output == expected, u'Output differs from %s' % name
@@ -0,0 +1,17 @@
+"""
+Intro prose that is not YAML.
+
+---
+desc: |
+	The fixture package.
+
+	With [Markdown] and `code`.
+
+example: |
+	import fixpkg
+source:
+	- http://example.com
+---
+"""
+from fixpkg.core import Thing, helper
+from fixpkg import core
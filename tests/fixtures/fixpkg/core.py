@@ -0,0 +1,68 @@
+"""
+desc:
+	Core module.
+"""
+
+def helper(a, b=u'x', c=None, *args, **kw):
+	"""
+	desc:
+		A helper with __dunders__ and special chars: (1+2)! #tag [x] {y}.
+	arguments:
+		a:
+			desc:	An arg.
+			type:	[int, float]
+			valid:	[x, y]
+	keywords:
+		b:
+			desc:	B.
+			type:	str
+		c: Just a description.
+	argument-list:
+		args:	Extra.
+	keyword-dict:
+		kw:	Extra kw.
+	returns:
+		desc:	Something.
+		type:	[int, NoneType]
+	"""
+	return 1
+
+def prose():
+	"""This is just prose: with a colon. And more."""
+
+def nodoc(x):
+	pass
+
+def invisible():
+	"""
+	desc:	Hidden.
+	visible:	False
+	"""
+
+class Thing(object):
+	"""
+	desc:
+		A thing.
+
+
+
+		With many blank lines above.
+	"""
+	def __init__(self, x=[1, 2]):
+		"""
+		desc:	Ctor.
+		"""
+	def method(self, y):
+		"""
+		desc:	A method.
+		returns:	A value.
+		"""
+	@property
+	def prop(self):
+		"""
+		name:	prop
+		desc:	A property.
+		"""
+		return 1
+	def _private(self):
+		"""Prose doc."""
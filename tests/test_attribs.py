@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import types
+import yamldoc
+
+class Explosive(object):
+
+	# A descriptor that fails when it is evaluated, also on the class
+	def __get__(self, obj, cls=None):
+		raise RuntimeError(u'Evaluated')
+
+def raising(self):
+
+	"""
+	name:	raising
+	desc:	A property that fails when it is evaluated.
+	"""
+
+	raise RuntimeError(u'Evaluated')
+
+class A(object):
+
+	"""desc: A."""
+
+	def m(self):
+		"""desc: A.m"""
+
+	def a(self):
+		"""desc: A.a"""
+
+	explosive = Explosive()
+
+class B(A):
+
+	"""desc: B."""
+
+	def m(self):
+		"""desc: B.m"""
+
+	prop = property(raising)
+
+class C(A):
+
+	"""desc: C."""
+
+	def m(self):
+		"""desc: C.m"""
+
+	def c(self):
+		"""desc: C.c"""
+
+	@staticmethod
+	def s():
+		"""desc: C.s"""
+
+	@classmethod
+	def k(cls):
+		"""desc: C.k"""
+
+class D(B, C):
+
+	"""desc: D."""
+
+	def d(self):
+		"""desc: D.d"""
+
+def attribs(obj, **kwargs):
+
+	return yamldoc.DocFactory(obj, **kwargs).objAttribs(
+		types=[u'function', u'property'])
+
+def test_noEvaluation():
+
+	# Descriptors are listed as they are, without evaluating them
+	names = [name for name, attrib in \
+		yamldoc.DocFactory(B).objAttribs()]
+	assert u'explosive' in names
+	assert dict(attribs(B))[u'prop'] is B.__dict__[u'prop']
+	# And documenting them doesn't evaluate them either
+	md = str(yamldoc.DocFactory(B))
+	assert u'A property that fails when it is evaluated.' in md
+
+def test_mro():
+
+	# Members are sorted by name, and members of earlier classes in the
+	# method resolution order shadow those of later classes.
+	assert [name for name, attrib in attribs(D)] == [u'a', u'c', u'd', u'k',
+		u'm', u'prop', u's']
+	found = dict(attribs(D))
+	assert found[u'm'] is B.__dict__[u'm']
+	assert found[u'c'] is C.__dict__[u'c']
+	assert found[u'a'] is A.__dict__[u'a']
+	# Static and class methods are documented as the functions that they
+	# wrap.
+	assert found[u's'] is C.__dict__[u's'].__func__
+	assert found[u'k'] is C.__dict__[u'k'].__func__
+	assert isinstance(found[u's'], types.FunctionType)
+
+def test_notInherited():
+
+	assert [name for name, attrib in attribs(D, inherited=False)] == [u'd']
+	md = str(yamldoc.DocFactory(D, inherited=False))
+	assert u'D.d' in md and u'B.m' not in md
+
+def test_module():
+
+	# Only the module's own namespace is searched
+	import fixpkg.core
+	names = [name for name, attrib in yamldoc.DocFactory(
+		fixpkg.core).objAttribs(types=[u'class', u'function'])]
+	assert names == sorted(names)
+	assert u'Thing' in names and u'helper' in names
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import json
+import os
+import sys
+import yamldoc
+
+moduleSrc = u'''
+"""
+desc:	%s
+"""
+
+def func():
+
+	"""
+	desc:	A function.
+	"""
+'''
+
+def writeModule(path, desc):
+
+	with io.open(path, u'w', encoding=u'utf-8') as fd:
+		fd.write(moduleSrc % desc)
+
+def test_isolated(tmpdir, monkeypatch):
+
+	# A changed module is documented again in an isolated build, even though
+	# the old version has already been imported by the current process.
+	pkgDir = tmpdir.mkdir(u'isopkg')
+	writeModule(os.path.join(str(pkgDir), u'__init__.py'), u'Old.')
+	monkeypatch.syspath_prepend(str(tmpdir))
+	import isopkg
+	try:
+		assert u'Old.' in yamldoc.PackageBuild(u'isopkg').run().markdown()
+		writeModule(os.path.join(str(pkgDir), u'__init__.py'), u'New.')
+		md = yamldoc.PackageBuild(u'isopkg', isolated=True).run().markdown()
+		assert u'New.' in md and u'Old.' not in md
+	finally:
+		sys.modules.pop(u'isopkg', None)
+
+aliasSrc = u'''
+"""
+desc:	A module.
+"""
+
+from json import dumps
+
+def func():
+
+	"""
+	desc:	A function.
+	"""
+
+class Cls(object):
+
+	"""
+	desc:	A class.
+	"""
+
+	method = func
+'''
+
+def test_options(tmpdir, monkeypatch):
+
+	# Objects from outside the package are not documented, and objects that
+	# occur more than once are documented only the first time.
+	pkgDir = tmpdir.mkdir(u'aliaspkg')
+	with io.open(os.path.join(str(pkgDir), u'__init__.py'), u'w',
+		encoding=u'utf-8') as fd:
+		fd.write(aliasSrc)
+	monkeypatch.syspath_prepend(str(tmpdir))
+	try:
+		md = yamldoc.PackageBuild(u'aliaspkg').run().markdown()
+	finally:
+		sys.modules.pop(u'aliaspkg', None)
+	assert u'dumps' not in md
+	assert md.count(u'A function.') == 1
+
+def test_failedUpdate(tmpdir, monkeypatch):
+
+	# When a module that was documented before fails, its documentation and
+	# manifest entry are removed, so that they don't go stale.
+	pkgDir = tmpdir.mkdir(u'failpkg')
+	outDir = str(tmpdir.join(u'doc'))
+	writeModule(os.path.join(str(pkgDir), u'__init__.py'), u'Package.')
+	writeModule(os.path.join(str(pkgDir), u'mod.py'), u'Module.')
+	monkeypatch.syspath_prepend(str(tmpdir))
+	fragmentPath = os.path.join(outDir, u'failpkg.mod.md')
+	manifestPath = os.path.join(outDir, yamldoc.PackageBuild.manifestName)
+	build = yamldoc.PackageBuild(u'failpkg', isolated=True).update(outDir)
+	assert not build.errors and os.path.isfile(fragmentPath)
+	with io.open(os.path.join(str(pkgDir), u'mod.py'), u'a',
+		encoding=u'utf-8') as fd:
+		fd.write(u'raise Exception()\n')
+	build = yamldoc.PackageBuild(u'failpkg', isolated=True).update(outDir)
+	assert list(build.errors) == [u'failpkg.mod']
+	assert not os.path.exists(fragmentPath)
+	with io.open(manifestPath, encoding=u'utf-8') as fd:
+		manifest = json.load(fd)
+	assert list(manifest[u'modules']) == [u'failpkg']
+	assert list(manifest[u'symbols']) == [u'failpkg']
+	with io.open(os.path.join(outDir, u'index.md'), encoding=u'utf-8') as fd:
+		assert u'Module.' not in fd.read()
+	# The module is documented again once it is fixed
+	writeModule(os.path.join(str(pkgDir), u'mod.py'), u'Fixed.')
+	build = yamldoc.PackageBuild(u'failpkg', isolated=True).update(outDir)
+	assert build.rendered == [u'failpkg.mod'] and not build.errors
+	assert os.path.isfile(fragmentPath)
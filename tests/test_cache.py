@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+import yaml
+import pytest
+from yamldoc._cache import ParseCache, copyParsed, docHash
+
+docs = [u'desc: %d' % i for i in range(4)]
+
+def test_lru():
+
+	cache = ParseCache(maxSize=2)
+	cache.load(docs[0])
+	cache.load(docs[1])
+	# Using the first entry makes the second the least-recently used one,
+	# which is then evicted.
+	cache.load(docs[0])
+	cache.load(docs[2])
+	assert list(cache._entries) == [docHash(docs[0]), docHash(docs[2])]
+	assert cache.stats() == {u'hits': 1, u'misses': 3, u'evictions': 1,
+		u'size': 2, u'maxSize': 2}
+	cache.load(docs[1])
+	assert cache.stats()[u'misses'] == 4
+	assert cache.stats()[u'evictions'] == 2
+	assert docHash(docs[0]) not in cache._entries
+
+def test_stats():
+
+	cache = ParseCache(maxSize=10)
+	for i in range(3):
+		for doc in docs:
+			assert cache.load(doc) == {u'desc': docs.index(doc)}
+	assert cache.stats() == {u'hits': 8, u'misses': 4, u'evictions': 0,
+		u'size': 4, u'maxSize': 10}
+	cache.resize(1)
+	assert cache.stats()[u'size'] == 1
+	assert cache.stats()[u'evictions'] == 3
+	# The most recently used entry is kept
+	cache.load(docs[3])
+	assert cache.stats()[u'hits'] == 9
+	cache.clear()
+	assert cache.stats() == {u'hits': 0, u'misses': 0, u'evictions': 0,
+		u'size': 0, u'maxSize': 1}
+
+def test_copies():
+
+	# Callers get copies, so that modifying them doesn't affect the cache.
+	cache = ParseCache()
+	doc = u'desc: x\narguments:\n  a:\n    type: [int, float]\n'
+	first = cache.load(doc)
+	first[u'desc'] = u'y'
+	first[u'arguments'][u'a'][u'type'].append(u'str')
+	del first[u'arguments']
+	second = cache.load(doc)
+	assert second == {u'desc': u'x', u'arguments': {u'a': {u'type': [u'int',
+		u'float']}}}
+	assert second.__class__ is first.__class__
+	assert cache.stats()[u'hits'] == 1
+
+def test_copyParsed():
+
+	obj = {u'a': [1, {u'b': set([2])}], u'c': u'd'}
+	copy = copyParsed(obj)
+	assert copy == obj
+	assert copy is not obj
+	assert copy[u'a'] is not obj[u'a']
+	assert copy[u'a'][1] is not obj[u'a'][1]
+	assert copy[u'a'][1][u'b'] is not obj[u'a'][1][u'b']
+
+def test_invalid():
+
+	# Docstrings that fail to parse are not cached
+	cache = ParseCache()
+	for i in range(2):
+		with pytest.raises(yaml.YAMLError):
+			cache.load(u'a: [')
+	assert cache.stats()[u'size'] == 0
+	assert cache.stats()[u'misses'] == 2
+
+def test_threads():
+
+	cache = ParseCache(maxSize=2)
+	def load():
+		for i in range(200):
+			cache.load(docs[i % len(docs)])
+	threads = [threading.Thread(target=load) for i in range(4)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	stats = cache.stats()
+	assert stats[u'hits'] + stats[u'misses'] == 800
+	assert stats[u'size'] == 2
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import datetime
+from collections import OrderedDict
+import yamldoc
+from yamldoc._diskcache import DiskCache
+from yamldoc._yaml import orderedLoad
+
+def test_roundTrip(tmpdir):
+
+	cache = DiskCache(path=str(tmpdir))
+	obj = orderedLoad(u'b: [1, 2.5, true, null]\na:\n  c: d\n')
+	cache.put(u'key', obj)
+	cache.flush()
+	# A fresh cache reads the committed entry, with the order of the keys
+	# preserved.
+	found, loaded = DiskCache(path=str(tmpdir)).get(u'key')
+	assert found
+	assert isinstance(loaded, OrderedDict)
+	assert list(loaded) == [u'b', u'a']
+	assert loaded == obj
+	assert DiskCache(path=str(tmpdir)).get(u'other') == (False, None)
+
+def test_notRepresentable(tmpdir):
+
+	# Results that JSON cannot represent exactly are not cached.
+	cache = DiskCache(path=str(tmpdir))
+	cache.put(u'date', {u'a': datetime.date(2020, 1, 1)})
+	cache.put(u'intKey', {1: u'x'})
+	assert cache.get(u'date') == (False, None)
+	assert cache.get(u'intKey') == (False, None)
+
+def test_versions(tmpdir):
+
+	cache = DiskCache(path=str(tmpdir))
+	cache.put(u'key', [1])
+	cache.flush()
+	other = DiskCache(path=str(tmpdir))
+	other.version = u'other'
+	assert other.get(u'key') == (False, None)
+	# Entries from other versions are removed when pruning
+	other.put(u'key', [2])
+	other.flush()
+	assert cache.prune() == 1
+	assert cache.stats()[u'entries'] == 1
+	assert cache.get(u'key') == (True, [1])
+
+def test_hits(tmpdir):
+
+	# Hits don't write to the database right away, but access times are
+	# updated when writes are committed.
+	cache = DiskCache(path=str(tmpdir))
+	cache.put(u'key', [1])
+	cache.flush()
+	conn = cache.connection()
+	atime = conn.execute(u'SELECT atime FROM entries').fetchone()[0]
+	assert cache.get(u'key') == (True, [1])
+	assert not conn.in_transaction
+	cache.flush()
+	assert conn.execute(u'SELECT atime FROM entries').fetchone()[0] > atime
+
+def test_parseCache(tmpdir):
+
+	text = u'desc: Cached.\n'
+	try:
+		cache = yamldoc.enableDiskCache(path=str(tmpdir))
+		yamldoc.parseCache.clear()
+		assert yamldoc.parseCache.load(text) == {u'desc': u'Cached.'}
+		cache.flush()
+		assert cache.stats()[u'entries'] == 1
+	finally:
+		yamldoc.disableDiskCache()
+		yamldoc.parseCache.clear()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import re
+import inspect
+import pytest
+import yamldoc
+import fixpkg
+from yamldoc import _basedoc
+
+# Docstrings that cannot be YAML mappings, and are not parsed
+proseDocs = [
+	u'Just prose.',
+	u'Two lines\nof prose.',
+	u'Returns the value.\n\nArgs:\n\tx: The value.',
+	u'- A list: item',
+	u'# A comment\n',
+	]
+# Docstrings that may be YAML mappings, and are parsed
+yamlDocs = [
+	u'desc: x',
+	u'desc:\tx',
+	u'# A comment\ndesc: x',
+	u'\n\tdesc:\n\t\tx\n\t',
+	u'Prose\n---\ndesc: x\n---\n',
+	u'"desc": x',
+	u"'desc': x",
+	u'{desc: x}',
+	u'&anchor desc: x',
+	u'!!map {desc: x}',
+	u'? desc\n: x',
+	u'%YAML 1.1\n---\ndesc: x',
+	]
+# Docstrings that may be YAML mappings, but are prose
+ambiguousDocs = [
+	u'This is just prose: with a colon. And more.',
+	u'Prose, with a trailing colon:',
+	u'-prose: with a leading dash',
+	u':prose: with a leading colon',
+	]
+
+def withDoc(doc):
+
+	def f(a):
+		pass
+	f.__doc__ = doc
+	return f
+
+def parsed(df):
+
+	# The number of times that the doc object parsed a docstring
+	tracer = yamldoc.Tracer()
+	df.tracer = tracer
+	df.model()
+	return tracer.phaseTotals().get(u'parse', (0,))[0]
+
+@pytest.fixture
+def noClassifier(monkeypatch):
+
+	# Without the pre-classifier, all docstrings are parsed
+	monkeypatch.setattr(_basedoc, u'yamlMapping', re.compile(u''))
+
+def test_prose():
+
+	for doc in proseDocs:
+		df = yamldoc.DocFactory(withDoc(doc))
+		assert parsed(df) == 0, doc
+		assert df.model().desc == inspect.cleandoc(doc), doc
+		assert not df.model().visible
+
+def test_yaml():
+
+	for doc in yamlDocs:
+		df = yamldoc.DocFactory(withDoc(doc))
+		assert parsed(df) == 1, doc
+		assert df.model().desc == u'x', doc
+		assert df.model().visible
+
+def test_ambiguous():
+
+	for doc in ambiguousDocs:
+		df = yamldoc.DocFactory(withDoc(doc))
+		assert parsed(df) == 1, doc
+
+def test_sameOutput(request):
+
+	# Skipping the parser doesn't change the documentation
+	functions = [withDoc(doc) for doc in proseDocs + yamlDocs + \
+		ambiguousDocs]
+	output = lambda: [str(yamldoc.DocFactory(f)) for f in functions] + \
+		[str(yamldoc.DocFactory(fixpkg))]
+	before = output()
+	request.getfixturevalue(u'noClassifier')
+	assert output() == before
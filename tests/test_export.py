@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import json
+import pytest
+import yamldoc
+import fixpkg
+from yamldoc._exceptions import YAMLDocError
+
+def structure(node):
+
+	return (node[u'kind'], node[u'name'], [structure(child) \
+		for child in node[u'children']])
+
+def test_exportTree():
+
+	tree = yamldoc.exportTree(yamldoc.DocFactory(fixpkg))
+	assert tree[u'schema'] == 1
+	thing = lambda prefix: (u'class', prefix + u'Thing', [
+		(u'function', prefix + u'Thing.__init__', []),
+		(u'function', prefix + u'Thing.method', []),
+		(u'property', prefix + u'Thing.prop', []),
+		])
+	# Children are in the same order as in the Markdown documentation, and
+	# objects that are not visible are left out.
+	assert structure(tree[u'root']) == (u'module', u'fixpkg', [
+		thing(u'fixpkg.'),
+		(u'module', u'fixpkg.core', [
+			thing(u'fixpkg.core.'),
+			(u'function', u'fixpkg.core.helper', []),
+			(u'function', u'fixpkg.core.prose', []),
+			]),
+		(u'function', u'fixpkg.helper', []),
+		])
+	root = tree[u'root']
+	assert root[u'id'] == u'fixpkg'
+	assert root[u'level'] == 1
+	assert root[u'source'] == [u'http://example.com']
+	helper = root[u'children'][2]
+	assert helper[u'args'] == [u'a']
+	assert helper[u'defaults'] == [
+		{u'name': u'b', u'value': u'x', u'repr': repr(u'x')},
+		{u'name': u'c', u'value': None, u'repr': u'None'},
+		]
+	assert helper[u'argumentList'] == u'args'
+	assert helper[u'keywordDict'] == u'kw'
+	assert [kw[u'name'] for kw in helper[u'keywords']] == [u'b', u'c']
+	assert helper[u'arguments'][0][u'props'][u'type'] == [u'int', u'float']
+	assert helper[u'returns'][u'desc'] == u'Something.'
+	assert helper[u'yields'] is None
+	prop = root[u'children'][0][u'children'][2]
+	assert u'args' not in prop
+
+def test_link():
+
+	# Objects that are documented twice link to their first documentation
+	tree = yamldoc.exportTree(yamldoc.DocFactory(fixpkg, visited={}))
+	links = [child for child in tree[u'root'][u'children'][1][u'children'] \
+		if u'link' in child]
+	assert [child[u'link'] for child in links] == [u'fixpkg-Thing']
+	assert links[0][u'children'] == []
+
+def test_json():
+
+	fd = io.StringIO()
+	yamldoc.export(yamldoc.DocFactory(fixpkg), fd)
+	assert json.loads(fd.getvalue()) == \
+		yamldoc.exportTree(yamldoc.DocFactory(fixpkg))
+	with pytest.raises(YAMLDocError):
+		yamldoc.export(yamldoc.DocFactory(fixpkg), fd, format=u'xml')
+
+def test_msgpack():
+
+	msgpack = pytest.importorskip(u'msgpack')
+	fd = io.BytesIO()
+	yamldoc.export(yamldoc.DocFactory(fixpkg), fd, format=u'msgpack')
+	assert msgpack.unpackb(fd.getvalue(), raw=False) == \
+		yamldoc.exportTree(yamldoc.DocFactory(fixpkg))
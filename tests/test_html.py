@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import pytest
+import gc
+import yamldoc
+import fixpkg
+from yamldoc._html import collectSymbols
+from conftest import golden
+
+def test_renderHtml():
+
+	fd = io.StringIO()
+	yamldoc.renderHtml(yamldoc.DocFactory(fixpkg), fd, title=u'fixpkg')
+	golden(u'fixpkg.html', fd.getvalue())
+
+def test_introspection():
+
+	# With a symbol index, the objects are introspected as often as when
+	# Markdown is generated.
+	mdTracer = yamldoc.Tracer()
+	str(yamldoc.DocFactory(fixpkg, tracer=mdTracer))
+	htmlTracer = yamldoc.Tracer()
+	yamldoc.renderHtml(yamldoc.DocFactory(fixpkg, tracer=htmlTracer),
+		io.StringIO(), symbols=yamldoc.SymbolIndex())
+	mdTotals = mdTracer.phaseTotals()
+	htmlTotals = htmlTracer.phaseTotals()
+	for phase in (u'getdoc', u'objAttribs', u'parseArgSpec'):
+		assert htmlTotals[phase][0] == mdTotals[phase][0]
+
+def test_collectSymbols():
+
+	# Only the symbols are kept, and not the doc objects of the children.
+	df = yamldoc.DocFactory(fixpkg)
+	symbols = yamldoc.SymbolIndex()
+	collectSymbols(df, symbols)
+	assert symbols.resolve(u'fixpkg.core.Thing') == u'fixpkg-core-Thing'
+	gc.collect()
+	assert [obj for obj in gc.get_objects() \
+		if isinstance(obj, yamldoc.BaseDoc)] == [df]
+
+def test_legacyHooks():
+
+	# Hooks that are overridden in the old way receive the docstring dict.
+	class LegacyDoc(yamldoc.FunctionDoc):
+		def header(self, _dict):
+			return u'Legacy %s' % _dict[u'desc']
+	fd = io.StringIO()
+	with pytest.warns(DeprecationWarning):
+		yamldoc.renderHtml(LegacyDoc(fixpkg.core.Thing.method), fd)
+	assert u'<h1>Legacy A method.</h1>' in fd.getvalue()
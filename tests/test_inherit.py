@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import yamldoc
+
+class Base(object):
+
+	"""
+	desc:	Base.
+	"""
+
+	def method(self):
+
+		"""
+		desc:	Base.method.
+		"""
+
+	@staticmethod
+	def static():
+
+		"""
+		desc:	Base.static.
+		"""
+
+def test_metaclass():
+
+	def method(self):
+		pass
+	Derived = yamldoc.inherit(u'Derived', (Base,), {u'method': method})
+	assert Derived.__doc__ == Base.__doc__
+	assert Derived.method.__doc__ == Base.method.__doc__
+
+def test_decorator():
+
+	@yamldoc.inheritDocs
+	class Derived(Base):
+		def method(self):
+			pass
+		@staticmethod
+		def static():
+			pass
+	assert Derived.method.__doc__ == Base.method.__doc__
+	assert Derived.static.__doc__ == Base.static.__doc__
+
+def test_lazy():
+
+	@yamldoc.inheritDocs(lazy=True)
+	class Derived(Base):
+		def method(self):
+			pass
+	assert Derived.method.__doc__ is None
+	# Documenting the class resolves the docstrings
+	assert u'Base.method.' in str(yamldoc.DocFactory(Derived))
+	assert Derived.method.__doc__ == Base.method.__doc__
+
+def test_chain():
+
+	# Docstrings are passed on through a class that inherits them lazily.
+	@yamldoc.inheritDocs(lazy=True)
+	class Middle(Base):
+		def method(self):
+			pass
+	@yamldoc.inheritDocs
+	class Derived(Middle):
+		def method(self):
+			pass
+	assert Middle.method.__doc__ == Base.method.__doc__
+	assert Derived.method.__doc__ == Base.method.__doc__
+
+def test_mixin():
+
+	class DocBase(yamldoc.InheritDocs):
+		def method(self):
+			"""
+			desc:	DocBase.method.
+			"""
+	class Derived(DocBase):
+		def method(self):
+			pass
+	class LazyBase(yamldoc.InheritDocs):
+		lazyDocs = True
+		def method(self):
+			"""
+			desc:	LazyBase.method.
+			"""
+	class LazyDerived(LazyBase):
+		def method(self):
+			pass
+	assert Derived.method.__doc__ == DocBase.method.__doc__
+	assert LazyDerived.method.__doc__ is None
+	yamldoc.DocFactory(LazyDerived).model()
+	assert LazyDerived.method.__doc__ == LazyBase.method.__doc__
+
+def test_noLeaks():
+
+	# The docstrings of InheritDocs and object describe those classes, and
+	# are not inherited by undocumented subclasses.
+	class Undocumented(yamldoc.InheritDocs):
+		def __init__(self):
+			pass
+		@classmethod
+		def __init_subclass__(cls, **kwargs):
+			super(Undocumented, cls).__init_subclass__(**kwargs)
+	class Derived(Undocumented):
+		lazyDocs = True
+		def __init__(self):
+			pass
+	yamldoc.DocFactory(Derived).model()
+	for cls in (Undocumented, Derived):
+		assert cls.__doc__ is None
+		assert vars(cls)[u'__init__'].__doc__ is None
+	assert vars(Undocumented)[u'__init_subclass__'].__func__.__doc__ is None
+	Plain = yamldoc.inherit(u'Plain', (object,),
+		{u'__init__': lambda self: None})
+	assert Plain.__doc__ is None
+	assert Plain.__init__.__doc__ is None
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import os
+import re
+import pytest
+import yamldoc
+import fixpkg
+from yamldoc._markdown import emit, escape
+from conftest import golden, testDir
+
+# The reference-link definitions that are appended to the document.
+referenceTable = re.compile(u'(?:\n\\[[^\\]\n]+\\]: #\\S*)+\n$')
+
+def baseline(name, output):
+
+	# Apart from the reference-link definitions at the end, the output is
+	# identical to that of the original, non-streaming renderer, which
+	# generated the files in tests/golden/baseline from the same fixtures.
+	path = os.path.join(testDir, u'golden', u'baseline', name)
+	with io.open(path, encoding=u'utf-8', newline=u'') as fd:
+		expected = fd.read()
+	assert referenceTable.sub(u'\n', output) == expected
+
+def test_package():
+
+	md = str(yamldoc.DocFactory(fixpkg))
+	golden(u'fixpkg.md', md)
+	baseline(u'fixpkg.md', md)
+
+def test_class():
+
+	md = str(yamldoc.DocFactory(fixpkg.core.Thing, level=2, container=u'div'))
+	golden(u'fixpkg_thing.md', md)
+	baseline(u'fixpkg_thing.md', md)
+
+def test_onlyContents():
+
+	md = str(yamldoc.DocFactory(fixpkg, onlyContents=True))
+	golden(u'fixpkg_contents.md', md)
+	baseline(u'fixpkg_contents.md', md)
+
+def test_misc():
+
+	# An overridden misc() replaces the documentation of the children.
+	class MiscDoc(yamldoc.ClassDoc):
+		def misc(self, node):
+			return u'Custom misc for %s.\n' % node.name
+	md = str(MiscDoc(fixpkg.core.Thing))
+	assert u'Custom misc for Thing.' in md
+	assert u'A method.' not in md
+	fd = io.StringIO()
+	yamldoc.renderHtml(MiscDoc(fixpkg.core.Thing), fd)
+	assert u'<p>Custom misc for Thing.</p>' in fd.getvalue()
+
+def test_hooks():
+
+	# header() and sections() receive the document-model node.
+	class HookDoc(yamldoc.FunctionDoc):
+		def header(self, node):
+			return u'Header for %s' % node.name
+		def sections(self, node):
+			return u'Sections for %s\n' % node.desc
+	md = str(HookDoc(fixpkg.core.Thing.method))
+	assert u'# Header for method' in md
+	assert u'Sections for A method.' in md
+	# Overrides that index their argument, but don't call it _dict, get an
+	# explanation.
+	class IndexDoc(yamldoc.FunctionDoc):
+		def sections(self, node):
+			return node[u'desc']
+	with pytest.raises(TypeError) as e:
+		str(IndexDoc(fixpkg.core.Thing.method))
+	assert u'node.desc' in str(e.value)
+
+def test_legacyHooks():
+
+	# Hooks that are overridden in the old way receive the docstring dict, or
+	# a part of it, and can pass it on to the hooks of the base class.
+	class LegacyDoc(yamldoc.FunctionDoc):
+		def header(self, _dict):
+			return u'Legacy ' + super(LegacyDoc, self).header(_dict)
+		def sections(self, _dict):
+			md = u'Sections for %s\n\n' % _dict[u'desc']
+			if u'arguments' in _dict:
+				md += self.argSection(_dict[u'arguments'])
+			return md + super(LegacyDoc, self).sections(_dict)
+		def returnsSection(self, _dict):
+			return u'Returns %s\n\n' % _dict[u'desc']
+	with pytest.warns(DeprecationWarning) as record:
+		md = str(LegacyDoc(fixpkg.core.Thing.method))
+	assert len(record) == 3
+	assert u'LegacyDoc.sections()' in str(record[1].message)
+	assert u'# Legacy function __method__' in md
+	assert u'Sections for A method.' in md
+	# The arguments are listed twice, once by the override and once by the
+	# base class.
+	assert md.count(u'- `y` -- No description\n') == 2
+	assert u'Returns A value.' in md
+	assert u'__Returns:__' in md
+	class LegacyClassDoc(yamldoc.ClassDoc):
+		def misc(self, _dict):
+			return u'Misc for %s\n' % _dict[u'desc']
+	with pytest.warns(DeprecationWarning):
+		md = str(LegacyClassDoc(fixpkg.core.Thing))
+	assert u'Misc for' in md
+	assert u'__method__' not in md
+
+def test_propertyName():
+
+	# The name of a property is taken from its docstring, which is parsed
+	# only once.
+	df = yamldoc.PropertyDoc(fixpkg.core.Thing.prop)
+	df.model()
+	df._dict = None
+	assert df.name() == u'prop'
+
+def test_propertyGetter():
+
+	# A property and its getter are different symbols.
+	class Cls(object):
+		"""
+		desc:	A class.
+		"""
+		def _get(self):
+			"""
+			name:	p
+			desc:	A getter.
+			"""
+		p = property(_get)
+	symbols = yamldoc.SymbolIndex()
+	str(yamldoc.DocFactory(Cls, symbols=symbols))
+	assert symbols.resolve(u'Cls._get') == u'Cls-_get'
+	assert symbols.resolve(u'p') == u'Cls-p'
+
+def test_visited():
+
+	# Visited objects are kept alive, so that their ids remain unique.
+	visited = {}
+	md = str(yamldoc.DocFactory(fixpkg, visited=visited))
+	assert visited
+	for key, (obj, node) in visited.items():
+		assert id(obj) == key
+		assert node.id in md
+
+def test_readme():
+
+	# The same input as readme.py, without the academicmarkdown step. This is
+	# only a snapshot that catches unintended changes, and is regenerated
+	# whenever a docstring changes. It cannot be compared to the original
+	# renderer, because the docstrings of yamldoc have changed since; that
+	# the output is unchanged is checked with the fixture package above.
+	golden(u'yamldoc.md', str(yamldoc.DocFactory(yamldoc)))
+
+def test_escape():
+
+	assert escape(u'a_b*[c]\\') == u'a\\_b\\*\\[c\\]\\\\'
+
+def test_emit():
+
+	# Runs of newlines are collapsed, also when they span chunks.
+	chunks = [u'\n\na', u'\n', u'\n', u'\nb\n\n\n\nc\n', u'', u'\n\n\n']
+	assert u''.join(emit(chunks)) == u'\n\na\n\nb\n\nc\n\n'
+	assert u''.join(emit([u'a', u'b'])) == u'ab'
+	assert u''.join(emit([])) == u''
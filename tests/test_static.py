@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import pytest
+import yamldoc
+import fixpkg
+
+def test_package():
+
+	# Parsing the source code gives the same documentation as importing.
+	assert str(yamldoc.staticDoc(u'fixpkg')) == \
+		str(yamldoc.DocFactory(fixpkg))
+
+def test_options():
+
+	assert str(yamldoc.staticDoc(u'fixpkg', onlyContents=True)) == \
+		str(yamldoc.DocFactory(fixpkg, onlyContents=True))
+	assert str(yamldoc.staticDoc(u'fixpkg.core', submodules=False)) == \
+		str(yamldoc.DocFactory(fixpkg.core, submodules=False))
+
+def test_class():
+
+	assert str(yamldoc.staticDoc(u'fixpkg.core.Thing', level=2,
+		container=u'div')) == str(yamldoc.DocFactory(fixpkg.core.Thing,
+		level=2, container=u'div'))
+
+def test_build():
+
+	static = yamldoc.PackageBuild(u'fixpkg', static=True).run()
+	live = yamldoc.PackageBuild(u'fixpkg').run()
+	assert not static.errors and not live.errors
+	assert static.markdown() == live.markdown()
+
+kwonlySrc = u'''
+def kwonly(a, *, b=2, c):
+
+	"""
+	desc:	Has keyword-only arguments.
+
+	keywords:
+		c:	Required.
+	"""
+'''
+
+@pytest.mark.skipif(sys.version_info < (3, 0),
+	reason=u'Keyword-only arguments require Python 3')
+def test_kwonly(tmpdir, monkeypatch):
+
+	tmpdir.join(u'kwonlymod.py').write(kwonlySrc)
+	monkeypatch.syspath_prepend(str(tmpdir))
+	import kwonlymod
+	assert str(yamldoc.staticDoc(u'kwonlymod.kwonly')) == \
+		str(yamldoc.DocFactory(kwonlymod.kwonly))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import json
+import time
+import pytest
+import yamldoc
+import fixpkg
+import fixpkg.core
+from yamldoc._trace import tracePhases, tracemalloc
+
+def test_phases():
+
+	tracer = yamldoc.Tracer()
+	t0 = time.time()
+	str(yamldoc.DocFactory(fixpkg, tracer=tracer))
+	wallTime = time.time() - t0
+	totals = tracer.phaseTotals()
+	assert list(totals) == tracePhases
+	for phase, (calls, seconds, peak) in totals.items():
+		assert calls > 0, phase
+		assert seconds >= 0, phase
+		assert peak is None
+	# The seven functions and methods of the module, and the class and the
+	# helper function again as they are also documented in the package.
+	assert totals[u'parseArgSpec'][0] == 11
+	# The package, the module, and the class twice
+	assert totals[u'objAttribs'][0] == 4
+	# Time is exclusive, so the phases don't add up to more than the total
+	assert sum(seconds for calls, seconds, peak in totals.values()) <= \
+		wallTime
+
+def test_exclusive():
+
+	# When a phase starts while another phase is active, the time is only
+	# counted for the phase that started last.
+	tracer = yamldoc.Tracer()
+	df = yamldoc.DocFactory(fixpkg.core.helper)
+	def outer():
+		time.sleep(.01)
+		tracer.call(u'parse', df, time.sleep, .05)
+		time.sleep(.01)
+	t0 = time.time()
+	tracer.call(u'sections', df, outer)
+	wallTime = time.time() - t0
+	totals = tracer.phaseTotals()
+	assert totals[u'parse'][0] == 1 and totals[u'sections'][0] == 1
+	assert totals[u'parse'][1] >= .05
+	assert .02 <= totals[u'sections'][1] < .05
+	assert totals[u'parse'][1] + totals[u'sections'][1] <= wallTime
+
+def test_modules():
+
+	tracer = yamldoc.Tracer()
+	str(yamldoc.DocFactory(fixpkg, tracer=tracer))
+	assert list(tracer.modules()) == [u'fixpkg', u'fixpkg.core']
+	assert u'fixpkg.core.helper' in tracer.objects
+	# The statistics can be written as JSON
+	fd = io.StringIO()
+	tracer.dump(fd)
+	d = json.loads(fd.getvalue())
+	assert list(d[u'phases']) == tracePhases
+	assert d[u'phases'][u'getdoc'][u'calls'] == \
+		tracer.phaseTotals()[u'getdoc'][0]
+	assert set(d[u'modules']) == set([u'fixpkg', u'fixpkg.core'])
+	fd = io.StringIO()
+	tracer.report(fd)
+	assert fd.getvalue().startswith(u'phase')
+
+@pytest.mark.skipif(tracemalloc is None or \
+	not hasattr(tracemalloc, u'reset_peak'),
+	reason=u'Memory tracing requires Python 3.9')
+def test_memory():
+
+	tracing = tracemalloc.is_tracing()
+	tracer = yamldoc.Tracer(memory=True)
+	try:
+		str(yamldoc.DocFactory(fixpkg, tracer=tracer))
+	finally:
+		tracer.close()
+	assert tracemalloc.is_tracing() == tracing
+	assert all(peak is not None and peak >= 0 for calls, seconds, peak in \
+		tracer.phaseTotals().values())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import types
+import collections
+import pytest
+import yamldoc
+from yamldoc import _types
+from yamldoc._types import resolveTypes, isOfType
+from yamldoc._exceptions import YAMLDocError
+
+class Base(object):
+
+	pass
+
+class Derived(Base):
+
+	pass
+
+class OrderedDict(object):
+
+	# Has the same name as collections.OrderedDict
+	pass
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+
+	# Registered types are global, and are restored after each test.
+	monkeypatch.setattr(_types, u'typeRegistry', dict(_types.typeRegistry))
+	monkeypatch.setattr(_types, u'_cache', {})
+
+def test_builtins():
+
+	assert resolveTypes([u'int', u'str']) == ((int, str), None)
+	assert isOfType(None, [u'NoneType'])
+	assert isOfType(test_builtins, [u'function'])
+	assert isOfType(types, [u'module'])
+	assert isOfType(u'x', [u'unicode'])
+	assert not isOfType(1, [u'str', u'float'])
+
+def test_dottedNames():
+
+	# Dotted names are imported, and refer to exactly that type
+	resolved, predicate = resolveTypes([u'collections.OrderedDict'])
+	assert resolved == (collections.OrderedDict,) and predicate is None
+	assert isOfType(collections.OrderedDict(), [u'collections.OrderedDict'])
+	assert not isOfType(OrderedDict(), [u'collections.OrderedDict'])
+	assert isOfType(Base(), [u'%s.Base' % __name__])
+
+def test_subclasses():
+
+	# Types are checked with isinstance(), so subclasses are accepted
+	assert isOfType(True, [u'int'])
+	assert isOfType(collections.OrderedDict(), [u'dict'])
+	assert isOfType(Derived(), [u'%s.Base' % __name__])
+	assert not isOfType(Base(), [u'%s.Derived' % __name__])
+
+def test_unresolved():
+
+	# Names that cannot be resolved are compared to the name of the class,
+	# with or without the module.
+	resolved, predicate = resolveTypes([u'Derived', u'int'])
+	assert resolved == (int,) and predicate is not None
+	assert isOfType(Derived(), [u'Derived'])
+	assert not isOfType(Derived(), [u'nomodule.Derived'])
+	assert not isOfType(Derived(), [u'Base'])
+	assert isOfType(1, [u'Derived', u'int'])
+	# Dotted names that cannot be resolved are compared to the module and
+	# the name of the class.
+	class Local(object):
+		pass
+	assert isOfType(Local(), [u'%s.Local' % __name__])
+	assert not isOfType(Local(), [u'other.Local'])
+
+def test_registerType():
+
+	yamldoc.registerType(u'positive', lambda val: val > 0)
+	yamldoc.registerType(u'number', (int, float))
+	yamldoc.registerType(u'thing', Base)
+	assert isOfType(1, [u'positive']) and not isOfType(-1, [u'positive'])
+	assert isOfType(1.5, [u'number']) and not isOfType(u'1', [u'number'])
+	assert isOfType(Derived(), [u'thing'])
+	# Predicates and types can be combined
+	assert isOfType(-1.5, [u'positive', u'float'])
+	assert not isOfType(-1, [u'positive', u'float'])
+	with pytest.raises(YAMLDocError):
+		yamldoc.registerType(u'invalid', 1)
+
+def test_cache():
+
+	# The cache is cleared when a type is registered, so that a name that
+	# was unresolved before is resolved afterwards.
+	assert not isOfType(1, [u'anything'])
+	yamldoc.registerType(u'anything', object)
+	assert isOfType(1, [u'anything'])
+	assert resolveTypes([u'anything']) is resolveTypes((u'anything',))
@@ -0,0 +1,494 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import subprocess
+import inspect
+import itertools
+import pytest
+import yamldoc
+from yamldoc._exceptions import InvalidArgument, InvalidKeyword, \
+	InvalidReturnValue, InvalidYieldValue, YAMLDocError
+
+@yamldoc.validate
+def func(a, b=u'x'):
+
+	"""
+	desc:	A function.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+
+	keywords:
+		b:
+			desc:	x or y.
+			valid:	[x, y]
+
+	returns:
+		desc:	A bool.
+		type:	bool
+	"""
+
+	return a > 0
+
+@yamldoc.validate
+def echo(a):
+
+	"""
+	desc:	Returns its argument.
+
+	arguments:
+		a:	Anything.
+
+	returns:
+		desc:	A bool.
+		type:	bool
+	"""
+
+	return a
+
+@yamldoc.validate
+def items(it):
+
+	"""
+	desc:	Returns its argument.
+
+	arguments:
+		it:	Anything.
+
+	yields:
+		desc:	Ints.
+		type:	int
+	"""
+
+	return it
+
+@yamldoc.validate
+def gen(*items):
+
+	"""
+	desc:	Yields its arguments.
+
+	argument-list:
+		items:	The items.
+
+	yields:
+		desc:	Ints.
+		type:	int
+	"""
+
+	for item in items:
+		yield item
+
+def test_arguments():
+
+	assert func(1) is True
+	assert func(1, b=u'y') is True
+	with pytest.raises(InvalidArgument):
+		func(u'1')
+	with pytest.raises(InvalidKeyword):
+		func(1, b=u'z')
+
+def test_returns():
+
+	assert echo(False) is False
+	with pytest.raises(InvalidReturnValue):
+		echo(1)
+
+def test_yields():
+
+	assert list(gen(1, 2)) == [1, 2]
+	g = gen(1, u'2', 3)
+	assert next(g) == 1
+	# The invalid item is only detected when it is consumed
+	with pytest.raises(InvalidYieldValue):
+		next(g)
+	assert items([1, 2]) == [1, 2]
+	# Materialized containers are checked right away
+	with pytest.raises(InvalidYieldValue):
+		items([1, u'2'])
+	with pytest.raises(InvalidYieldValue):
+		items(1)
+
+def test_iterables():
+
+	# Iterables that are not iterators are returned as they are. Those that
+	# have a length are checked right away.
+	for it in range(10), {1: u'x', 2: u'y'}.keys(), frozenset([1, 2]):
+		assert items(it) is it
+	with pytest.raises(InvalidYieldValue):
+		items(u'xy')
+	with pytest.raises(InvalidYieldValue):
+		items({u'x': 1}.keys())
+	# Iterators are wrapped, and checked as they are consumed, so that
+	# infinite iterators are never walked in full.
+	invalid = items(itertools.repeat(u'x'))
+	with pytest.raises(InvalidYieldValue):
+		next(invalid)
+	assert list(itertools.islice(items(itertools.count()), 3)) == [0, 1, 2]
+
+@pytest.mark.skipif(sys.version_info < (3, 0),
+	reason=u'Generators are only wrapped in generators on Python 3')
+def test_generators():
+
+	def accumulate():
+		total = 0
+		while True:
+			try:
+				value = yield total
+			except ValueError:
+				value = 0
+			if value is None:
+				return total
+			total += value
+
+	g = items(accumulate())
+	assert inspect.isgenerator(g)
+	assert next(g) == 0
+	assert g.send(1) == 1
+	assert g.send(2) == 3
+	assert g.throw(ValueError) == 3
+	with pytest.raises(InvalidYieldValue):
+		g.send(0.5)
+	# The return value is passed on
+	g = items(accumulate())
+	next(g)
+	g.send(4)
+	with pytest.raises(StopIteration) as e:
+		next(g)
+	assert e.value.value == 4
+
+def test_itemSampleRate():
+
+	@yamldoc.validate(itemSampleRate=2)
+	def sampled(*items):
+
+		"""
+		desc:	Yields its arguments.
+
+		argument-list:
+			items:	The items.
+
+		yields:
+			desc:	Ints.
+			type:	int
+		"""
+
+		for item in items:
+			yield item
+
+	assert list(sampled(1, u'x', 3)) == [1, u'x', 3]
+	with pytest.raises(InvalidYieldValue):
+		list(sampled(1, 2, u'x'))
+	for rate in (0, -1, 1.5):
+		with pytest.raises(YAMLDocError):
+			yamldoc.validate(itemSampleRate=rate)
+		with pytest.raises(YAMLDocError):
+			yamldoc.validate(sampleRate=rate)
+
+@yamldoc.validate
+def binding(a, b=0, *args, **kwargs):
+
+	"""
+	desc:	Accepts extra arguments and keywords.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+
+	keywords:
+		b:
+			desc:	An int.
+			type:	int
+	"""
+
+class Obj(object):
+
+	@yamldoc.validate
+	def method(self, a):
+
+		"""
+		desc:	A method.
+
+		arguments:
+			a:
+				desc:	An int.
+				type:	int
+		"""
+
+		return a
+
+def test_binding():
+
+	# Positional parameters can be passed by keyword
+	binding(a=1, b=2)
+	with pytest.raises(InvalidKeyword):
+		binding(a=u'1')
+	with pytest.raises(InvalidKeyword):
+		binding(1, b=u'2')
+	# Surplus arguments and unknown keywords go into *args and **kwargs
+	binding(1, 2, u'x', u'y', c=u'z')
+	with pytest.raises(InvalidArgument):
+		binding(1, u'2', u'x')
+	# Too many arguments without *args
+	with pytest.raises(InvalidArgument):
+		func(1, u'x', 3)
+	with pytest.raises(InvalidKeyword):
+		func(1, c=3)
+
+def test_method():
+
+	# self is skipped, so the first argument is checked against a
+	obj = Obj()
+	assert obj.method(1) == 1
+	assert obj.method(a=1) == 1
+	with pytest.raises(InvalidArgument):
+		obj.method(u'1')
+
+kwonlySrc = u'''
+@yamldoc.validate
+def kwonly(a, *, b=2, c):
+
+	"""
+	desc:	Has keyword-only arguments.
+
+	arguments:
+		a:
+			desc:	An int.
+			type:	int
+
+	keywords:
+		b:
+			desc:	An int.
+			type:	int
+		c:
+			desc:	x or y.
+			valid:	[x, y]
+	"""
+
+	return b
+'''
+
+@pytest.mark.skipif(sys.version_info < (3, 0),
+	reason=u'Keyword-only arguments require Python 3')
+def test_kwonly():
+
+	ns = {u'yamldoc': yamldoc}
+	exec(kwonlySrc, ns)
+	kwonly = ns[u'kwonly']
+	assert kwonly(1, b=3, c=u'x') == 3
+	# The default of a keyword-only argument
+	assert kwonly(1, c=u'y') == 2
+	with pytest.raises(InvalidKeyword):
+		kwonly(1, b=u'3', c=u'x')
+	with pytest.raises(InvalidKeyword):
+		kwonly(1, c=u'z')
+	with pytest.raises(InvalidKeyword):
+		kwonly(1, c=u'x', d=4)
+	# The keyword-only arguments are also documented
+	md = str(yamldoc.DocFactory(kwonly))
+	assert u'a, \\*, b=2, c' in md
+	assert u'- `c` -- x or y.' in md
+
+@pytest.fixture
+def validationState(monkeypatch):
+
+	# The validation mode and sample rates are global, and are restored after
+	# the test.
+	from yamldoc import _validate
+	monkeypatch.setattr(_validate, u'_mode', _validate._mode)
+	monkeypatch.setattr(_validate, u'_sampleRate', _validate._sampleRate)
+	monkeypatch.setattr(_validate, u'_moduleSampleRates', {})
+
+def validatedCalls(n=100):
+
+	# Calls a newly decorated function n times with an invalid argument, and
+	# counts how many calls are validated. The mode is applied when a
+	# function is decorated.
+	@yamldoc.validate
+	def f(a):
+
+		"""
+		desc:	Takes an int.
+
+		arguments:
+			a:
+				desc:	An int.
+				type:	int
+		"""
+
+	validated = 0
+	for i in range(n):
+		try:
+			f(u'x')
+		except InvalidArgument:
+			validated += 1
+	return validated
+
+def test_validationMode(validationState):
+
+	yamldoc.setValidationMode(u'on')
+	assert validatedCalls() == 100
+	yamldoc.setValidationMode(u'off')
+	assert yamldoc.validationMode() == u'off'
+	assert validatedCalls() == 0
+	yamldoc.setValidationMode(u'sample', sampleRate=10)
+	assert validatedCalls() == 10
+	with pytest.raises(YAMLDocError):
+		yamldoc.setValidationMode(u'sometimes')
+
+def test_setSampleRate(validationState):
+
+	yamldoc.setValidationMode(u'sample')
+	yamldoc.setSampleRate(25)
+	assert validatedCalls() == 4
+	# A rate for a module takes precedence over the default rate
+	yamldoc.setSampleRate(50, module=__name__)
+	assert validatedCalls() == 2
+	for rate in 0, 1.5, u'10':
+		with pytest.raises(YAMLDocError):
+			yamldoc.setSampleRate(rate)
+
+def test_configure(validationState):
+
+	from yamldoc._validate import configure
+	configure({u'YAMLDOC_VALIDATE': u' Sample ',
+		u'YAMLDOC_SAMPLE_RATE': u'20'})
+	assert yamldoc.validationMode() == u'sample'
+	assert validatedCalls() == 5
+	# Invalid values are ignored with a warning
+	for name, value in (u'YAMLDOC_SAMPLE_RATE', u'x'), \
+		(u'YAMLDOC_SAMPLE_RATE', u'0'), (u'YAMLDOC_VALIDATE', u'always'):
+		with pytest.warns(RuntimeWarning, match=name):
+			configure({name: value})
+	assert yamldoc.validationMode() == u'sample'
+	assert validatedCalls() == 5
+
+def test_importWithInvalidEnvironment():
+
+	env = dict(os.environ, YAMLDOC_SAMPLE_RATE=u'often',
+		YAMLDOC_VALIDATE=u'always')
+	env[u'PYTHONPATH'] = os.pathsep.join([os.path.dirname(
+		os.path.dirname(os.path.abspath(__file__)))] + [p for p in \
+		[os.environ.get(u'PYTHONPATH')] if p])
+	output = subprocess.check_output([sys.executable, u'-c',
+		u'import yamldoc'], env=env, stderr=subprocess.STDOUT)
+	assert b'YAMLDOC_SAMPLE_RATE' in output
+	assert b'YAMLDOC_VALIDATE' in output
+
+def test_instrumentation(validationState, monkeypatch):
+
+	from yamldoc import _validate
+	monkeypatch.setattr(_validate, u'_instrument', False)
+	monkeypatch.setattr(_validate, u'_stats', _validate.OrderedDict())
+	yamldoc.setValidationMode(u'on')
+	yamldoc.setInstrumentation(True)
+
+	@yamldoc.validate
+	def f(a, b=1):
+
+		"""
+		desc:	Returns b.
+
+		arguments:
+			a:
+				desc:	An int.
+				type:	int
+
+		keywords:
+			b:	Anything.
+
+		returns:
+			desc:	An int.
+			type:	int
+		"""
+
+		return b
+
+	# Functions that are decorated while instrumentation is disabled are not
+	# instrumented.
+	yamldoc.setInstrumentation(False)
+	validatedCalls()
+	for i in range(10):
+		f(i)
+	with pytest.raises(InvalidArgument):
+		f(u'x')
+	with pytest.raises(InvalidReturnValue):
+		f(1, b=u'x')
+	snapshot = yamldoc.instrumentationSnapshot()
+	assert len(snapshot) == 1
+	name, stats = list(snapshot.items())[0]
+	assert name.startswith(__name__ + u'.') and name.endswith(u'f')
+	assert stats[u'calls'] == 12
+	assert stats[u'validatedCalls'] == 12
+	assert stats[u'argumentFailures'] == 1
+	assert stats[u'keywordFailures'] == 0
+	assert stats[u'returnFailures'] == 1
+	assert stats[u'validationTime'] > 0
+	# A snapshot is a copy, and doesn't change with later calls
+	f(1)
+	assert stats[u'calls'] == 12
+	assert yamldoc.instrumentationSnapshot()[name][u'calls'] == 13
+	yamldoc.resetInstrumentation()
+	assert all(value == 0 for value in \
+		yamldoc.instrumentationSnapshot()[name].values())
+
+def test_instrumentedSampling(validationState, monkeypatch):
+
+	from yamldoc import _validate
+	monkeypatch.setattr(_validate, u'_instrument', False)
+	monkeypatch.setattr(_validate, u'_stats', _validate.OrderedDict())
+	yamldoc.setValidationMode(u'sample', sampleRate=10)
+	yamldoc.setInstrumentation(True)
+	# Only the sampled calls are validated, and fail
+	assert validatedCalls() == 10
+	stats = list(yamldoc.instrumentationSnapshot().values())[0]
+	assert stats[u'calls'] == 100
+	assert stats[u'validatedCalls'] == 10
+	assert stats[u'argumentFailures'] == 10
+	assert stats[u'functionTime'] > 0
+	# Yielded items are counted as well
+	yamldoc.setValidationMode(u'on')
+
+	@yamldoc.validate
+	def g(*items):
+
+		"""
+		desc:	Yields its arguments.
+
+		argument-list:
+			items:	The items.
+
+		yields:
+			desc:	Ints.
+			type:	int
+		"""
+
+		for item in items:
+			yield item
+
+	with pytest.raises(InvalidYieldValue):
+		list(g(1, u'2'))
+	snapshot = yamldoc.instrumentationSnapshot()
+	assert [stats[u'yieldFailures'] for stats in snapshot.values()] == [0, 1]
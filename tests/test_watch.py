@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import os
+import yamldoc
+
+moduleSrc = u'''
+"""
+desc:	%s
+"""
+%s
+def func():
+
+	"""
+	desc:	A function.
+	"""
+'''
+
+def writeModule(path, desc, imports=u''):
+
+	with io.open(path, u'w', encoding=u'utf-8') as fd:
+		fd.write(moduleSrc % (desc, imports))
+	# Make sure that the modification time changes, also on file systems
+	# with a coarse resolution.
+	mtime = os.stat(path).st_mtime + 2
+	os.utime(path, (mtime, mtime))
+
+def test_poll(tmpdir, monkeypatch):
+
+	pkgDir = str(tmpdir.mkdir(u'watchpkg'))
+	outDir = str(tmpdir.join(u'doc'))
+	writeModule(os.path.join(pkgDir, u'__init__.py'), u'The package.')
+	writeModule(os.path.join(pkgDir, u'a.py'), u'Module a.',
+		u'from watchpkg import b\n')
+	writeModule(os.path.join(pkgDir, u'b.py'), u'Module b.')
+	writeModule(os.path.join(pkgDir, u'c.py'), u'Module c.')
+	monkeypatch.syspath_prepend(str(tmpdir))
+	stream = io.StringIO()
+	watcher = yamldoc.Watcher(u'watchpkg', outDir, debounce=.05,
+		stream=stream)
+	watcher.mtimes = watcher.snapshot()
+	build = watcher.update()
+	assert sorted(build.rendered) == [u'watchpkg', u'watchpkg.a',
+		u'watchpkg.b', u'watchpkg.c']
+	# Nothing changed
+	assert watcher.poll() is None
+	# Only the changed module is documented again
+	writeModule(os.path.join(pkgDir, u'c.py'), u'Changed c.')
+	build = watcher.poll()
+	assert build.rendered == [u'watchpkg.c']
+	assert not build.errors
+	with io.open(os.path.join(outDir, u'watchpkg.c.md'),
+		encoding=u'utf-8') as fd:
+		assert u'Changed c.' in fd.read()
+	with io.open(os.path.join(outDir, u'index.md'), encoding=u'utf-8') as fd:
+		index = fd.read()
+	assert u'Changed c.' in index and u'Module a.' in index
+	assert watcher.poll() is None
+	# And so are the modules that import it
+	writeModule(os.path.join(pkgDir, u'b.py'), u'Changed b.')
+	assert sorted(watcher.poll().rendered) == [u'watchpkg.a', u'watchpkg.b']
+	# A file that is saved without changes doesn't need to be documented
+	writeModule(os.path.join(pkgDir, u'b.py'), u'Changed b.')
+	assert watcher.poll().rendered == []
+	assert stream.getvalue().splitlines()[-1].startswith(u'Up to date')
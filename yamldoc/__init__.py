@@ -33,7 +33,8 @@ desc: |
 	  functions.
 	- Automatically validate input and output of functions and methods with
 	  the @[yamldoc.validate] decorator.
-	- Inherit docstrings with the [yamldoc.inherit] metaclass.
+	- Inherit docstrings with the [yamldoc.inherit] metaclass or the
+	  [yamldoc.inheritDocs] decorator.
 
 	__Index:__
 
@@ -60,5 +61,17 @@ from yamldoc._classdoc import ClassDoc
 from yamldoc._moduledoc import ModuleDoc
 from yamldoc._propertydoc import PropertyDoc
 from yamldoc._docfactory import DocFactory
-from yamldoc._validate import validate
-from yamldoc._inherit import inherit
+from yamldoc._validate import validate, setValidationMode, validationMode, \
+	setSampleRate, setInstrumentation, instrumentationSnapshot, \
+	resetInstrumentation
+from yamldoc._types import registerType
+from yamldoc._inherit import inherit, inheritDocs, InheritDocs
+from yamldoc._cache import parseCache
+from yamldoc._diskcache import DiskCache, enableDiskCache, disableDiskCache
+from yamldoc._build import PackageBuild, buildPackage
+from yamldoc._watch import Watcher
+from yamldoc._static import staticDoc
+from yamldoc._symbols import SymbolIndex
+from yamldoc._export import exportTree, export
+from yamldoc._html import renderHtml
+from yamldoc._trace import Tracer
@@ -22,9 +22,14 @@ from yamldoc.py3compat import *
 import re
 import types
 import inspect
+import warnings
 import yaml
-from yamldoc._yaml import orderedLoad
+from yamldoc._cache import parseCache
 from yamldoc._exceptions import YAMLDocError
+from yamldoc._model import DocNode, DocDict
+from yamldoc._markdown import escape, emit
+from yamldoc._docfactory import DocFactory, docType
+from yamldoc._symbols import SymbolIndex, objectKey
 from collections import OrderedDict
 
 docTemplate = u"""<%(container)s class="%(className)s YAMLDoc" id="%(headerId)s" markdown="1">
@@ -39,20 +44,61 @@ docTemplate = u"""<%(container)s class="%(className)s YAMLDoc" id="%(headerId)s"
 </%(container)s>
 """
 
+# The template is split around the children, so that the documentation can be
+# streamed without first rendering the children.
+docHeader, docFooter = docTemplate.split(u'%(misc)s')
+# Matches the YAML block between two '---' lines, if any.
+yamlBlock = re.compile(u'^---(.*?)^---', re.M|re.S)
+# Matches docstrings that start (possibly after comment lines) with a top-level
+# `key:` line, or with a character that can start a quoted or complex key, a
+# flow mapping, an anchor, a tag, or a directive. Only these docstrings can be
+# YAML mappings.
+yamlMapping = re.compile(
+	u'(?:#[^\\n]*\\n\\s*)*(?:[{?&!*"\'%]|'
+	u'(?:[^\\s#\\-?:,\\[\\]{}&*!|>\'"%@`]|[-:]\\S)[^\\n]*?:(?:[ \\t]|$))',
+	re.M)
+
+# Whether the hooks of doc classes are overridden in the old way, with
+# (class, hook name) tuples as keys
+legacyHookCache = {}
+
 class BaseDoc(object):
 
 	"""
-	desc:
+	desc: |
 		The base class from which the other doc classes are derived.
+
+		Derived classes can customize the documentation by overriding
+		`header()`, `sections()`, and `misc()`. These methods receive the
+		document-model node of the object (see `model()`), which holds the
+		parsed docstring as attributes, such as `node.desc` and
+		`node.example`. In earlier versions, they received the docstring
+		dict instead. Overrides that still call their argument `_dict`
+		receive the docstring dict, with a `DeprecationWarning`, but should
+		be updated.
 	visible:
 		True
 	"""
 
 	undefined = u'No description specified.'
+	# The kind of object, and the class of the document-model node
+	kind = None
+	nodeClass = DocNode
+	# The class name in the HTML output, or None to use the name of the doc
+	# class
+	className = None
+	# The hooks that received the docstring dict, or a part of it, in earlier
+	# versions, and the name of the argument that received it
+	legacyHooks = {
+		u'header'	: u'_dict',
+		u'sections'	: u'_dict',
+		u'misc'		: u'_dict',
+		}
 
 	def __init__(self, obj, enc=u'utf-8', namePrefix=u'', level=1,
 		customName=None, container=u'span', onlyContents=False, exclude=[],
-		customDescriptor=None):
+		customDescriptor=None, submodules=True, inherited=True, package=None,
+		visited=None, symbols=None, tracer=None):
 
 		"""
 		desc:
@@ -94,6 +140,48 @@ class BaseDoc(object):
 			customDescriptor:
 				desc:	A custom descriptor instead of things like 'class'.
 				type:	[NoneType, str, unicode]
+			submodules:
+				desc:	Indicates whether modules that are attributes of a
+						module should be documented as well. Only applicable
+						to modules.
+				type:	bool
+			inherited:
+				desc:	Indicates whether members that a class inherits from
+						its base classes should be documented as well. Only
+						applicable to classes.
+				type:	bool
+			package:
+				desc:	The name of a package to which the documentation is
+						restricted, or None to document all children. If a
+						package is specified, only modules in the package,
+						and classes and functions that are defined in the
+						package, are documented as children.
+				type:	[str, unicode, NoneType]
+			visited:
+				desc:	A dict that keeps track of the objects that have been
+						documented, or None to document objects every time
+						that they are encountered. If a dict is specified
+						(normally an empty one), objects that are encountered
+						again, for example because they are imported in
+						several modules, are documented with a link to their
+						first documentation. This also prevents infinite
+						recursion when modules import each other. The dict
+						maps the ids of objects onto (object, node) tuples,
+						so that documented objects are kept alive, and their
+						ids are not reused by other objects.
+				type:	[dict, NoneType]
+			symbols:
+				desc:	A [SymbolIndex] in which documented objects are
+						registered, or None to create a new one. When a new
+						index is created, a table of Markdown link references
+						to all documented objects is added to the end of the
+						documentation.
+				type:	[SymbolIndex, NoneType]
+			tracer:
+				desc:	A [Tracer] that measures the time spent in each phase
+						of documentation generation, or None to disable
+						tracing.
+				type:	[Tracer, NoneType]
 		"""
 
 		self.obj = obj
@@ -105,6 +193,15 @@ class BaseDoc(object):
 		self.onlyContents = onlyContents
 		self.customName = customName
 		self.customDescriptor = customDescriptor
+		self.submodules = submodules
+		self.inherited = inherited
+		self.package = package
+		self.visited = visited
+		self.ownsSymbols = symbols is None
+		self.symbols = SymbolIndex() if symbols is None else symbols
+		self.tracer = tracer
+		self._model = None
+		self._docDict = None
 
 	def __str__(self):
 
@@ -135,43 +232,167 @@ class BaseDoc(object):
 			type:	unicode
 		"""
 
-		_dict = self._dict()
-		if not _dict[u'visible']:
-			return u''
+		return u''.join(self.iterChunks())
+
+	def render(self, stream):
+
+		"""
+		desc:
+			Writes the object's documentation to a file-like object. The
+			documentation is written while it is generated, so that the
+			full documentation never needs to be held in memory.
+
+		example: |
+			import yamldoc
+
+			with open(u'doc.md', u'w') as fd:
+				yamldoc.DocFactory(yamldoc).render(fd)
+
+		arguments:
+			stream:
+				desc:	A file-like object that accepts unicode strings.
+		"""
+
+		for chunk in self.iterChunks():
+			stream.write(chunk)
+
+	def iterChunks(self):
+
+		"""
+		desc:
+			Generates the object's documentation as a series of Markdown
+			fragments, depth first. Only the documentation for the objects on
+			the current path through the tree is held in memory.
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		return self.tracedChunks(u'assembly', emit(self.rawChunks()))
+
+	def rawChunks(self):
+
+		"""
+		desc:
+			Generates the object's documentation as a series of Markdown
+			fragments, without collapsing runs of blank lines.
+
+		visible:	False
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		node = self.model()
+		if not node.visible:
+			return
+		first = self.firstDocumented(node)
+		values = self.templateValues(node, first)
+		# Register the object, so that you can link to the object's
+		# documentation in the documentation of other objects.
+		if not self.onlyContents:
+			self.symbols.add(node.name, node.id, objectKey(self.obj))
+		yield docHeader % values
+		if first is None:
+			if self.miscOverridden():
+				yield self.traced(u'misc', self.hook, u'misc', node)
+			else:
+				for chunk in self.tracedChunks(u'misc',
+					self.miscChunks(node)):
+					yield chunk
+		yield docFooter % values
+		yield u'\n\n'
+		if self.ownsSymbols:
+			for chunk in self.symbols.referenceChunks():
+				yield chunk
+
+	def firstDocumented(self, node):
+
+		"""
+		desc:
+			Checks whether the object has been documented before, if a dict
+			of visited objects is used (see [BaseDoc.__init__]). If not, the
+			object is marked as visited.
+
+		visible:	False
+
+		arguments:
+			node:
+				desc:	The document-model node of the object.
+				type:	DocNode
+
+		returns:
+			desc:	The node of the earlier documentation, or None if the
+					object has not been documented before.
+			type:	[DocNode, NoneType]
+		"""
+
+		if self.visited is None:
+			return None
+		entry = self.visited.get(id(self.obj))
+		if entry is None:
+			self.visited[id(self.obj)] = self.obj, node
+			return None
+		return entry[1]
+
+	def templateValues(self, node, first=None):
+
+		"""
+		desc:
+			Gets the values that are filled into `docTemplate`. All values
+			are Markdown.
+
+		visible:	False
+
+		arguments:
+			node:
+				desc:	The document-model node of the object.
+				type:	DocNode
+
+		keywords:
+			first:
+				desc:	The node of the earlier documentation of the object, in
+						which case the documentation consists only of a link,
+						or None.
+				type:	[DocNode, NoneType]
+
+		returns:
+			desc:	A dict with template keys as keys.
+			type:	dict
+		"""
+
 		if self.onlyContents:
-			md = docTemplate % {
+			values = {
 				u'className' 		: u'',
 				u'headerLevel'		: u'',
 				u'headerText'		: u'',
 				u'headerId'			: u'',
 				u'desc'				: u'',
-				u'sections'			: self.sections(_dict),
-				u'misc'				: self.misc(_dict),
+				u'sections'			: self.traced(u'sections', self.hook,
+					u'sections', node),
 				u'container'		: self.container,
 				}
 		else:
-			md = docTemplate % {
-				u'className' 		: self.__class__.__name__,
+			values = {
+				u'className' 		: self.className or \
+					self.__class__.__name__,
 				u'headerLevel'		: u'#' * self.level,
-				u'headerText'		: self.header(_dict),
-				u'headerId'			: self._id(),
-				u'desc'				: _dict[u'desc'],
-				u'sections'			: self.sections(_dict),
-				u'misc'				: self.misc(_dict),
+				u'headerText'		: self.hook(u'header', node),
+				u'headerId'			: node.id,
+				u'desc'				: node.desc,
+				u'sections'			: self.traced(u'sections', self.hook,
+					u'sections', node),
 				u'container'		: self.container,
 				}
-		# Add header links, so that you can link to the object's documentation
-		# in the documentation of other objects.
-		l = self.name().split(u'.')
-		print(l)
-		md += u'\n\n'
-		while len(l) > 0:
-			# md += u'[%s]: #%s\n\n' % (u'.'.join(l), self._id())
-			l = l[1:]
-		md += u'\n'
-		while u'\n'*3 in md:
-			md = md.replace(u'\n'*3, u'\n'*2)
-		return md
+		if first is not None:
+			# The object has been documented already, so we only link to its
+			# documentation.
+			values[u'desc'] = u'See [%s](#%s).' % (self.escape(first.name),
+				first.id)
+			values[u'sections'] = u''
+		return values
 
 	def _name(self):
 
@@ -201,35 +422,44 @@ class BaseDoc(object):
 			type:	dict
 		"""
 
-		docStr = inspect.getdoc(self.obj)
+		docStr = self.traced(u'getdoc', self.docString)
 		if docStr is None:
 			_dict = OrderedDict( [(u'visible', False)] )
 		elif isinstance(docStr, basestring):
 			docStr = safe_decode(docStr, self.enc)
 			# If the docstring contains a YAML block between '---' then we
 			# use only this bit.
-			for r in re.finditer(u'^---(.*?)^---', docStr, re.M|re.S):
-				docStr = r.groups()[0]
-				break
-			try:
-				_dict = orderedLoad(docStr)
+			m = yamlBlock.search(docStr)
+			if m is not None:
+				docStr = m.group(1)
+			stripped = docStr.lstrip()
+			if yamlMapping.match(stripped) is None:
+				# Plain docstrings cannot be YAML mappings, so we don't need to
+				# parse them.
+				_dict = OrderedDict([
+					(u'desc', 		docStr),
+					(u'visible',	False)
+					])
+			else:
+				try:
+					_dict = self.traced(u'parse', parseCache.load, docStr)
+				except yaml.YAMLError:
+					# If the docstring appears to be YAML formatted, but
+					# nevertheless fails to parse, we raise an exception to
+					# inform the user of the problem.
+					if stripped.startswith(u'desc:'):
+						raise
+					_dict = OrderedDict([
+						(u'desc', 		docStr),
+						(u'visible',	False)
+						])
 				if isinstance(_dict, basestring):
 					_dict = OrderedDict([
 						(u'desc', 		safe_decode(_dict, self.enc)),
 						(u'visible',	False)
 						])
-				elif _dict is None:
+				elif not isinstance(_dict, dict):
 					_dict = OrderedDict( [(u'visible', False)] )
-			except:
-				# If the docstring appears to be YAML formatted, but
-				# nevertheless fails to parse, we raise an exception to inform
-				# the user of the problem.
-				if docStr.strip().startswith(u'desc:'):
-					yaml.load(docStr) # Will raise Exception
-				_dict = OrderedDict([
-					(u'desc', 		docStr),
-					(u'visible',	False)
-					])
 		if u'desc' not in _dict:
 			_dict[u'desc'] = self.undefined
 		if u'visible' not in _dict:
@@ -237,6 +467,91 @@ class BaseDoc(object):
 		_dict = self.stripDict(_dict)
 		return _dict
 
+	def docString(self):
+
+		"""
+		desc:
+			Gets the object's docstring, with indentation removed.
+
+		visible:	False
+
+		returns:
+			desc:	The docstring, or None if the object has no docstring.
+			type:	[str, unicode, NoneType]
+		"""
+
+		return inspect.getdoc(self.obj)
+
+	def docDict(self):
+
+		"""
+		desc:
+			Gets the dict representation of the object's documentation while
+			the document model is being built, so that it is generated only
+			once. The dict should not be modified.
+
+		visible:	False
+
+		returns:
+			desc:	A dict representation of the object's documentation.
+			type:	dict
+		"""
+
+		if self._docDict is None:
+			self._docDict = self._dict()
+		return self._docDict
+
+	def model(self):
+
+		"""
+		desc:
+			Gets the document model of the object, which is an immutable
+			representation of the object's parsed documentation. The model is
+			built when it is first requested, and then reused.
+
+		returns:
+			desc:	The document-model node.
+			type:	DocNode
+		"""
+
+		if self._model is None:
+			self._model = self.nodeClass(**self.modelFields(self.docDict()))
+			# The model contains everything that we need, so we don't need to
+			# hold on to the dict anymore.
+			self._docDict = None
+		return self._model
+
+	def modelFields(self, _dict):
+
+		"""
+		desc:
+			Gets the fields of the document-model node. Derived classes extend
+			this to add their own fields.
+
+		visible:	False
+
+		arguments:
+			_dict:
+				desc:	A docstring dictionary.
+				type:	dict
+
+		returns:
+			desc:	A dict with field names as keys.
+			type:	dict
+		"""
+
+		name = self.name()
+		return {
+			'kind'		: self.kind,
+			'name'		: name,
+			'id'		: name.replace(u'.', u'-'),
+			'desc'		: _dict[u'desc'],
+			'visible'	: _dict[u'visible'],
+			'example'	: _dict.get(u'example', None),
+			'source'	: tuple(_dict[u'source']) if u'source' in _dict \
+				else None,
+			}
+
 	def stripDict(self, _dict):
 
 		"""
@@ -260,28 +575,52 @@ class BaseDoc(object):
 				_dict[key] = self.stripDict(value)
 		return _dict
 
-	def objAttribs(self):
+	def objAttribs(self, types=None):
 
 		"""
 		desc:
-			Retrieves all object attributes.
+			Retrieves the object's attributes without evaluating them, in the
+			way of `inspect.getattr_static()`. The `__dict__` of the object,
+			and for classes those of its base classes, are searched directly,
+			so that properties and other descriptors are not invoked, and
+			attributes that are loaded lazily are not loaded.
 
 		visible:	False
 
+		keywords:
+			types:
+				desc:	A list of types (as in [DocFactory]) to which the
+						attributes should be restricted, or None to get all
+						attributes.
+				type:	[list, NoneType]
+
 		returns:
-			desc:	A list of (name, object) tuples for all the object's
-					attributes.
+			desc:	A list of (name, object) tuples, sorted by name.
 			type:	list
 		"""
 
-		l = []
-		for attrib in dir(self.obj):
-			# Avoid recursion
-			if attrib == u'__class__':
-				continue
-			if hasattr(self.obj, attrib):
-				l.append((attrib, getattr(self.obj, attrib)))
-		return l
+		if not inspect.isclass(self.obj):
+			namespaces = [getattr(self.obj, u'__dict__', {})]
+		elif self.inherited:
+			# The attributes of object are never documented
+			namespaces = [cls.__dict__ for cls in inspect.getmro(self.obj) \
+				if cls is not object or self.obj is object]
+		else:
+			namespaces = [self.obj.__dict__]
+		attribs = {}
+		for namespace in namespaces:
+			for name, attrib in namespace.items():
+				# Attributes of derived classes shadow those of base classes,
+				# also if they are not documented.
+				if name in attribs:
+					continue
+				# Static and class methods are documented as the functions
+				# that they wrap.
+				if isinstance(attrib, (staticmethod, classmethod)):
+					attrib = attrib.__func__
+				attribs[name] = attrib
+		return sorted((name, attrib) for name, attrib in attribs.items() \
+			if types is None or docType(attrib) in types)
 
 	def name(self):
 
@@ -309,7 +648,7 @@ class BaseDoc(object):
 
 		return self.name().replace(u'.', u'-')
 
-	def header(self, _dict):
+	def header(self, node):
 
 		"""
 		desc:
@@ -318,9 +657,9 @@ class BaseDoc(object):
 		visible:	False
 
 		arguments:
-			_dict:
-				desc:	A docstring dictionary.
-				type:	dict
+			node:
+				desc:	A document-model node.
+				type:	DocNode
 
 		returns:
 			desc:	A properly formatted header.
@@ -330,19 +669,22 @@ class BaseDoc(object):
 
 		return u''
 
-	def misc(self, _dict):
+	def misc(self, node):
 
 		"""
 		desc:
 			Generates miscellaneous documentation, to be added to the end of
-			the standard doc sections.
+			the standard doc sections. By default, this is the documentation
+			of the object's children. If a derived class overrides this
+			method, its result is used instead of the streamed documentation
+			of the children (see `miscChunks()`).
 
 		visible:	False
 
 		arguments:
-			_dict:
-				desc:	A docstring dictionary.
-				type:	dict
+			node:
+				desc:	A document-model node.
+				type:	DocNode
 
 		returns:
 			desc:	A Markdown-formatted section with miscellaneous
@@ -351,9 +693,291 @@ class BaseDoc(object):
 
 		"""
 
-		return u''
+		return u''.join(self.miscChunks(node))
 
-	def sections(self, _dict):
+	def miscOverridden(self):
+
+		"""
+		desc:
+			Checks whether a derived class overrides `misc()`, in which case
+			its result is used instead of `miscChunks()`, so that the
+			documentation of the children is not streamed.
+
+		visible:	False
+
+		returns:
+			type:	bool
+		"""
+
+		misc = self.__class__.misc
+		return getattr(misc, u'__func__', misc) is not \
+			getattr(BaseDoc.misc, u'__func__', BaseDoc.misc)
+
+	def hook(self, name, value, *args, **kwargs):
+
+		"""
+		desc:
+			Calls a hook, such as `header()` or `sections()`. If a derived
+			class overrides the hook in the old way, that is, with an argument
+			that has the name that it had when it received the docstring dict,
+			the value is converted to the old format (see `legacyValue()`),
+			and a `DeprecationWarning` is emitted.
+
+		visible:	False
+
+		arguments:
+			name:
+				desc:	The name of the hook.
+				type:	[str, unicode]
+			value:		The value for the hook, such as a document-model node.
+
+		argument-list:
+			args:		Further arguments for the hook.
+
+		keyword-dict:
+			kwargs:		Keywords for the hook.
+
+		returns:
+			The return value of the hook.
+		"""
+
+		if self.legacyHook(name):
+			warnings.warn(u'%s.%s() expects a docstring dict. Hooks receive '
+				u'the document model instead, and overrides that expect a '
+				u'dict are deprecated.' % (self.__class__.__name__, name),
+				DeprecationWarning)
+			value = self.legacyValue(value)
+		return getattr(self, name)(value, *args, **kwargs)
+
+	def legacyHook(self, name):
+
+		"""
+		desc:
+			Checks whether a hook is overridden in the old way (see `hook()`).
+			The result is remembered for each class.
+
+		visible:	False
+
+		arguments:
+			name:
+				desc:	The name of the hook.
+				type:	[str, unicode]
+
+		returns:
+			type:	bool
+		"""
+
+		key = self.__class__, name
+		if key not in legacyHookCache:
+			func = getattr(self.__class__, name)
+			func = getattr(func, u'__func__', func)
+			try:
+				args = getargspec(func).args
+			except TypeError:
+				args = []
+			legacyHookCache[key] = len(args) > 1 and \
+				args[1] == self.legacyHooks[name]
+		return legacyHookCache[key]
+
+	def legacyValue(self, value):
+
+		"""
+		desc:
+			Converts a value for a hook to the format in which hooks received
+			it in earlier versions. Derived classes extend this for the values
+			of their own hooks.
+
+		visible:	False
+
+		arguments:
+			value:		The value for the hook.
+
+		returns:
+			The converted value. A document-model node is converted to a
+			[DocDict].
+		"""
+
+		if isinstance(value, DocNode):
+			return DocDict(value, self._dict())
+		return value
+
+	def miscChunks(self, node):
+
+		"""
+		desc:
+			Generates miscellaneous documentation as a series of Markdown
+			fragments. By default, this is the documentation of the object's
+			children.
+
+		visible:	False
+
+		arguments:
+			node:
+				desc:	A document-model node.
+				type:	DocNode
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		for df in self.children(node):
+			for chunk in df.tracedChunks(u'assembly', df.rawChunks()):
+				yield chunk
+
+	def children(self, node):
+
+		"""
+		desc:
+			Generates doc objects for the object's children, such as the
+			methods of a class. Children are generated one at a time, so that
+			they don't need to be held in memory at the same time.
+
+		visible:	False
+
+		arguments:
+			node:
+				desc:	A document-model node.
+				type:	DocNode
+
+		returns:
+			desc:	A generator of doc objects.
+			type:	generator
+		"""
+
+		return iter(())
+
+	def docFactory(self, obj, **kwargs):
+
+		"""
+		desc:
+			Creates a doc object for one of the object's children.
+
+		visible:	False
+
+		arguments:
+			obj:	The child object.
+
+		keyword-dict:
+			kwargs:	Keywords that are passed to [DocFactory].
+
+		returns:
+			desc:	A doc object, or None if the child should not be
+					documented.
+		"""
+
+		if not self.inPackage(obj):
+			return None
+		return DocFactory(obj, **kwargs)
+
+	def inPackage(self, obj):
+
+		"""
+		desc:
+			Checks whether an object belongs to the package to which the
+			documentation is restricted, if any. Objects without a module,
+			such as properties, are considered part of the package.
+
+		visible:	False
+
+		arguments:
+			obj:	An object.
+
+		returns:
+			type:	bool
+		"""
+
+		if self.package is None:
+			return True
+		if inspect.ismodule(obj):
+			name = obj.__name__
+		else:
+			name = getattr(obj, u'__module__', None)
+		if not isinstance(name, basestring):
+			return True
+		return name == self.package or name.startswith(self.package + u'.')
+
+	def childOptions(self):
+
+		"""
+		desc:
+			Gets the options that are passed on to the doc objects of the
+			object's children.
+
+		visible:	False
+
+		returns:
+			desc:	A dict of keywords for [DocFactory].
+			type:	dict
+		"""
+
+		return {
+			u'container'	: self.container,
+			u'exclude'		: self.exclude,
+			u'submodules'	: self.submodules,
+			u'inherited'	: self.inherited,
+			u'package'		: self.package,
+			u'visited'		: self.visited,
+			u'symbols'		: self.symbols,
+			u'tracer'		: self.tracer,
+			}
+
+	def traced(self, phase, func, *args, **kwargs):
+
+		"""
+		desc:
+			Calls a function, and traces the call as a phase of documentation
+			generation if a [Tracer] is used.
+
+		visible:	False
+
+		arguments:
+			phase:
+				desc:	The name of the phase.
+				type:	[str, unicode]
+			func:		The function.
+
+		argument-list:
+			args:		The arguments for the function.
+
+		keyword-dict:
+			kwargs:		The keywords for the function.
+
+		returns:
+			The return value of the function.
+		"""
+
+		if self.tracer is None:
+			return func(*args, **kwargs)
+		return self.tracer.call(phase, self, func, *args, **kwargs)
+
+	def tracedChunks(self, phase, chunks):
+
+		"""
+		desc:
+			Traces the generation of Markdown fragments as a phase of
+			documentation generation if a [Tracer] is used.
+
+		visible:	False
+
+		arguments:
+			phase:
+				desc:	The name of the phase.
+				type:	[str, unicode]
+			chunks:
+				desc:	A generator of fragments.
+				type:	generator
+
+		returns:
+			desc:	A generator of fragments.
+			type:	generator
+		"""
+
+		if self.tracer is None:
+			return chunks
+		return self.tracer.chunks(phase, self, chunks)
+
+	def sections(self, node):
 
 		"""
 		desc:
@@ -363,9 +987,9 @@ class BaseDoc(object):
 		visible:	False
 
 		arguments:
-			_dict:
-				desc:	A docstring dictionary.
-				type:	dict
+			node:
+				desc:	A document-model node.
+				type:	DocNode
 
 		returns:
 			desc:	A properly formatted header.
@@ -374,11 +998,11 @@ class BaseDoc(object):
 		"""
 
 		md = u''
-		if u'example' in _dict:
-			md += u'__Example:__\n\n' + self.exampleSection(_dict[u'example'])
-		if u'source' in _dict:
+		if node.example is not None:
+			md += u'__Example:__\n\n' + self.exampleSection(node.example)
+		if node.source is not None:
 			md += u'__Source(s):__\n\n'
-			for src in _dict[u'source']:
+			for src in node.source:
 				md += u'- <%s>\n' % src
 		return md
 
@@ -388,6 +1012,4 @@ class BaseDoc(object):
 
 	def escape(self, md):
 
-		for ch in u'\\_*[]{}()#+.!':
-			md = md.replace(ch, u'\\'+ch)
-		return md
+		return escape(md)
@@ -0,0 +1,781 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import os
+import io
+import ast
+import json
+import hashlib
+import pkgutil
+import multiprocessing
+import importlib
+import traceback
+from collections import OrderedDict
+from yamldoc._docfactory import DocFactory
+from yamldoc._markdown import emit
+from yamldoc._exceptions import YAMLDocError
+from yamldoc._symbols import SymbolIndex
+
+try:
+	from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+	ProcessPoolExecutor = None
+
+functionDefs = tuple(getattr(ast, name) for name in (u'FunctionDef',
+	u'AsyncFunctionDef') if hasattr(ast, name))
+
+def findSpec(name, finder=None):
+
+	"""
+	desc:
+		Finds a module without importing it.
+
+	visible:	False
+
+	arguments:
+		name:
+			desc:	The full name of the module.
+			type:	[str, unicode]
+
+	keywords:
+		finder:		The finder that found the module, if known.
+
+	returns:
+		desc:	A (path, isPackage, searchLocations) tuple, where path is the
+				source file or None, and searchLocations is a list of folders
+				that contain submodules or None.
+		type:	tuple
+	"""
+
+	if finder is not None:
+		spec = finder.find_spec(name)
+	elif u'.' in name:
+		# importlib.util.find_spec() imports the parent package of
+		# submodules, so we search the folders of the parent package instead.
+		import importlib.machinery
+		parent, isPackage, locations = findSpec(name.rsplit(u'.', 1)[0])
+		spec = importlib.machinery.PathFinder.find_spec(name, locations) \
+			if isPackage else None
+	else:
+		import importlib.util
+		spec = importlib.util.find_spec(name)
+	if spec is None:
+		raise YAMLDocError(u'Module not found: %s' % name)
+	locations = spec.submodule_search_locations
+	return spec.origin, locations is not None, \
+		list(locations) if locations is not None else None
+
+def findModules(package):
+
+	"""
+	desc:
+		Finds a package and all its submodules, without importing them.
+		Modules named `__main__` are skipped, because importing them
+		usually runs a program.
+
+	arguments:
+		package:
+			desc:	The name of a package or module.
+			type:	[str, unicode]
+
+	returns:
+		desc:	A list of (name, path) tuples, sorted by name, where path is
+				the source file of the module (or None).
+		type:	list
+	"""
+
+	path, isPackage, locations = findSpec(package)
+	modules = [(package, path)]
+	if isPackage:
+		modules += walkModules(locations, package + u'.')
+	return sorted(modules)
+
+def walkModules(locations, prefix):
+
+	"""
+	desc:
+		Recursively finds submodules in a list of folders.
+
+	visible:	False
+
+	arguments:
+		locations:
+			desc:	A list of folders.
+			type:	list
+		prefix:
+			desc:	The name of the parent package followed by a period.
+			type:	[str, unicode]
+
+	returns:
+		desc:	A list of (name, path) tuples.
+		type:	list
+	"""
+
+	modules = []
+	for finder, name, isPackage in pkgutil.iter_modules(locations):
+		if name == u'__main__':
+			continue
+		fullName = prefix + name
+		path, isPackage, subLocations = findSpec(fullName, finder)
+		modules.append((fullName, path))
+		if isPackage:
+			modules += walkModules(subLocations, fullName + u'.')
+	return modules
+
+def fileHash(path):
+
+	"""
+	desc:
+		Gets a hash of the contents of a file.
+
+	visible:	False
+
+	arguments:
+		path:
+			desc:	The path to the file, or None.
+			type:	[str, unicode, NoneType]
+
+	returns:
+		desc:	A hexadecimal SHA-1 digest, or None if the file doesn't exist.
+		type:	[str, NoneType]
+	"""
+
+	if path is None or not os.path.isfile(path):
+		return None
+	with open(path, u'rb') as fd:
+		return hashlib.sha1(fd.read()).hexdigest()
+
+def moduleImports(name, path, modules):
+
+	"""
+	desc:
+		Finds the modules of a package that a module imports, by parsing its
+		source code, so that the module doesn't need to be imported.
+
+	visible:	False
+
+	arguments:
+		name:
+			desc:	The module name.
+			type:	[str, unicode]
+		path:
+			desc:	The source file of the module, or None.
+			type:	[str, unicode, NoneType]
+		modules:
+			desc:	The names of all modules in the package.
+			type:	[set, frozenset]
+
+	returns:
+		desc:	The names of the imported modules.
+		type:	set
+	"""
+
+	if path is None or not path.endswith(u'.py'):
+		return set()
+	with open(path, u'rb') as fd:
+		try:
+			tree = ast.parse(fd.read(), path)
+		except SyntaxError:
+			return set()
+	isPackage = os.path.basename(path) == u'__init__.py'
+	imports = set()
+	# Only imports that are executed when the module is imported matter, so
+	# we walk through the statements, but not through the bodies of functions
+	# or through expressions.
+	todo = list(tree.body)
+	while todo:
+		node = todo.pop()
+		if isinstance(node, functionDefs):
+			continue
+		if not isinstance(node, (ast.Import, ast.ImportFrom)):
+			todo += [child for child in ast.iter_child_nodes(node) \
+				if isinstance(child, (ast.stmt, ast.excepthandler))]
+		elif isinstance(node, ast.Import):
+			for alias in node.names:
+				imports.add(alias.name)
+		elif isinstance(node, ast.ImportFrom):
+			if node.level:
+				# Resolve relative imports
+				parts = name.split(u'.')
+				if not isPackage:
+					parts = parts[:-1]
+				if node.level > 1:
+					parts = parts[:-(node.level-1)]
+				base = u'.'.join(parts + ([node.module] if node.module \
+					else []))
+			else:
+				base = node.module
+			imports.add(base)
+			# The imported names may be modules themselves
+			for alias in node.names:
+				imports.add(u'%s.%s' % (base, alias.name))
+	# A module depends on the modules that it imports and on their parent
+	# packages, because these are imported as well.
+	found = set()
+	for imported in imports:
+		parts = imported.split(u'.')
+		for i in range(1, len(parts)+1):
+			parent = u'.'.join(parts[:i])
+			if parent in modules and parent != name:
+				found.add(parent)
+	return found
+
+def renderModule(job):
+
+	"""
+	desc:
+		Imports (or parses) and documents a single module. This is the
+		function that runs in the worker processes of a package build.
+
+	visible:	False
+
+	arguments:
+		job:
+			desc:	A (name, path, options, static) tuple, where path is the
+					source file, options is a dict of keywords for
+					[DocFactory], and static indicates whether the module
+					should be parsed rather than imported (see [staticDoc]).
+			type:	tuple
+
+	returns:
+		desc:	A (name, markdown, error, symbols) tuple, where symbols is a
+				list of [SymbolIndex] entries. If the module could not be
+				documented, markdown and symbols are None and error is a
+				traceback.
+		type:	tuple
+	"""
+
+	name, path, options, static = job
+	# The symbols of all modules are merged into a single index, so the
+	# documentation of a module doesn't get its own link references.
+	symbols = SymbolIndex()
+	try:
+		if static:
+			from yamldoc._static import staticDoc
+			df = staticDoc(name, path=path, symbols=symbols, **options)
+		else:
+			module = importlib.import_module(name)
+			df = DocFactory(module, symbols=symbols, **options)
+		md = u'' if df is None else u''.join(df.iterChunks())
+	except Exception:
+		return name, None, safe_decode(traceback.format_exc()), None
+	return name, md, None, symbols.entries
+
+class PackageBuild(object):
+
+	"""
+	desc:
+		Documents a package and all its submodules. Each module is imported
+		and documented separately, optionally in parallel worker processes,
+		and the results are merged in order of module name. Modules are
+		documented without the modules that they import, because these are
+		documented separately. Classes and functions that are defined
+		outside of the package are not documented, and objects that occur
+		more than once in a module are documented only the first time.
+
+	example: |
+		import yamldoc
+
+		build = yamldoc.PackageBuild(u'mypackage', jobs=8).run()
+		build.write(u'doc')
+		print(build.markdown())
+		# Later, only document modules that have changed
+		yamldoc.PackageBuild(u'mypackage', jobs=8).update(u'doc')
+	"""
+
+	manifestName = u'.yamldoc-manifest.json'
+
+	def __init__(self, package, jobs=1, level=1, container=u'span',
+		exclude=[], isolated=False, static=False):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			package:
+				desc:	The name of the package.
+				type:	[str, unicode]
+
+		keywords:
+			jobs:
+				desc:	The number of worker processes, or None to use one per
+						CPU. With one job, modules are documented in the
+						current process.
+				type:	[int, NoneType]
+			level:
+				desc:	The header level of the package. Submodules get a
+						header level that reflects their depth.
+				type:	int
+			container:
+				desc:	The HTML container type that wraps the documentation.
+				type:	[str, unicode]
+			exclude:
+				desc:	A list of child objects to exclude.
+				type:	list
+			isolated:
+				desc:	Indicates whether modules should always be documented
+						in fresh worker processes, even with one job. This
+						makes sure that changed modules are imported again
+						when a long-running process rebuilds the
+						documentation. Where available, workers are started
+						with the `spawn` method, so that they don't inherit
+						the modules of the current process.
+				type:	bool
+			static:
+				desc:	Indicates whether modules should be documented by
+						parsing their source code, rather than by importing
+						them (see [staticDoc]).
+				type:	bool
+		"""
+
+		self.package = package
+		self.jobs = multiprocessing.cpu_count() if jobs is None else jobs
+		self.level = level
+		self.container = container
+		self.exclude = exclude
+		self.isolated = isolated
+		self.static = static
+		self.modules = []
+		self.fragments = OrderedDict()
+		self.errors = OrderedDict()
+		self.symbols = {}
+		self.hashes = {}
+		self.dependencies = {}
+		# The modules that have been documented, as opposed to reused from a
+		# previous build.
+		self.rendered = []
+
+	def options(self, name):
+
+		"""
+		desc:
+			Gets the DocFactory options for a module.
+
+		visible:	False
+
+		arguments:
+			name:
+				desc:	The module name.
+				type:	[str, unicode]
+
+		returns:
+			type:	dict
+		"""
+
+		depth = name.count(u'.') - self.package.count(u'.')
+		return {
+			u'level'		: self.level + depth,
+			u'container'	: self.container,
+			u'exclude'		: self.exclude,
+			u'submodules'	: False,
+			u'package'		: self.package,
+			u'visited'		: {},
+			}
+
+	def render(self, names):
+
+		"""
+		desc:
+			Documents a list of modules, and stores the results.
+
+		visible:	False
+
+		arguments:
+			names:
+				desc:	A list of module names.
+				type:	list
+		"""
+
+		self.rendered = list(names)
+		paths = dict(self.modules)
+		jobs = [(name, paths.get(name), self.options(name), self.static) \
+			for name in names]
+		if ProcessPoolExecutor is not None and jobs and (self.isolated or
+			(self.jobs > 1 and len(jobs) > 1)):
+			kwargs = {}
+			# Forked workers inherit the modules that were already imported
+			# by this process, so isolated builds spawn fresh interpreters.
+			if self.isolated and hasattr(multiprocessing, u'get_context'):
+				kwargs[u'mp_context'] = multiprocessing.get_context(u'spawn')
+			with ProcessPoolExecutor(max_workers=max(1, self.jobs),
+				**kwargs) as executor:
+				results = list(executor.map(renderModule, jobs,
+					chunksize=max(1, len(jobs) // (4 * self.jobs))))
+		else:
+			results = [renderModule(job) for job in jobs]
+		for name, md, error, symbols in results:
+			if error is None:
+				self.fragments[name] = md
+				self.symbols[name] = symbols
+				self.errors.pop(name, None)
+			else:
+				self.fragments.pop(name, None)
+				self.symbols.pop(name, None)
+				self.errors[name] = error
+
+	def run(self):
+
+		"""
+		desc:
+			Finds and documents all modules.
+
+		returns:
+			desc:	The build itself.
+			type:	PackageBuild
+		"""
+
+		self.modules = findModules(self.package)
+		self.hashes.clear()
+		self.fragments.clear()
+		self.symbols.clear()
+		self.errors.clear()
+		self.render([name for name, path in self.modules])
+		return self
+
+	def scan(self):
+
+		"""
+		desc:
+			Finds all modules, hashes their source files, and determines which
+			modules of the package they (directly or indirectly) import. The
+			documentation of a module depends on the modules that it imports,
+			because imported classes and functions are documented as well.
+
+		visible:	False
+		"""
+
+		from yamldoc import version
+		self.version = version
+		self.modules = findModules(self.package)
+		names = frozenset(name for name, path in self.modules)
+		self.hashes = dict((name, fileHash(path)) \
+			for name, path in self.modules)
+		imports = dict((name, moduleImports(name, path, names)) \
+			for name, path in self.modules)
+		self.dependencies = {}
+		for name in names:
+			deps = set()
+			todo = list(imports[name])
+			while todo:
+				dep = todo.pop()
+				if dep in deps or dep == name:
+					continue
+				deps.add(dep)
+				todo += imports[dep]
+			self.dependencies[name] = sorted(deps)
+
+	def manifestEntry(self, name):
+
+		"""
+		desc:
+			Gets the manifest entry of a module, which describes everything
+			that its documentation depends on.
+
+		visible:	False
+
+		arguments:
+			name:
+				desc:	The module name.
+				type:	[str, unicode]
+
+		returns:
+			type:	dict
+		"""
+
+		return {
+			u'version'		: self.version,
+			u'options'		: self.options(name),
+			u'static'		: self.static,
+			u'hash'			: self.hashes[name],
+			u'dependencies'	: dict((dep, self.hashes[dep]) \
+				for dep in self.dependencies[name]),
+			}
+
+	def readManifest(self, outDir):
+
+		"""
+		desc:
+			Reads the manifest of a previous build.
+
+		visible:	False
+
+		arguments:
+			outDir:
+				desc:	The output folder.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The manifest, which has a `modules` dict with module names
+					as keys and manifest entries as values, and a `symbols`
+					dict with module names as keys and [SymbolIndex] entries
+					as values. The dict is empty if there is no (valid)
+					manifest.
+			type:	dict
+		"""
+
+		path = os.path.join(outDir, self.manifestName)
+		if not os.path.isfile(path):
+			return {}
+		try:
+			with io.open(path, encoding=u'utf-8') as fd:
+				manifest = json.load(fd)
+		except ValueError:
+			return {}
+		if manifest.get(u'package') != self.package:
+			return {}
+		return manifest
+
+	def fragmentPath(self, outDir, name):
+
+		"""
+		desc:
+			Gets the path to the documentation of a module.
+
+		visible:	False
+
+		arguments:
+			outDir:
+				desc:	The output folder.
+				type:	[str, unicode]
+			name:
+				desc:	The module name.
+				type:	[str, unicode]
+
+		returns:
+			type:	unicode
+		"""
+
+		return os.path.join(outDir, name + u'.md')
+
+	def update(self, outDir):
+
+		"""
+		desc:
+			Updates the documentation in an output folder. Only modules whose
+			source, options, or yamldoc version changed since the previous
+			build (or that import such modules) are documented again. The
+			documentation of the other modules is reused. The build is
+			recorded in a manifest in the output folder.
+
+		arguments:
+			outDir:
+				desc:	The output folder, which is created if necessary.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The build itself.
+			type:	PackageBuild
+		"""
+
+		self.scan()
+		manifest = self.readManifest(outDir)
+		entries = manifest.get(u'modules', {})
+		symbols = manifest.get(u'symbols', {})
+		self.fragments.clear()
+		self.symbols.clear()
+		self.errors.clear()
+		stale = []
+		for name, path in self.modules:
+			fragmentPath = self.fragmentPath(outDir, name)
+			if self.hashes[name] is None or \
+				entries.get(name) != self.manifestEntry(name) or \
+				name not in symbols or not os.path.isfile(fragmentPath):
+				stale.append(name)
+				continue
+			with io.open(fragmentPath, encoding=u'utf-8') as fd:
+				self.fragments[name] = fd.read()
+			self.symbols[name] = [tuple(entry) for entry in symbols[name]]
+		self.render(stale)
+		# Remove the documentation of modules that no longer exist
+		for name in entries:
+			if name not in self.hashes:
+				fragmentPath = self.fragmentPath(outDir, name)
+				if os.path.isfile(fragmentPath):
+					os.remove(fragmentPath)
+		self.write(outDir, names=self.rendered)
+		return self
+
+	def iterChunks(self):
+
+		"""
+		desc:
+			Generates the merged documentation of all modules, in order of
+			module name.
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		return emit(self.rawChunks())
+
+	def rawChunks(self):
+
+		"""
+		desc:
+			Generates the merged documentation of all modules, followed by a
+			single table of link references for all modules, without
+			collapsing runs of blank lines.
+
+		visible:	False
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		for name, path in self.modules:
+			if name in self.fragments:
+				yield self.fragments[name]
+		for chunk in self.symbolIndex().referenceChunks():
+			yield chunk
+
+	def symbolIndex(self):
+
+		"""
+		desc:
+			Gets the index of the documented objects of all modules, which
+			are merged in order of module name.
+
+		returns:
+			type:	SymbolIndex
+		"""
+
+		index = SymbolIndex()
+		for name, path in self.modules:
+			if name in self.symbols:
+				index.merge(self.symbols[name])
+		return index
+
+	def markdown(self):
+
+		"""
+		desc:
+			Gets the merged documentation of all modules.
+
+		returns:
+			type:	unicode
+		"""
+
+		return u''.join(self.iterChunks())
+
+	def write(self, outDir, names=None):
+
+		"""
+		desc:
+			Writes the documentation of each module to `[module name].md`, the
+			merged documentation to `index.md`, the index of all documented
+			objects to `symbols.json` (see [SymbolIndex]), and a manifest that
+			allows later builds to be incremental (see
+			[PackageBuild.update]). The documentation of modules that could
+			not be documented is removed.
+
+		arguments:
+			outDir:
+				desc:	The output folder, which is created if necessary.
+				type:	[str, unicode]
+
+		keywords:
+			names:
+				desc:	The names of the modules whose documentation should be
+						written, or None to write all modules.
+				type:	[list, NoneType]
+		"""
+
+		if not os.path.isdir(outDir):
+			os.makedirs(outDir)
+		for name, md in self.fragments.items():
+			if names is not None and name not in names:
+				continue
+			with io.open(self.fragmentPath(outDir, name), u'w',
+				encoding=u'utf-8') as fd:
+				fd.write(md)
+		# The documentation of modules that could no longer be documented
+		# is removed, rather than left in place from an earlier build.
+		for name in self.errors:
+			fragmentPath = self.fragmentPath(outDir, name)
+			if os.path.isfile(fragmentPath):
+				os.remove(fragmentPath)
+		with io.open(os.path.join(outDir, u'index.md'), u'w',
+			encoding=u'utf-8') as fd:
+			for chunk in self.iterChunks():
+				fd.write(chunk)
+		with io.open(os.path.join(outDir, u'symbols.json'), u'w',
+			encoding=u'utf-8') as fd:
+			self.symbolIndex().dump(fd)
+		# Modules that could not be documented are left out of the manifest,
+		# so that they are tried again next time.
+		if not self.hashes:
+			self.scan()
+		manifest = {
+			u'package'	: self.package,
+			u'modules'	: dict((name, self.manifestEntry(name)) \
+				for name in self.fragments),
+			u'symbols'	: self.symbols,
+			}
+		with io.open(os.path.join(outDir, self.manifestName), u'w',
+			encoding=u'utf-8') as fd:
+			fd.write(safe_decode(json.dumps(manifest, indent=1,
+				sort_keys=True)))
+
+def buildPackage(package, outDir=None, incremental=True, **kwargs):
+
+	"""
+	desc:
+		Documents a package and all its submodules. See [PackageBuild].
+
+	example: |
+		import yamldoc
+
+		md = yamldoc.buildPackage(u'mypackage', jobs=8).markdown()
+
+	arguments:
+		package:
+			desc:	The name of the package.
+			type:	[str, unicode]
+
+	keywords:
+		outDir:
+			desc:	An output folder for the documentation, or None to not
+					write the documentation to disk.
+			type:	[str, unicode, NoneType]
+		incremental:
+			desc:	Indicates whether documentation from a previous build in
+					the output folder should be reused for modules that have
+					not changed (see [PackageBuild.update]).
+			type:	bool
+
+	keyword-dict:
+		kwargs:		Keywords that are passed to [PackageBuild].
+
+	returns:
+		desc:	The finished build.
+		type:	PackageBuild
+	"""
+
+	build = PackageBuild(package, **kwargs)
+	if outDir is None:
+		return build.run()
+	if incremental:
+		return build.update(outDir)
+	build.run().write(outDir)
+	return build
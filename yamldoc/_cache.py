@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from yamldoc._yaml import orderedLoad
+
+def docHash(text):
+
+	"""
+	desc:
+		Gets a hash of a docstring, which is used as a cache key.
+
+	visible:	False
+
+	arguments:
+		text:
+			desc:	A docstring.
+			type:	[str, unicode]
+
+	returns:
+		desc:	A hexadecimal SHA-1 digest.
+		type:	str
+	"""
+
+	return hashlib.sha1(safe_encode(text, u'utf-8')).hexdigest()
+
+def copyParsed(obj):
+
+	"""
+	desc:
+		Copies a parsed YAML structure, so that the copy can be modified
+		without affecting the cached original. This is faster than
+		`copy.deepcopy()`, because it only needs to deal with the types that
+		YAML produces.
+
+	visible:	False
+
+	arguments:
+		obj:	A parsed YAML structure.
+
+	returns:
+		desc:	A copy of the structure.
+	"""
+
+	if isinstance(obj, dict):
+		return obj.__class__((key, copyParsed(value)) \
+			for key, value in obj.items())
+	if isinstance(obj, list):
+		return [copyParsed(value) for value in obj]
+	if isinstance(obj, set):
+		return set(obj)
+	return obj
+
+class ParseCache(object):
+
+	"""
+	desc:
+		A bounded, process-wide LRU cache of parsed docstrings. Docstrings are
+		identified by a hash of their text, so that identical docstrings (for
+		example of inherited methods, or of objects that are documented under
+		multiple names) are parsed only once. The cache returns copies of
+		cached entries, so that callers can modify them freely. Optionally,
+		the cache is backed by a persistent [DiskCache].
+
+	example: |
+		import yamldoc
+
+		print(yamldoc.parseCache.stats())
+		yamldoc.parseCache.clear()
+	"""
+
+	def __init__(self, maxSize=4096):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			maxSize:
+				desc:	The maximum number of cached docstrings.
+				type:	int
+		"""
+
+		self.maxSize = maxSize
+		self.diskCache = None
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def load(self, text):
+
+		"""
+		desc:
+			Parses a YAML docstring, or gets the parse result from the cache.
+			Docstrings that fail to parse are not cached.
+
+		arguments:
+			text:
+				desc:	YAML text.
+				type:	[str, unicode]
+
+		returns:
+			desc:	A copy of the parsed data structure.
+		"""
+
+		key = docHash(text)
+		with self._lock:
+			if key in self._entries:
+				self.hits += 1
+				obj = self._entries.pop(key)
+				self._entries[key] = obj
+				return copyParsed(obj)
+			self.misses += 1
+		obj = self.parse(text, key)
+		with self._lock:
+			self._entries[key] = obj
+			while len(self._entries) > self.maxSize:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+		return copyParsed(obj)
+
+	def parse(self, text, key):
+
+		"""
+		desc:
+			Parses a docstring that is not in the cache.
+
+		visible:	False
+
+		arguments:
+			text:
+				desc:	YAML text.
+				type:	[str, unicode]
+			key:
+				desc:	The hash of the text.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The parsed data structure.
+		"""
+
+		if self.diskCache is None:
+			return orderedLoad(text)
+		found, obj = self.diskCache.get(key)
+		if not found:
+			obj = orderedLoad(text)
+			self.diskCache.put(key, obj)
+		return obj
+
+	def resize(self, maxSize):
+
+		"""
+		desc:
+			Changes the maximum number of cached docstrings, and evicts the
+			least-recently used entries if necessary.
+
+		arguments:
+			maxSize:
+				desc:	The maximum number of cached docstrings.
+				type:	int
+		"""
+
+		with self._lock:
+			self.maxSize = maxSize
+			while len(self._entries) > self.maxSize:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+	def clear(self):
+
+		"""
+		desc:
+			Removes all entries from the cache, and resets the statistics.
+		"""
+
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+			self.evictions = 0
+
+	def stats(self):
+
+		"""
+		desc:
+			Gets cache statistics.
+
+		returns:
+			desc:	An OrderedDict with the number of hits, misses, and
+					evictions, and the current and maximum size.
+			type:	OrderedDict
+		"""
+
+		with self._lock:
+			return OrderedDict([
+				(u'hits',		self.hits),
+				(u'misses',		self.misses),
+				(u'evictions',	self.evictions),
+				(u'size',		len(self._entries)),
+				(u'maxSize',	self.maxSize),
+				])
+
+parseCache = ParseCache()
+if os.environ.get(u'YAMLDOC_CACHE_DIR'):
+	from yamldoc._diskcache import enableDiskCache
+	enableDiskCache()
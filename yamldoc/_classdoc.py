@@ -20,8 +20,8 @@ along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
 
 from yamldoc.py3compat import *
 from yamldoc._basedoc import BaseDoc
-from yamldoc._docfactory import DocFactory
-from yamldoc.py3compat import *
+from yamldoc._model import ClassNode
+from yamldoc._inherit import resolvePending
 
 class ClassDoc(BaseDoc):
 
@@ -32,23 +32,38 @@ class ClassDoc(BaseDoc):
 		False
 	"""
 
-	def header(self, _dict):
+	kind = u'class'
+	nodeClass = ClassNode
+
+	def header(self, node):
+
+		return u'%s __%s__' % (u'class' if node.descriptor is None \
+			else node.descriptor, node.name)
 
-		return u'%s __%s__' % (u'class' if self.customDescriptor is None \
-			else self.customDescriptor, self.name())
+	def docString(self):
 
-	def misc(self, _dict):
+		# Classes that inherit docstrings lazily do so when they are first
+		# documented.
+		resolvePending(self.obj)
+		return super(ClassDoc, self).docString()
 
-		md = u''
-		for attribName, attrib in self.objAttribs():
+	def children(self, node):
+
+		types = [u'function', u'property']
+		for attribName, attrib in self.traced(u'objAttribs',
+			self.objAttribs, types=types):
 			if attribName in self.exclude:
 				continue
-			df = DocFactory(attrib, namePrefix=u'%s.' % self.name(),
-				level=self.level+1, types=[u'function', u'property'],
-				container=self.container, exclude=self.exclude)
+			df = self.docFactory(attrib, namePrefix=u'%s.' % node.name,
+				level=self.level+1, types=types, **self.childOptions())
 			if df is not None:
-				md += str(df)
-		return md
+				yield df
+
+	def modelFields(self, _dict):
+
+		fields = super(ClassDoc, self).modelFields(_dict)
+		fields['descriptor'] = self.customDescriptor
+		return fields
 
 	def _name(self):
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import sys
+import argparse
+
+def cacheCommand(args):
+
+	"""
+	desc:
+		Implements the `cache` command, which manages the persistent parse
+		cache.
+
+	visible:	False
+
+	arguments:
+		args:	Parsed command-line arguments.
+	"""
+
+	from yamldoc._diskcache import DiskCache
+	kwargs = {}
+	if args.max_size is not None:
+		kwargs[u'maxSize'] = args.max_size
+	cache = DiskCache(path=args.dir, **kwargs)
+	if args.action == u'prune':
+		print(u'Removed %d entries' % cache.prune())
+	elif args.action == u'clear':
+		cache.clear()
+	for key, value in cache.stats().items():
+		print(u'%s: %s' % (key, value))
+
+def buildCommand(args):
+
+	"""
+	desc:
+		Implements the `build` command, which documents a package and all its
+		submodules.
+
+	visible:	False
+
+	arguments:
+		args:	Parsed command-line arguments.
+
+	returns:
+		desc:	The exit code.
+		type:	int
+	"""
+
+	from yamldoc._build import buildPackage
+	build = buildPackage(args.package, outDir=args.outdir,
+		incremental=not args.force, jobs=args.jobs or None, level=args.level,
+		container=args.container, exclude=args.exclude, static=args.static)
+	if args.outdir is not None:
+		sys.stderr.write(u'Documented %d of %d modules\n' % (
+			len(build.rendered), len(build.modules)))
+	for name, error in build.errors.items():
+		sys.stderr.write(u'Failed to document %s\n%s\n' % (name, error))
+	if args.outdir is None:
+		for chunk in build.iterChunks():
+			sys.stdout.write(chunk)
+	return 1 if build.errors else 0
+
+def watchCommand(args):
+
+	"""
+	desc:
+		Implements the `watch` command, which keeps the documentation of a
+		package up to date while it is being edited.
+
+	visible:	False
+
+	arguments:
+		args:	Parsed command-line arguments.
+
+	returns:
+		desc:	The exit code.
+		type:	int
+	"""
+
+	from yamldoc._watch import Watcher
+	Watcher(args.package, args.outdir, interval=args.interval,
+		debounce=args.debounce, jobs=args.jobs or None, level=args.level,
+		container=args.container, exclude=args.exclude,
+		static=args.static).watch()
+	return 0
+
+def exportCommand(args):
+
+	"""
+	desc:
+		Implements the `export` command, which writes the documentation tree
+		of a module as JSON or MessagePack.
+
+	visible:	False
+
+	arguments:
+		args:	Parsed command-line arguments.
+
+	returns:
+		desc:	The exit code.
+		type:	int
+	"""
+
+	from yamldoc._export import export
+	if args.static:
+		from yamldoc._static import staticDoc
+		df = staticDoc(args.module)
+	else:
+		import importlib
+		from yamldoc._docfactory import DocFactory
+		df = DocFactory(importlib.import_module(args.module))
+	binary = args.format == u'msgpack'
+	if args.outfile is not None:
+		import io
+		with io.open(args.outfile, u'wb' if binary else u'w',
+			**({} if binary else {u'encoding': u'utf-8'})) as fd:
+			export(df, fd, format=args.format)
+	elif binary:
+		export(df, getattr(sys.stdout, u'buffer', sys.stdout),
+			format=args.format)
+	else:
+		export(df, sys.stdout, format=args.format)
+	return 0
+
+def htmlCommand(args):
+
+	"""
+	desc:
+		Implements the `html` command, which writes the documentation of a
+		module as HTML.
+
+	visible:	False
+
+	arguments:
+		args:	Parsed command-line arguments.
+
+	returns:
+		desc:	The exit code.
+		type:	int
+	"""
+
+	from yamldoc._html import renderHtml
+	if args.static:
+		from yamldoc._static import staticDoc
+		df = staticDoc(args.module)
+	else:
+		import importlib
+		from yamldoc._docfactory import DocFactory
+		df = DocFactory(importlib.import_module(args.module))
+	title = args.title if args.title is not None else args.module
+	if args.outfile is not None:
+		import io
+		with io.open(args.outfile, u'w', encoding=u'utf-8') as fd:
+			renderHtml(df, fd, title=title)
+	else:
+		renderHtml(df, sys.stdout, title=title)
+	return 0
+
+def main(argv=None):
+
+	"""
+	desc: |
+		The command-line interface, which is available as `python -m yamldoc`.
+
+		~~~
+		python -m yamldoc build PACKAGE [OUTDIR] [--jobs N] [--force]
+			[--static] [--level N] [--container TAG] [--exclude NAME ...]
+		python -m yamldoc watch PACKAGE OUTDIR [--jobs N] [--static]
+			[--interval S] [--debounce S] [--level N] [--container TAG] [--exclude NAME ...]
+		python -m yamldoc export MODULE [OUTFILE] [--format json|msgpack]
+			[--static]
+		python -m yamldoc html MODULE [OUTFILE] [--static] [--title TITLE]
+		python -m yamldoc cache [stats|prune|clear] [--dir DIR] [--max-size N]
+		~~~
+
+	keywords:
+		argv:
+			desc:	A list of command-line arguments, or None to use
+					`sys.argv`.
+			type:	[list, NoneType]
+	"""
+
+	parser = argparse.ArgumentParser(prog=u'python -m yamldoc')
+	commands = parser.add_subparsers(dest=u'command')
+	build = commands.add_parser(u'build',
+		help=u'Document a package and all its submodules')
+	build.add_argument(u'package', help=u'The name of the package')
+	build.add_argument(u'outdir', nargs=u'?', default=None,
+		help=u'The output folder (default: write to stdout)')
+	build.add_argument(u'-j', u'--jobs', type=int, default=1,
+		help=u'The number of worker processes (0: one per CPU)')
+	build.add_argument(u'-f', u'--force', action=u'store_true',
+		help=u'Document all modules, even if they have not changed since '
+		u'the previous build in OUTDIR')
+	build.add_argument(u'--static', action=u'store_true',
+		help=u'Parse the source code instead of importing modules')
+	build.add_argument(u'--level', type=int, default=1,
+		help=u'The header level of the package')
+	build.add_argument(u'--container', default=u'span',
+		help=u'The HTML container type')
+	build.add_argument(u'--exclude', nargs=u'*', default=[],
+		help=u'Child objects to exclude')
+	build.set_defaults(func=buildCommand)
+	watch = commands.add_parser(u'watch',
+		help=u'Keep the documentation of a package up to date')
+	watch.add_argument(u'package', help=u'The name of the package')
+	watch.add_argument(u'outdir', help=u'The output folder')
+	watch.add_argument(u'-j', u'--jobs', type=int, default=1,
+		help=u'The number of worker processes (0: one per CPU)')
+	watch.add_argument(u'--static', action=u'store_true',
+		help=u'Parse the source code instead of importing modules')
+	watch.add_argument(u'--interval', type=float, default=.5,
+		help=u'The polling interval in seconds')
+	watch.add_argument(u'--debounce', type=float, default=.3,
+		help=u'The time in seconds that files should be unchanged before '
+		u'rebuilding')
+	watch.add_argument(u'--level', type=int, default=1,
+		help=u'The header level of the package')
+	watch.add_argument(u'--container', default=u'span',
+		help=u'The HTML container type')
+	watch.add_argument(u'--exclude', nargs=u'*', default=[],
+		help=u'Child objects to exclude')
+	watch.set_defaults(func=watchCommand)
+	export = commands.add_parser(u'export',
+		help=u'Export the documentation tree of a module')
+	export.add_argument(u'module', help=u'The name of the module')
+	export.add_argument(u'outfile', nargs=u'?', default=None,
+		help=u'The output file (default: write to stdout)')
+	export.add_argument(u'--format', default=u'json',
+		choices=[u'json', u'msgpack'])
+	export.add_argument(u'--static', action=u'store_true',
+		help=u'Parse the source code instead of importing the module')
+	export.set_defaults(func=exportCommand)
+	html = commands.add_parser(u'html',
+		help=u'Write the documentation of a module as HTML')
+	html.add_argument(u'module', help=u'The name of the module')
+	html.add_argument(u'outfile', nargs=u'?', default=None,
+		help=u'The output file (default: write to stdout)')
+	html.add_argument(u'--static', action=u'store_true',
+		help=u'Parse the source code instead of importing the module')
+	html.add_argument(u'--title', default=None,
+		help=u'The page title (default: the name of the module)')
+	html.set_defaults(func=htmlCommand)
+	cache = commands.add_parser(u'cache',
+		help=u'Manage the persistent parse cache')
+	cache.add_argument(u'action', nargs=u'?', default=u'stats',
+		choices=[u'stats', u'prune', u'clear'])
+	cache.add_argument(u'--dir', default=None,
+		help=u'The cache folder (default: $YAMLDOC_CACHE_DIR or '
+		u'~/.cache/yamldoc)')
+	cache.add_argument(u'--max-size', type=int, default=None,
+		help=u'The maximum size of the cache in bytes')
+	cache.set_defaults(func=cacheCommand)
+	args = parser.parse_args(argv)
+	if not hasattr(args, u'func'):
+		parser.print_help()
+		return 1
+	return args.func(args)
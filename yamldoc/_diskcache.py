@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import os
+import json
+import atexit
+import sqlite3
+import weakref
+import threading
+from time import time as now
+from collections import OrderedDict
+
+def defaultCacheDir():
+
+	"""
+	desc:
+		Gets the default folder for the persistent parse cache. This is the
+		`YAMLDOC_CACHE_DIR` environment variable if it is set, and otherwise
+		a `yamldoc` subfolder of the user's cache folder.
+
+	returns:
+		type:	unicode
+	"""
+
+	if os.environ.get(u'YAMLDOC_CACHE_DIR'):
+		return os.environ[u'YAMLDOC_CACHE_DIR']
+	base = os.environ.get(u'XDG_CACHE_HOME') or \
+		os.path.join(os.path.expanduser(u'~'), u'.cache')
+	return os.path.join(base, u'yamldoc')
+
+# All caches are flushed by a single exit handler. The caches are referenced
+# weakly, so that a cache that is no longer used can be garbage collected.
+_instances = weakref.WeakSet()
+
+def flushAll():
+
+	"""
+	desc:
+		Commits the pending writes of all caches. This is called when Python
+		exits.
+
+	visible:	False
+	"""
+
+	for cache in list(_instances):
+		cache.flush()
+
+atexit.register(flushAll)
+
+class DiskCache(object):
+
+	"""
+	desc:
+		A persistent cache of parsed docstrings, which is stored in an SQLite
+		database, so that parse results can be reused across processes, for
+		example by consecutive documentation builds. Entries are identified by
+		the hash of the docstring and by the versions of yamldoc, PyYAML, and
+		the storage format, and the least recently used entries are evicted
+		when the cache exceeds its maximum size. Entries are stored as JSON,
+		so parse results that JSON cannot represent exactly, such as
+		timestamps, are not cached.
+
+	example: |
+		import yamldoc
+
+		# Enable the persistent cache for the in-memory parse cache
+		yamldoc.enableDiskCache()
+		# Remove old entries
+		yamldoc.parseCache.diskCache.prune()
+	"""
+
+	filename = u'parsecache.sqlite'
+	# Increased whenever the way in which entries are stored changes
+	formatVersion = 2
+	# Writes are committed in batches, because committing every single write
+	# is slow.
+	commitInterval = 256
+
+	def __init__(self, path=None, maxSize=64*1024**2):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			path:
+				desc:	The cache folder, or None to use the default folder (see
+						`defaultCacheDir()`).
+				type:	[str, unicode, NoneType]
+			maxSize:
+				desc:	The maximum size of the cached data in bytes.
+				type:	int
+		"""
+
+		import yaml
+		from yamldoc import version
+		self.version = u'%s/%s/%s' % (version, yaml.__version__,
+			self.formatVersion)
+		self.path = defaultCacheDir() if path is None else path
+		self.maxSize = maxSize
+		self._lock = threading.Lock()
+		self._conn = None
+		self._pid = None
+		self._pending = 0
+		self._touched = set()
+		_instances.add(self)
+
+	def connection(self):
+
+		"""
+		desc:
+			Gets a database connection. Connections are not shared with child
+			processes, which open their own connection when they first use the
+			cache.
+
+		visible:	False
+
+		returns:
+			type:	sqlite3.Connection
+		"""
+
+		if self._conn is not None and self._pid == os.getpid():
+			return self._conn
+		if not os.path.isdir(self.path):
+			os.makedirs(self.path)
+		self._conn = sqlite3.connect(os.path.join(self.path, self.filename),
+			timeout=30, check_same_thread=False)
+		self._pid = os.getpid()
+		self._pending = 0
+		self._touched = set()
+		self._conn.execute(u'PRAGMA journal_mode=WAL')
+		self._conn.execute(u'PRAGMA synchronous=NORMAL')
+		self._conn.execute(u'''CREATE TABLE IF NOT EXISTS entries (
+			hash TEXT NOT NULL,
+			version TEXT NOT NULL,
+			data BLOB NOT NULL,
+			size INTEGER NOT NULL,
+			atime REAL NOT NULL,
+			PRIMARY KEY (hash, version))''')
+		self._conn.commit()
+		return self._conn
+
+	def get(self, key):
+
+		"""
+		desc:
+			Gets a parse result from the cache.
+
+		arguments:
+			key:
+				desc:	The hash of a docstring.
+				type:	[str, unicode]
+
+		returns:
+			desc:	A (found, obj) tuple, where found indicates whether the
+					docstring was in the cache.
+			type:	tuple
+		"""
+
+		with self._lock:
+			row = self.connection().execute(
+				u'SELECT data FROM entries WHERE hash=? AND version=?',
+				(key, self.version)).fetchone()
+			if row is None:
+				return False, None
+			# Access times are updated in batches, when writes are committed
+			self._touched.add(key)
+			self._written()
+		return True, json.loads(row[0], object_pairs_hook=OrderedDict)
+
+	def put(self, key, obj):
+
+		"""
+		desc:
+			Adds a parse result to the cache.
+
+		arguments:
+			key:
+				desc:	The hash of a docstring.
+				type:	[str, unicode]
+			obj:		The parse result.
+		"""
+
+		try:
+			data = json.dumps(obj, separators=(u',', u':'))
+		except (TypeError, ValueError):
+			return
+		# JSON turns tuples into lists and keys into strings, and such
+		# results are not cached, because they would not load identically.
+		if json.loads(data, object_pairs_hook=OrderedDict) != obj:
+			return
+		with self._lock:
+			self.connection().execute(
+				u'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+				(key, self.version, data, len(data), now()))
+			self._written()
+
+	def _written(self):
+
+		"""
+		desc:
+			Commits pending writes, and prunes the cache, after every
+			[DiskCache.commitInterval] writes or cache hits.
+
+		visible:	False
+		"""
+
+		self._pending += 1
+		if self._pending >= self.commitInterval:
+			self._commit()
+
+	def _commit(self, evict=True):
+
+		"""
+		desc:
+			Updates the access times of entries that were read, commits
+			pending writes, and evicts entries if the cache is too large.
+			Should be called with the lock held.
+
+		visible:	False
+
+		keywords:
+			evict:
+				desc:	Indicates whether entries should be evicted.
+				type:	bool
+		"""
+
+		if self._touched:
+			t = now()
+			self._conn.executemany(
+				u'UPDATE entries SET atime=? WHERE hash=? AND version=?',
+				[(t, key, self.version) for key in self._touched])
+			self._touched.clear()
+		self._conn.commit()
+		self._pending = 0
+		if not evict:
+			return
+		size = self._conn.execute(
+			u'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+		if size > self.maxSize:
+			self._evict(self.maxSize)
+
+	def _evict(self, maxSize):
+
+		"""
+		desc:
+			Evicts entries from other versions, and then the least
+			recently used entries, until the cache is not larger than a
+			specified size. Should be called with the lock held.
+
+		visible:	False
+
+		arguments:
+			maxSize:
+				desc:	The maximum size of the cached data in bytes.
+				type:	int
+
+		returns:
+			desc:	The number of evicted entries.
+			type:	int
+		"""
+
+		conn = self._conn
+		n = conn.execute(u'DELETE FROM entries WHERE version!=?',
+			(self.version,)).rowcount
+		size = conn.execute(
+			u'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+		if size > maxSize:
+			evict = []
+			for key, entrySize in conn.execute(
+				u'SELECT hash, size FROM entries ORDER BY atime'):
+				if size <= maxSize:
+					break
+				evict.append((key,))
+				size -= entrySize
+			conn.executemany(u'DELETE FROM entries WHERE hash=?', evict)
+			n += len(evict)
+		conn.commit()
+		return n
+
+	def flush(self):
+
+		"""
+		desc:
+			Commits pending writes. This happens automatically when Python
+			exits.
+		"""
+
+		with self._lock:
+			if self._conn is not None and self._pid == os.getpid() and \
+				self._pending:
+				self._commit()
+
+	def prune(self, maxSize=None):
+
+		"""
+		desc:
+			Removes entries from other versions, and then the least
+			recently used entries, until the cache is not larger than a
+			specified size.
+
+		keywords:
+			maxSize:
+				desc:	The maximum size of the cached data in bytes, or None
+						to use the maximum size of the cache.
+				type:	[int, NoneType]
+
+		returns:
+			desc:	The number of removed entries.
+			type:	int
+		"""
+
+		with self._lock:
+			self.connection()
+			self._commit(evict=False)
+			n = self._evict(self.maxSize if maxSize is None else maxSize)
+			self._conn.execute(u'VACUUM')
+			return n
+
+	def clear(self):
+
+		"""
+		desc:
+			Removes all entries from the cache.
+		"""
+
+		with self._lock:
+			conn = self.connection()
+			conn.execute(u'DELETE FROM entries')
+			conn.commit()
+			self._pending = 0
+			self._touched.clear()
+			conn.execute(u'VACUUM')
+
+	def stats(self):
+
+		"""
+		desc:
+			Gets cache statistics.
+
+		returns:
+			desc:	An OrderedDict with the location of the cache, the number
+					of entries, and the current and maximum size in bytes.
+			type:	OrderedDict
+		"""
+
+		with self._lock:
+			entries, size = self.connection().execute(
+				u'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+				).fetchone()
+		return OrderedDict([
+			(u'path',		os.path.join(self.path, self.filename)),
+			(u'entries',	entries),
+			(u'size',		size),
+			(u'maxSize',	self.maxSize),
+			])
+
+def enableDiskCache(path=None, maxSize=64*1024**2):
+
+	"""
+	desc:
+		Enables the persistent parse cache, so that parsed docstrings are
+		reused across processes. The persistent cache is also enabled
+		automatically when the `YAMLDOC_CACHE_DIR` environment variable is
+		set.
+
+	keywords:
+		path:
+			desc:	The cache folder, or None to use the default folder.
+			type:	[str, unicode, NoneType]
+		maxSize:
+			desc:	The maximum size of the cached data in bytes.
+			type:	int
+
+	returns:
+		desc:	The persistent cache.
+		type:	DiskCache
+	"""
+
+	from yamldoc._cache import parseCache
+	if parseCache.diskCache is not None:
+		parseCache.diskCache.flush()
+	parseCache.diskCache = DiskCache(path=path, maxSize=maxSize)
+	return parseCache.diskCache
+
+def disableDiskCache():
+
+	"""
+	desc:
+		Disables the persistent parse cache.
+	"""
+
+	from yamldoc._cache import parseCache
+	if parseCache.diskCache is not None:
+		parseCache.diskCache.flush()
+	parseCache.diskCache = None
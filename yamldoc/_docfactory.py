@@ -57,15 +57,42 @@ def DocFactory(obj, types=[u'function', u'class', u'module', u'property'],
 		A doc object.
 	"""
 
-	if u'function' in types and inspect.isfunction(obj) or \
-		inspect.ismethod(obj):
+	kind = docType(obj)
+	if kind is None or kind not in types:
+		return None
+	if kind == u'function':
 		from yamldoc._functiondoc import FunctionDoc as Doc
-	elif u'class' in types and inspect.isclass(obj):
+	elif kind == u'class':
 		from yamldoc._classdoc import ClassDoc as Doc
-	elif u'module' in types and inspect.ismodule(obj):
+	elif kind == u'module':
 		from yamldoc._moduledoc import ModuleDoc as Doc
-	elif u'property' in types and type(obj) == property:
-		from yamldoc._propertydoc import PropertyDoc as Doc
 	else:
-		return None
+		from yamldoc._propertydoc import PropertyDoc as Doc
 	return Doc(obj, *args, **kwargs)
+
+def docType(obj):
+
+	"""
+	desc:
+		Determines which type of doc object documents an object.
+
+	visible:	False
+
+	arguments:
+		obj:	An object.
+
+	returns:
+		desc:	The type name (function, class, module, or property), or
+				None if the object cannot be documented.
+		type:	[unicode, NoneType]
+	"""
+
+	if inspect.isfunction(obj) or inspect.ismethod(obj):
+		return u'function'
+	if inspect.isclass(obj):
+		return u'class'
+	if inspect.ismodule(obj):
+		return u'module'
+	if type(obj) == property:
+		return u'property'
+	return None
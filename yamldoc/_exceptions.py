@@ -24,6 +24,10 @@ class InvalidReturnValue(Exception):
 
 	pass
 
+class InvalidYieldValue(InvalidReturnValue):
+
+	pass
+
 class InvalidArgument(Exception):
 
 	pass
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import json
+from collections import OrderedDict
+from yamldoc._exceptions import YAMLDocError
+try:
+	import msgpack
+except ImportError:
+	msgpack = None
+
+# The version of the export format, which changes only when the format
+# changes in a way that is not backwards compatible.
+schemaVersion = 1
+exportFormats = [u'json', u'msgpack']
+
+def exportTree(df):
+
+	"""
+	desc: |
+		Gets the documentation tree of an object as plain data, which consists
+		only of dicts, lists, strings, numbers, booleans, and None. This is
+		the same information from which the Markdown documentation is
+		generated, so that other tools don't need to parse Markdown.
+
+		Each object is a dict with the following keys:
+
+		- `kind`, `name`, `id`, `desc`, `visible`, `example`, and `source`,
+		  as described by the document model.
+		- `level`: the header level.
+		- `children`: a list of child objects.
+		- For functions: `args`, `defaults` (a list of dicts with a `name`,
+		  a `value` that is None if the value is not plain data, and a
+		  `repr`), `argumentList`, `keywordDict`, `kwonlyArgs` (a list of
+		  names), `kwonlyDefaults` (like `defaults`), `arguments` and
+		  `keywords` (lists of dicts with a `name`, a `desc`, and a dict of
+		  `props` such as `type`), `argumentListEntries` and
+		  `keywordDictEntries` (lists of dicts with a `name` and a `desc`),
+		  and `returns` and `yields`.
+		- For classes: `descriptor`.
+		- For objects that have already been documented elsewhere in the tree
+		  (see the `visited` keyword of [BaseDoc.__init__]): `link`, which is
+		  the id of the earlier documentation. These objects have no
+		  children.
+
+		Objects that are not visible are left out, just like in the Markdown
+		documentation.
+
+	example: |
+		import json
+		import yamldoc
+
+		tree = yamldoc.exportTree(yamldoc.DocFactory(yamldoc))
+		print(json.dumps(tree, indent=1))
+
+	arguments:
+		df:
+			desc:	A doc object, as created by [DocFactory] or [staticDoc].
+			type:	BaseDoc
+
+	returns:
+		desc:	A dict with a `schema` version and the `root` object, or None
+				if the object is not visible.
+		type:	[dict, NoneType]
+	"""
+
+	root = exportNode(df)
+	if root is None:
+		return None
+	return OrderedDict([(u'schema', schemaVersion), (u'root', root)])
+
+def exportNode(df):
+
+	"""
+	desc:
+		Gets the plain representation of a doc object and its children.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+
+	returns:
+		desc:	A dict, or None if the object is not visible.
+		type:	[dict, NoneType]
+	"""
+
+	node = df.model()
+	if not node.visible:
+		return None
+	d = node.asDict()
+	d[u'level'] = df.level
+	first = df.firstDocumented(node)
+	if first is not None:
+		d[u'link'] = first.id
+		d[u'children'] = []
+		return d
+	d[u'children'] = [child for child in (exportNode(childDoc) \
+		for childDoc in df.children(node)) if child is not None]
+	return d
+
+def export(df, stream, format=u'json'):
+
+	"""
+	desc:
+		Writes the documentation tree of an object (see [exportTree]) to a
+		file, as JSON or as MessagePack. MessagePack requires the `msgpack`
+		package.
+
+	example: |
+		import yamldoc
+
+		with open(u'doc.json', u'w') as fd:
+			yamldoc.export(yamldoc.DocFactory(yamldoc), fd)
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		stream:
+			desc:	A file-like object, which should accept unicode strings
+					for JSON and bytes for MessagePack.
+
+	keywords:
+		format:
+			desc:	The export format.
+			type:	[str, unicode]
+			valid:	[json, msgpack]
+	"""
+
+	if format not in exportFormats:
+		raise YAMLDocError(u'Invalid export format: %s' % format)
+	if format == u'msgpack' and msgpack is None:
+		raise YAMLDocError(
+			u'The msgpack package is required for MessagePack export')
+	tree = exportTree(df)
+	if format == u'json':
+		stream.write(safe_decode(json.dumps(tree, indent=1)))
+	else:
+		stream.write(msgpack.packb(tree, use_bin_type=True))
@@ -24,6 +24,7 @@ import inspect
 import yaml
 from yamldoc._basedoc import BaseDoc
 from yamldoc._exceptions import InvalidDocString
+from yamldoc._model import Entry, FunctionNode
 from collections import OrderedDict
 
 class FunctionDoc(BaseDoc):
@@ -35,78 +36,162 @@ class FunctionDoc(BaseDoc):
 		False
 	"""
 
+	kind = u'function'
+	nodeClass = FunctionNode
+	legacyHooks = dict(BaseDoc.legacyHooks, argSection=u'argDict',
+		argListSection=u'_dict', returnsSection=u'_dict')
+
 	def __init__(self, *args, **kwargs):
 
 		super(FunctionDoc, self).__init__(*args, **kwargs)
-		self.parseArgSpec()
+		self.traced(u'parseArgSpec', self.parseArgSpec)
+
+	def header(self, node):
+
+		return u'function __%s__\(%s\)' % (self.escape(node.name),
+			self.escape(self.signature(node)))
+
+	def signature(self, node):
 
-	def header(self, _dict):
+		"""
+		desc:
+			Generates the argument list of the header, as plain text.
+
+		visible:	False
+
+		arguments:
+			node:
+				desc:	A document-model node.
+				type:	FunctionNode
+
+		returns:
+			type:	unicode
+		"""
 
 		l = []
-		for arg in self.args:
+		for arg in node.args:
 			l.append(arg)
-		for kw, default in self.keywords.items():
-			if isinstance(default, basestring):
-				default = u'u\'%s\'' % safe_decode(default, enc=self.enc)
-			l.append(u'%s=%s' % (kw, str(default)))
-		if self.argumentList is not None:
-			l.append(u'*%s' % self.argumentList)
-		if self.keywordDict is not None:
-			l.append(u'**%s' % self.keywordDict)
-		return u'function __%s__\(%s\)' % (self.escape(self.name()),
-			self.escape(u', '.join(l)))
-
-	def sections(self, _dict):
-
-		md = super(FunctionDoc, self).sections(_dict)
-		if u'arguments' in _dict:
-			md += u'__Arguments:__\n\n' + self.argSection(_dict[u'arguments'])
-		if u'keywords' in _dict:
-			md += u'__Keywords:__\n\n' + self.argSection(_dict[u'keywords'])
-		if u'argument-list' in _dict:
-			md += u'__Argument list:__\n\n' + self.argListSection(
-				_dict[u'argument-list'])
-		if u'keyword-dict' in _dict:
-			md += u'__Keyword dict:__\n\n' + self.argListSection(
-				_dict[u'keyword-dict'], prefix=u'**')
-		if u'returns' in _dict:
-			md += u'__Returns:__\n\n' + self.returnsSection(_dict[u'returns'])
+		for kw, default in node.defaults:
+			l.append(self.keywordHeader(kw, default))
+		if node.argumentList is not None:
+			l.append(u'*%s' % node.argumentList)
+		elif node.kwonlyArgs:
+			l.append(u'*')
+		kwonlyDefaults = dict(node.kwonlyDefaults)
+		for kw in node.kwonlyArgs:
+			if kw in kwonlyDefaults:
+				l.append(self.keywordHeader(kw, kwonlyDefaults[kw]))
+			else:
+				l.append(kw)
+		if node.keywordDict is not None:
+			l.append(u'**%s' % node.keywordDict)
+		return u', '.join(l)
+
+	def keywordHeader(self, kw, default):
+
+		if isinstance(default, basestring):
+			default = u'u\'%s\'' % safe_decode(default, enc=self.enc)
+		return u'%s=%s' % (kw, str(default))
+
+	def sections(self, node):
+
+		md = super(FunctionDoc, self).sections(node)
+		if node.arguments is not None:
+			md += u'__Arguments:__\n\n' + self.hook(u'argSection',
+				node.arguments)
+		if node.keywords is not None:
+			md += u'__Keywords:__\n\n' + self.hook(u'argSection',
+				node.keywords)
+		if node.argumentListEntries is not None:
+			md += u'__Argument list:__\n\n' + self.hook(u'argListSection',
+				node.argumentListEntries)
+		if node.keywordDictEntries is not None:
+			md += u'__Keyword dict:__\n\n' + self.hook(u'argListSection',
+				node.keywordDictEntries, prefix=u'**')
+		if node.returns is not None:
+			md += u'__Returns:__\n\n' + self.hook(u'returnsSection',
+				node.returns)
+		if node.yields is not None:
+			md += u'__Yields:__\n\n' + self.hook(u'returnsSection',
+				node.yields)
 		return md
 
-	def argSection(self, argDict):
+	def argSection(self, entries):
 
+		# A sections() override that is written in the old way passes part of
+		# the docstring dict.
+		if isinstance(entries, dict):
+			entries = tuple(Entry.fromDict(arg, val) \
+				for arg, val in entries.items())
 		md = u''
-		for arg, _dict in argDict.items():
-			md += u'- `%s` -- %s\n' % (arg, _dict[u'desc'])
-			for prop, val in _dict.items():
-				if prop == u'desc':
-					continue
+		for entry in entries:
+			md += u'- `%s` -- %s\n' % (entry.name, entry.desc)
+			for prop, val in entry.props:
 				if prop in (u'type', u'valid'):
-					if isinstance(val, list):
+					if isinstance(val, (list, tuple)):
 						val = u', '.join(val)
 				elif prop == u'default':
 					val = repr(val)
 				md += u'\t- %s: %s\n' % (prop.capitalize(), val)
 		return md + u'\n'
 
-	def argListSection(self, _dict, prefix=u'*'):
+	def argListSection(self, entries, prefix=u'*'):
 
+		if isinstance(entries, dict):
+			entries = tuple(entries.items())
 		md = u''
-		for argList, val in _dict.items():
+		for argList, val in entries:
 			md += u'- `%s%s`: %s\n' % (prefix, argList, val)
 		return md + u'\n'
 
-	def returnsSection(self, _dict):
+	def returnsSection(self, entry):
 
-		md = _dict[u'desc'] + u'\n\n'
-		for prop, val in _dict.items():
-			if prop == u'desc':
-				continue
-			if isinstance(val, list):
-				val = u', '.join(val)
+		if isinstance(entry, dict):
+			entry = Entry.fromDict(None, entry)
+		md = entry.desc + u'\n\n'
+		for prop, val in entry.props:
+			if isinstance(val, (list, tuple)):
+				# Valid values are not necessarily strings
+				val = u', '.join(u'%s' % v for v in val)
 			md += u'- %s: %s\n' % (prop.capitalize(), val)
 		return md + u'\n'
 
+	def legacyValue(self, value):
+
+		if isinstance(value, Entry):
+			return self.entryDict(value)
+		if isinstance(value, tuple):
+			# Arguments and keywords are tuples of entries, and the argument
+			# list and keyword dict are tuples of (name, desc) tuples.
+			return OrderedDict((entry.name, self.entryDict(entry)) \
+				if isinstance(entry, Entry) else entry for entry in value)
+		return super(FunctionDoc, self).legacyValue(value)
+
+	def entryDict(self, entry):
+
+		"""
+		desc:
+			Converts an entry to the value dictionary that it was created from
+			(see `valDict()`).
+
+		visible:	False
+
+		arguments:
+			entry:
+				desc:	An argument, keyword, or return-value entry.
+				type:	Entry
+
+		returns:
+			type:	OrderedDict
+		"""
+
+		_dict = OrderedDict([(u'desc', entry.desc)])
+		for prop, val in entry.props:
+			if prop in (u'type', u'valid') and isinstance(val, tuple):
+				val = list(val)
+			_dict[prop] = val
+		return _dict
+
 	def argDict(self, argDict, args):
 
 		newDict = OrderedDict()
@@ -122,7 +207,7 @@ class FunctionDoc(BaseDoc):
 					% (self.name(), arg))
 		return newDict
 
-	def kwDict(self, kwDict, keywords):
+	def kwDict(self, kwDict, keywords, kwonlyArgs=(), kwonlyDefaults={}):
 
 		newDict = OrderedDict()
 		for kw in keywords:
@@ -131,8 +216,16 @@ class FunctionDoc(BaseDoc):
 			else:
 				newDict[kw] = self.valDict(u'No description',
 					default=keywords[kw])
+		# Keyword-only arguments are documented as keywords, but only have a
+		# default if one is specified in the signature.
+		for kw in kwonlyArgs:
+			properties = {}
+			if kw in kwonlyDefaults:
+				properties[u'default'] = kwonlyDefaults[kw]
+			newDict[kw] = self.valDict(kwDict.get(kw, u'No description'),
+				**properties)
 		for kw in kwDict.keys():
-			if kw not in keywords:
+			if kw not in keywords and kw not in kwonlyArgs:
 				raise InvalidDocString(
 					u'%s(): Defined non-existing keyword: %s' \
 					% (self.name(), kw))
@@ -157,7 +250,16 @@ class FunctionDoc(BaseDoc):
 		# introspection.
 		if hasattr(self.obj, u'__argspec__'):
 			return self.obj.__argspec__
-		return inspect.getargspec(self.obj)
+		return getargspec(self.obj)
+
+	def kwonlySpec(self):
+
+		# Keyword-only arguments are not part of the argument specification,
+		# and are stored separately as __kwonlyargs__ by the @validate
+		# decorator.
+		if hasattr(self.obj, u'__kwonlyargs__'):
+			return self.obj.__kwonlyargs__
+		return getkwonlyargs(self.obj)
 
 	def parseArgSpec(self):
 
@@ -175,6 +277,10 @@ class FunctionDoc(BaseDoc):
 				self.keywords[kw] = default
 		self.argumentList = argSpec.varargs
 		self.keywordDict = argSpec.keywords
+		kwonlyArgs, kwonlyDefaults = self.kwonlySpec()
+		self.kwonlyArgs = kwonlyArgs
+		self.kwonlyDefaults = OrderedDict((kw, kwonlyDefaults[kw]) \
+			for kw in kwonlyArgs if kw in kwonlyDefaults)
 		# We don't process the `self` argument
 		if len(self.args) > 0 and self.args[0] == u'self':
 			self.args = self.args[1:]
@@ -198,7 +304,8 @@ class FunctionDoc(BaseDoc):
 			_dict[u'desc'] = u'No description.'
 		if len(self.args) > 0 and u'arguments' not in _dict:
 			_dict[u'arguments'] = OrderedDict()
-		if len(self.keywords) > 0 and u'keywords' not in _dict:
+		if (len(self.keywords) > 0 or len(self.kwonlyArgs) > 0) and \
+			u'keywords' not in _dict:
 			_dict[u'keywords'] = OrderedDict()
 		if self.argumentList != None and u'argument-list' not in _dict:
 			_dict[u'argument-list'] = OrderedDict()
@@ -206,13 +313,13 @@ class FunctionDoc(BaseDoc):
 			_dict[u'keyword-dict'] = OrderedDict()
 		# Parse all sections, and make sure that they
 		for sectionName, sectionValue in _dict.items():
-			if sectionName == u'returns':
+			if sectionName in (u'returns', u'yields'):
 				_dict[sectionName] = self.valDict(sectionValue)
 			elif sectionName == u'arguments':
 				_dict[sectionName] = self.argDict(sectionValue, self.args)
 			elif sectionName == u'keywords':
 				_dict[sectionName] = self.kwDict(sectionValue,
-					self.keywords)
+					self.keywords, self.kwonlyArgs, self.kwonlyDefaults)
 			elif sectionName == u'argument-list':
 				_dict[sectionName] = self.argListDict(sectionValue,
 					self.argumentList)
@@ -221,6 +328,35 @@ class FunctionDoc(BaseDoc):
 					self.keywordDict)
 		return _dict
 
+	def modelFields(self, _dict):
+
+		fields = super(FunctionDoc, self).modelFields(_dict)
+		fields.update({
+			'args'		: tuple(self.args),
+			'defaults'	: tuple(self.keywords.items()),
+			'argumentList'	: self.argumentList,
+			'keywordDict'	: self.keywordDict,
+			'kwonlyArgs'	: tuple(self.kwonlyArgs),
+			'kwonlyDefaults'	: tuple(self.kwonlyDefaults.items()),
+			})
+		if u'arguments' in _dict:
+			fields['arguments'] = tuple(Entry.fromDict(arg, val) \
+				for arg, val in _dict[u'arguments'].items())
+		if u'keywords' in _dict:
+			fields['keywords'] = tuple(Entry.fromDict(kw, val) \
+				for kw, val in _dict[u'keywords'].items())
+		if u'argument-list' in _dict:
+			fields['argumentListEntries'] = tuple(
+				_dict[u'argument-list'].items())
+		if u'keyword-dict' in _dict:
+			fields['keywordDictEntries'] = tuple(
+				_dict[u'keyword-dict'].items())
+		if u'returns' in _dict:
+			fields['returns'] = Entry.fromDict(None, _dict[u'returns'])
+		if u'yields' in _dict:
+			fields['yields'] = Entry.fromDict(None, _dict[u'yields'])
+		return fields
+
 	def _name(self):
 
 		if self.customName is not None:
@@ -0,0 +1,815 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import re
+from yamldoc._symbols import SymbolIndex, objectKey
+
+# The HTML counterpart of docTemplate, which has the same structure, and which
+# is also split around the children.
+htmlTemplate = u"""<%(container)s class="%(className)s YAMLDoc" id="%(headerId)s">
+%(header)s%(desc)s%(sections)s%(misc)s</%(container)s>
+"""
+htmlHeader, htmlFooter = htmlTemplate.split(u'%(misc)s')
+htmlPage = u"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+</head>
+<body>
+%(body)s</body>
+</html>
+"""
+pageHeader, pageFooter = htmlPage.split(u'%(body)s')
+
+# Block-level Markdown
+fence = re.compile(u'^\\s{0,3}(~~~+|```+)\\s*\\.?([\\w+-]*)')
+heading = re.compile(u'^(#{1,6})\\s+(.*?)\\s*#*\\s*$')
+listItem = re.compile(u'^(\\s*)([-*+]|\\d+\\.)\\s+(.*)$')
+referenceDefinition = re.compile(
+	u'^\\s{0,3}\\[([^\\]]+)\\]:\\s*<?([^\\s>]+)>?\\s*$')
+htmlBlock = re.compile(u'^</?[A-Za-z][\\w-]*(\\s[^>]*)?/?>')
+# Inline Markdown
+codeSpan = re.compile(u'(`+)(.+?)\\1', re.S)
+backslashEscape = re.compile(u'\\\\([\\\\`*_{}\\[\\]()#+\\-.!<>])')
+autoLink = re.compile(u'<((?:https?|ftp|mailto):[^\\s>]+)>')
+inlineHtml = re.compile(u'</?[A-Za-z][\\w-]*(?:\\s[^<>]*)?/?>')
+entity = re.compile(u'&(?!#?\\w+;)')
+link = re.compile(u'\\[([^\\[\\]]*)\\]\\(\\s*<?([^\\s()>]*)>?\\s*\\)')
+referenceLink = re.compile(u'\\[([^\\[\\]]+)\\](?:\\s?\\[([^\\[\\]]*)\\])?')
+strong = re.compile(u'(\\*\\*|__)(?=\\S)(.+?)(?<=\\S)\\1', re.S)
+emphasis = re.compile(
+	u'(?<![\\w*])([*_])(?=[^\\s*_])(.+?)(?<=[^\\s*_])\\1(?![\\w*])', re.S)
+placeholder = re.compile(u'\ue000(\\d+)\ue001')
+
+def escapeHtml(text, quote=False):
+
+	"""
+	desc:
+		Escapes the characters that have a special meaning in HTML.
+
+	visible:	False
+
+	arguments:
+		text:
+			desc:	The text to escape.
+			type:	unicode
+
+	keywords:
+		quote:
+			desc:	Indicates whether double quotes should be escaped as well,
+					for use in attribute values.
+			type:	bool
+
+	returns:
+		type:	unicode
+	"""
+
+	text = text.replace(u'&', u'&amp;').replace(u'<', u'&lt;').replace(u'>',
+		u'&gt;')
+	if quote:
+		text = text.replace(u'"', u'&quot;')
+	return text
+
+class MarkdownConverter(object):
+
+	"""
+	desc: |
+		Converts the Markdown in docstrings to HTML. This covers the subset
+		of Markdown that is commonly used in docstrings:
+
+		- Paragraphs, headings, (nested) lists, fenced and indented code
+		  blocks, and raw HTML blocks.
+		- Code spans, strong and emphasized text, backslash escapes, inline
+		  HTML, automatic links, inline links, and reference links.
+
+		Reference links, such as [DocFactory], are resolved with reference
+		definitions in the same text, and otherwise with a [SymbolIndex], so
+		that they link to the documentation of the object.
+
+	visible:	False
+	"""
+
+	def __init__(self, symbols=None):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			symbols:
+				desc:	The index that is used to resolve reference links, or
+						None.
+				type:	[SymbolIndex, NoneType]
+		"""
+
+		self.symbols = symbols
+		self.references = {}
+
+	def convert(self, md):
+
+		"""
+		desc:
+			Converts a Markdown fragment to HTML.
+
+		arguments:
+			md:
+				desc:	The Markdown fragment.
+				type:	unicode
+
+		returns:
+			desc:	The HTML fragment.
+			type:	unicode
+		"""
+
+		lines = []
+		self.references = {}
+		for line in md.split(u'\n'):
+			m = referenceDefinition.match(line)
+			if m is not None:
+				self.references[m.group(1).lower()] = m.group(2)
+			else:
+				lines.append(line.rstrip())
+		return u''.join(self.blocks(lines))
+
+	def blocks(self, lines):
+
+		"""
+		desc:
+			Converts lines of Markdown to HTML blocks.
+
+		visible:	False
+
+		arguments:
+			lines:
+				desc:	A list of lines.
+				type:	list
+
+		returns:
+			desc:	A generator of HTML fragments.
+			type:	generator
+		"""
+
+		i = 0
+		while i < len(lines):
+			line = lines[i]
+			if not line.strip():
+				i += 1
+				continue
+			m = fence.match(line)
+			if m is not None:
+				j = i + 1
+				while j < len(lines) and not lines[j].strip().startswith(
+					m.group(1)):
+					j += 1
+				yield self.codeBlock(lines[i+1:j], m.group(2))
+				i = j + 1
+				continue
+			m = heading.match(line)
+			if m is not None:
+				level = len(m.group(1))
+				yield u'<h%d>%s</h%d>\n' % (level, self.inline(m.group(2)),
+					level)
+				i += 1
+				continue
+			if listItem.match(line) is not None:
+				j = self.listEnd(lines, i)
+				yield self.listBlock(lines[i:j])
+				i = j
+				continue
+			j = i + 1
+			while j < len(lines) and lines[j].strip():
+				j += 1
+			if htmlBlock.match(line) is not None:
+				yield u'\n'.join(lines[i:j]) + u'\n'
+			elif line.startswith((u'\t', u'    ')):
+				yield self.codeBlock([l[1:] if l.startswith(u'\t') else l[4:] \
+					for l in lines[i:j]])
+			else:
+				# A paragraph ends at a blank line, or where another block
+				# starts.
+				j = i + 1
+				while j < len(lines) and lines[j].strip() and \
+					fence.match(lines[j]) is None and \
+					heading.match(lines[j]) is None and \
+					listItem.match(lines[j]) is None:
+					j += 1
+				yield u'<p>%s</p>\n' % self.inline(u'\n'.join(
+					l.strip() for l in lines[i:j]))
+			i = j
+
+	def codeBlock(self, lines, language=u''):
+
+		"""
+		desc:
+			Converts a code block to HTML.
+
+		visible:	False
+
+		arguments:
+			lines:
+				desc:	The lines of code.
+				type:	list
+
+		keywords:
+			language:
+				desc:	The language of the code, or an empty string.
+				type:	unicode
+
+		returns:
+			type:	unicode
+		"""
+
+		cls = u' class="%s"' % escapeHtml(language, quote=True) if language \
+			else u''
+		return u'<pre><code%s>%s</code></pre>\n' % (cls,
+			escapeHtml(u'\n'.join(lines)))
+
+	def listEnd(self, lines, i):
+
+		"""
+		desc:
+			Finds the end of a list, which is the first line after a blank
+			line that is neither a list item nor indented.
+
+		visible:	False
+
+		arguments:
+			lines:
+				desc:	A list of lines.
+				type:	list
+			i:
+				desc:	The index of the first line of the list.
+				type:	int
+
+		returns:
+			desc:	The index of the first line after the list.
+			type:	int
+		"""
+
+		j = i + 1
+		while j < len(lines):
+			line = lines[j]
+			if not line.strip():
+				k = j + 1
+				while k < len(lines) and not lines[k].strip():
+					k += 1
+				if k == len(lines) or (listItem.match(lines[k]) is None \
+					and not lines[k][:1].isspace()):
+					return j
+				j = k
+				continue
+			if fence.match(line) is not None or heading.match(line) \
+				is not None:
+				return j
+			j += 1
+		return j
+
+	def listBlock(self, lines):
+
+		"""
+		desc:
+			Converts a (nested) list to HTML. Nesting is determined by the
+			indentation of the list items.
+
+		visible:	False
+
+		arguments:
+			lines:
+				desc:	The lines of the list.
+				type:	list
+
+		returns:
+			type:	unicode
+		"""
+
+		# Merge continuation lines into the items that they belong to
+		items = []
+		for line in lines:
+			if not line.strip():
+				continue
+			m = listItem.match(line)
+			if m is None:
+				if items:
+					items[-1][2].append(line.strip())
+				continue
+			indent = len(m.group(1).expandtabs(4))
+			tag = u'ul' if m.group(2) in u'-*+' else u'ol'
+			items.append((indent, tag, [m.group(3)]))
+		html = []
+		# A stack of (indent, tag) tuples for the open lists, each of which
+		# has an open list item.
+		stack = []
+		for indent, tag, text in items:
+			if stack and indent > stack[-1][0]:
+				html.append(u'\n<%s>\n' % tag)
+				stack.append((indent, tag))
+			else:
+				while len(stack) > 1 and indent < stack[-1][0]:
+					html.append(u'</li>\n</%s>\n' % stack.pop()[1])
+				if stack:
+					html.append(u'</li>\n')
+				else:
+					html.append(u'<%s>\n' % tag)
+					stack.append((indent, tag))
+			html.append(u'<li>%s' % self.inline(u'\n'.join(text)))
+		while stack:
+			html.append(u'</li>\n</%s>\n' % stack.pop()[1])
+		return u''.join(html)
+
+	def inline(self, md):
+
+		"""
+		desc:
+			Converts inline Markdown to HTML.
+
+		visible:	False
+
+		arguments:
+			md:
+				desc:	Inline Markdown.
+				type:	unicode
+
+		returns:
+			type:	unicode
+		"""
+
+		# Parts that should not be processed further are replaced by
+		# placeholders, which are restored at the end.
+		stash = []
+		def hide(html):
+			stash.append(html)
+			return u'\ue000%d\ue001' % (len(stash) - 1)
+		md = codeSpan.sub(lambda m: hide(u'<code>%s</code>' % escapeHtml(
+			m.group(2).strip())), md)
+		md = backslashEscape.sub(lambda m: hide(escapeHtml(m.group(1))), md)
+		md = autoLink.sub(lambda m: hide(u'<a href="%s">%s</a>' % (
+			escapeHtml(m.group(1), quote=True), escapeHtml(m.group(1)))), md)
+		md = inlineHtml.sub(lambda m: hide(m.group(0)), md)
+		md = entity.sub(u'&amp;', md).replace(u'<', u'&lt;').replace(u'>',
+			u'&gt;')
+		md = link.sub(lambda m: hide(u'<a href="%s">%s</a>' % (
+			escapeHtml(m.group(2), quote=True), m.group(1))), md)
+		md = referenceLink.sub(self.resolve, md)
+		md = strong.sub(lambda m: u'<strong>%s</strong>' % m.group(2), md)
+		md = emphasis.sub(lambda m: u'<em>%s</em>' % m.group(2), md)
+		# Placeholders may contain other placeholders, for example a link
+		# with a code span as text.
+		while placeholder.search(md) is not None:
+			md = placeholder.sub(lambda m: stash[int(m.group(1))], md)
+		return md
+
+	def resolve(self, m):
+
+		"""
+		desc:
+			Resolves a reference link, first with the reference definitions of
+			the current fragment, and then with the symbol index. Unresolved
+			references are left as they are.
+
+		visible:	False
+
+		arguments:
+			m:		A match of the `referenceLink` pattern.
+
+		returns:
+			type:	unicode
+		"""
+
+		text = m.group(1)
+		label = m.group(2) or text
+		# Labels may contain escaped characters, which are placeholders here
+		label = placeholder.sub(u'', label) if placeholder.search(label) \
+			is None else None
+		if label is None:
+			return m.group(0)
+		url = self.references.get(label.lower())
+		if url is None and self.symbols is not None:
+			id = self.symbols.resolve(label)
+			if id is not None:
+				url = u'#' + id
+		if url is None:
+			return m.group(0)
+		return u'<a href="%s">%s</a>' % (escapeHtml(url, quote=True), text)
+
+def collectSymbols(df, symbols, seen=None):
+
+	"""
+	desc:
+		Registers a doc object and its descendants in a symbol index, without
+		rendering them, so that links can be resolved while the HTML is
+		generated, also when they refer to objects that are documented
+		further on. Only the names and ids are kept, so that the doc objects
+		can be released as soon as they have been registered.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		symbols:
+			desc:	The symbol index.
+			type:	SymbolIndex
+
+	keywords:
+		seen:
+			desc:	The ids of the objects that have been registered, which is
+					used to visit objects only once if the doc object keeps
+					track of visited objects.
+			type:	[set, NoneType]
+	"""
+
+	node = df.model()
+	if not node.visible:
+		return
+	if not df.onlyContents:
+		symbols.add(node.name, node.id, objectKey(df.obj))
+	if df.visited is not None:
+		if seen is None:
+			seen = set()
+		if id(df.obj) in seen:
+			return
+		seen.add(id(df.obj))
+	for child in df.children(node):
+		collectSymbols(child, symbols, seen)
+
+def plainText(md):
+
+	"""
+	desc:
+		Removes the backslash escapes from Markdown text, such as the names
+		of objects, which are escaped for use in Markdown.
+
+	visible:	False
+
+	arguments:
+		md:
+			desc:	Markdown text.
+			type:	unicode
+
+	returns:
+		type:	unicode
+	"""
+
+	return backslashEscape.sub(u'\\1', md)
+
+def overridden(df, method):
+
+	"""
+	desc:
+		Checks whether a Markdown-generating method of a doc object is
+		overridden outside of yamldoc, in which case its Markdown is converted
+		to HTML, rather than generating HTML from the document model.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		method:
+			desc:	The name of the method, such as 'header' or 'sections'.
+			type:	unicode
+
+	returns:
+		type:	bool
+	"""
+
+	return not getattr(getattr(df.__class__, method), u'__module__',
+		u'').startswith(u'yamldoc.')
+
+def headerHtml(df, node, converter):
+
+	"""
+	desc:
+		Generates the text of the header from the document model.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		node:
+			desc:	The document-model node of the doc object.
+			type:	DocNode
+		converter:
+			desc:	The converter for the Markdown in docstrings.
+			type:	MarkdownConverter
+
+	returns:
+		type:	unicode
+	"""
+
+	if overridden(df, u'header'):
+		return converter.inline(df.hook(u'header', node))
+	name = u'<strong>%s</strong>' % escapeHtml(plainText(node.name))
+	if node.kind == u'module':
+		return u'<em>module</em> %s' % escapeHtml(plainText(node.name))
+	if node.kind == u'class':
+		return u'%s %s' % (u'class' if node.descriptor is None else \
+			escapeHtml(node.descriptor), name)
+	if node.kind == u'property':
+		return u'property %s' % name
+	if node.kind == u'function':
+		return u'function %s(%s)' % (name, escapeHtml(df.signature(node)))
+	return converter.inline(df.hook(u'header', node))
+
+def sectionsHtml(df, node, converter):
+
+	"""
+	desc:
+		Generates the documentation sections, such as 'arguments' and
+		'example', from the document model. Only the descriptions, which are
+		Markdown, are converted.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		node:
+			desc:	The document-model node of the doc object.
+			type:	DocNode
+		converter:
+			desc:	The converter for the Markdown in docstrings.
+			type:	MarkdownConverter
+
+	returns:
+		type:	unicode
+	"""
+
+	if overridden(df, u'sections'):
+		return converter.convert(df.traced(u'sections', df.hook, u'sections',
+			node))
+	html = []
+	if node.example is not None:
+		html.append(sectionTitle(u'Example') + converter.codeBlock(
+			node.example.strip().split(u'\n'), u'python'))
+	if node.source is not None:
+		html.append(sectionTitle(u'Source(s)') + listHtml(
+			u'<a href="%s">%s</a>' % (escapeHtml(src, quote=True),
+			escapeHtml(src)) for src in node.source))
+	if node.kind != u'function':
+		return u''.join(html)
+	if node.arguments is not None:
+		html.append(sectionTitle(u'Arguments') + entriesHtml(node.arguments,
+			converter))
+	if node.keywords is not None:
+		html.append(sectionTitle(u'Keywords') + entriesHtml(node.keywords,
+			converter))
+	if node.argumentListEntries is not None:
+		html.append(sectionTitle(u'Argument list') + listHtml(
+			u'<code>*%s</code>: %s' % (escapeHtml(name),
+			converter.inline(desc)) for name, desc in \
+			node.argumentListEntries))
+	if node.keywordDictEntries is not None:
+		html.append(sectionTitle(u'Keyword dict') + listHtml(
+			u'<code>**%s</code>: %s' % (escapeHtml(name),
+			converter.inline(desc)) for name, desc in \
+			node.keywordDictEntries))
+	if node.returns is not None:
+		html.append(sectionTitle(u'Returns') + returnsHtml(node.returns,
+			converter))
+	if node.yields is not None:
+		html.append(sectionTitle(u'Yields') + returnsHtml(node.yields,
+			converter))
+	return u''.join(html)
+
+def sectionTitle(title):
+
+	return u'<p><strong>%s:</strong></p>\n' % title
+
+def listHtml(items):
+
+	"""
+	desc:
+		Generates an unordered list.
+
+	visible:	False
+
+	arguments:
+		items:
+			desc:	The HTML of the list items.
+			type:	iterable
+
+	returns:
+		type:	unicode
+	"""
+
+	return u'<ul>\n%s</ul>\n' % u''.join(u'<li>%s</li>\n' % item \
+		for item in items)
+
+def propText(prop, val):
+
+	"""
+	desc:
+		Formats the property of an entry, such as 'type' or 'default', in the
+		same way as in the Markdown documentation.
+
+	visible:	False
+
+	arguments:
+		prop:
+			desc:	The property name.
+			type:	unicode
+		val:		The property value.
+
+	returns:
+		type:	unicode
+	"""
+
+	if prop == u'default':
+		val = repr(val)
+	elif isinstance(val, (list, tuple)):
+		val = u', '.join(u'%s' % v for v in val)
+	return escapeHtml(u'%s: %s' % (prop.capitalize(), safe_decode(
+		u'%s' % (val,))))
+
+def entriesHtml(entries, converter):
+
+	"""
+	desc:
+		Generates a list of arguments or keywords.
+
+	visible:	False
+
+	arguments:
+		entries:
+			desc:	A tuple of entries.
+			type:	tuple
+		converter:
+			desc:	The converter for the Markdown in docstrings.
+			type:	MarkdownConverter
+
+	returns:
+		type:	unicode
+	"""
+
+	items = []
+	for entry in entries:
+		item = u'<code>%s</code> -- %s' % (escapeHtml(entry.name),
+			converter.inline(entry.desc))
+		if entry.props:
+			item += u'\n' + listHtml(propText(prop, val) \
+				for prop, val in entry.props)
+		items.append(item)
+	return listHtml(items)
+
+def returnsHtml(entry, converter):
+
+	"""
+	desc:
+		Generates the description of a return value or yielded items.
+
+	visible:	False
+
+	arguments:
+		entry:
+			desc:	The return-value entry.
+			type:	Entry
+		converter:
+			desc:	The converter for the Markdown in docstrings.
+			type:	MarkdownConverter
+
+	returns:
+		type:	unicode
+	"""
+
+	html = converter.convert(entry.desc)
+	if entry.props:
+		html += listHtml(propText(prop, val) for prop, val in entry.props)
+	return html
+
+def htmlChunks(df, converter):
+
+	"""
+	desc:
+		Generates the HTML documentation of a doc object as a series of
+		fragments, depth first, in the same way as the Markdown documentation
+		is generated. The header and sections are generated from the
+		document model, and only the Markdown in docstrings is converted.
+
+	visible:	False
+
+	arguments:
+		df:
+			desc:	A doc object.
+			type:	BaseDoc
+		converter:
+			desc:	The converter for the Markdown in docstrings.
+			type:	MarkdownConverter
+
+	returns:
+		desc:	A generator of unicode fragments.
+		type:	generator
+	"""
+
+	node = df.model()
+	if not node.visible:
+		return
+	first = df.firstDocumented(node)
+	if df.onlyContents:
+		header = desc = u''
+		sections = sectionsHtml(df, node, converter)
+	else:
+		header = headerHtml(df, node, converter)
+		# The description is not necessarily a string, for example if a
+		# docstring has an invalid structure.
+		desc = converter.convert(u'%s' % (node.desc,))
+		sections = sectionsHtml(df, node, converter)
+	if first is not None:
+		# The object has been documented already, so we only link to its
+		# documentation.
+		desc = u'<p>See <a href="#%s">%s</a>.</p>\n' % (
+			escapeHtml(first.id, quote=True),
+			escapeHtml(plainText(first.name)))
+		sections = u''
+	values = {
+		u'container'	: df.container,
+		u'className'	: u'' if df.onlyContents else \
+			df.className or df.__class__.__name__,
+		u'headerId'		: u'' if df.onlyContents else \
+			escapeHtml(node.id, quote=True),
+		u'header'		: u'<h%d>%s</h%d>\n' % (df.level, header,
+			df.level) if header else u'',
+		u'desc'			: desc,
+		u'sections'		: sections,
+		}
+	yield htmlHeader % values
+	if first is None and df.miscOverridden():
+		yield converter.convert(df.traced(u'misc', df.hook, u'misc', node))
+	elif first is None:
+		for child in df.children(node):
+			for chunk in htmlChunks(child, converter):
+				yield chunk
+	yield htmlFooter % values
+
+def renderHtml(df, stream, symbols=None, title=None):
+
+	"""
+	desc:
+		Writes the documentation of an object as HTML, without first
+		generating Markdown. The HTML has the same structure of nested
+		containers, with the same ids and classes, as the Markdown
+		documentation. The Markdown in docstrings is converted fragment by
+		fragment, and the documentation is written while it is generated.
+		If no symbol index is passed, the names and ids of the documented
+		objects are collected first, so that links can be resolved.
+
+	example: |
+		import yamldoc
+
+		with open(u'doc.html', u'w') as fd:
+			yamldoc.renderHtml(yamldoc.DocFactory(yamldoc), fd,
+				title=u'yamldoc')
+
+	arguments:
+		df:
+			desc:	A doc object, as created by [DocFactory] or [staticDoc].
+			type:	BaseDoc
+		stream:
+			desc:	A file-like object that accepts unicode strings.
+
+	keywords:
+		symbols:
+			desc:	A [SymbolIndex] that is used to resolve links, for example
+					the index of a package build, or None to collect the
+					symbols of the documented objects first.
+			type:	[SymbolIndex, NoneType]
+		title:
+			desc:	A page title, in which case a complete HTML page is
+					written, or None to write only the documentation.
+			type:	[str, unicode, NoneType]
+	"""
+
+	if symbols is None:
+		symbols = SymbolIndex()
+		collectSymbols(df, symbols)
+	converter = MarkdownConverter(symbols)
+	if title is not None:
+		stream.write(pageHeader % {u'title' : escapeHtml(title)})
+	for chunk in htmlChunks(df, converter):
+		stream.write(chunk)
+	if title is not None:
+		stream.write(pageFooter)
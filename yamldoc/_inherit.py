@@ -18,12 +18,256 @@ along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from yamldoc.py3compat import *
+import weakref
+
+# Maps classes onto dicts of the docstrings of their attributes, including
+# inherited attributes, so that each class is indexed only once. The
+# docstring of the class itself is indexed as __doc__.
+_docIndex = weakref.WeakKeyDictionary()
+# Classes of which the docstrings are inherited only when they are documented
+_pending = weakref.WeakSet()
+# Classes of which the docstrings are never inherited, because they describe
+# the class itself rather than its subclasses. InheritDocs is added below.
+_unindexed = set([object])
+
+def unwrap(attrib):
+
+	"""
+	desc:
+		Gets the function that a static or class method wraps, because these
+		don't have a writable docstring in all Python versions.
+
+	visible:	False
+
+	arguments:
+		attrib:		A class attribute.
+
+	returns:
+		The function, or the attribute itself.
+	"""
+
+	if isinstance(attrib, (staticmethod, classmethod)):
+		return attrib.__func__
+	return attrib
+
+def docIndex(cls):
+
+	"""
+	desc:
+		Gets the docstrings of the attributes of a class, including inherited
+		attributes. For each attribute, this is the first docstring that is
+		found in the method resolution order. The index is built the first
+		time that it is requested, so changes to a class after that are not
+		reflected in the index. The docstrings of `object` and [InheritDocs]
+		are not indexed.
+
+	visible:	False
+
+	arguments:
+		cls:	A class.
+
+	returns:
+		desc:	A dict with attribute names as keys and docstrings as values.
+		type:	dict
+	"""
+
+	index = _docIndex.get(cls)
+	if index is not None:
+		return index
+	if cls in _unindexed:
+		return {}
+	resolvePending(cls)
+	bases = cls.__bases__
+	if len(bases) == 1:
+		# With a single base class, the MRO is the class followed by the MRO
+		# of the base class, so we can build on the index of the base class.
+		index = dict(docIndex(bases[0]))
+		mro = [cls]
+	else:
+		index = {}
+		mro = reversed(cls.__mro__)
+	for mroCls in mro:
+		if mroCls in _unindexed:
+			continue
+		for attr, attrib in vars(mroCls).items():
+			if attr == u'__doc__':
+				doc = attrib
+			else:
+				doc = getattr(unwrap(attrib), u'__doc__', None)
+			# Classes earlier in the MRO overwrite the docstrings of later
+			# classes, but only if they have a docstring.
+			if doc:
+				index[attr] = doc
+	_docIndex[cls] = index
+	return index
+
+def inheritedDoc(indexes, attr):
+
+	"""
+	desc:
+		Finds the docstring of an attribute in base classes.
+
+	visible:	False
+
+	arguments:
+		indexes:
+			desc:	The docstring indexes of the base classes (see
+					`docIndex()`), which are searched in order.
+			type:	list
+		attr:
+			desc:	The name of the attribute, or `__doc__` for the docstring
+					of the class itself.
+			type:	str
+
+	returns:
+		desc:	The docstring, or None if no docstring was found.
+		type:	[str, NoneType]
+	"""
+
+	for index in indexes:
+		doc = index.get(attr)
+		if doc:
+			return doc
+	return None
+
+def inheritAttribDocs(clsdict, indexes):
+
+	"""
+	desc:
+		Gives attributes without a docstring the docstring of the
+		corresponding attribute of the base classes.
+
+	visible:	False
+
+	arguments:
+		clsdict:
+			desc:	The namespace of a class.
+			type:	dict
+		indexes:
+			desc:	The docstring indexes of the base classes.
+			type:	list
+	"""
+
+	# This is called for every class that is created, so the loop is kept
+	# tight.
+	for attr, attrib in clsdict.items():
+		if getattr(attrib, u'__doc__', None) or attr == u'__doc__':
+			continue
+		if isinstance(attrib, (staticmethod, classmethod)):
+			attrib = attrib.__func__
+			if attrib.__doc__:
+				continue
+		for index in indexes:
+			doc = index.get(attr)
+			if doc:
+				break
+		else:
+			continue
+		try:
+			attrib.__doc__ = doc
+		except (AttributeError, TypeError):
+			# Not all objects have a writable docstring
+			pass
+
+def resolve(cls):
+
+	"""
+	desc:
+		Inherits docstrings for a class that has already been created.
+
+	visible:	False
+
+	arguments:
+		cls:	A class.
+	"""
+
+	# Indexing the base classes also resolves them if necessary, so that
+	# docstrings that they inherit are passed on.
+	indexes = [docIndex(base) for base in cls.__bases__]
+	inheritAttribDocs(vars(cls), indexes)
+	if not vars(cls).get(u'__doc__'):
+		doc = inheritedDoc(indexes, u'__doc__')
+		if doc is not None:
+			try:
+				cls.__doc__ = doc
+			except (AttributeError, TypeError):
+				# The docstrings of classes are not writable in Python 2
+				pass
+	# The class may have been indexed with the old docstrings
+	_docIndex.pop(cls, None)
+
+def resolvePending(cls):
+
+	"""
+	desc:
+		Inherits docstrings for a class that was marked to inherit docstrings
+		lazily, and for its base classes, if this hasn't happened yet.
+
+	visible:	False
+
+	arguments:
+		cls:	A class.
+	"""
+
+	if cls not in _pending:
+		return
+	_pending.discard(cls)
+	resolve(cls)
+
+def inheritDocs(cls=None, lazy=False):
+
+	"""
+	desc: |
+		A class decorator that inherits docstrings from base classes. This
+		does the same as the [yamldoc.inherit] metaclass, but can be combined
+		with other metaclasses and uses the same syntax in Python 2 and 3.
+		The docstrings of base classes are indexed only once per class, so
+		that decorating large class hierarchies is cheap.
+
+		In lazy mode, docstrings are only inherited when the class is
+		documented with yamldoc, or when a subclass inherits docstrings, so
+		that importing the class is as cheap as possible. In Python 2, the
+		docstring of the class itself cannot be inherited with the decorator,
+		only the docstrings of its attributes.
+
+	example: |
+		import yamldoc
+
+		@yamldoc.inheritDocs
+		class A(B):
+			pass
+
+		@yamldoc.inheritDocs(lazy=True)
+		class C(B):
+			pass
+
+	keywords:
+		cls:
+			desc:	The class. If no class is passed, a decorator is
+					returned, so that you can specify keywords.
+			type:	[type, NoneType]
+		lazy:
+			desc:	Indicates whether docstrings should be inherited lazily.
+			type:	bool
+
+	returns:
+		The class.
+	"""
+
+	if cls is None:
+		return lambda cls: inheritDocs(cls, lazy=lazy)
+	if lazy:
+		_pending.add(cls)
+	else:
+		resolve(cls)
+	return cls
 
 class inherit(type):
 
 	"""
 	desc: |
-		A metaclass that inherits docstrings from parent classes.
+		A metaclass that inherits docstrings from parent classes. See also
+		[inheritDocs] and [InheritDocs].
 
 	source:
 		- http://groups.google.com/group/comp.lang.python/msg/26f7b4fcb4d66c95
@@ -46,18 +290,56 @@ class inherit(type):
 		visible:	False
 		"""
 
+		indexes = [docIndex(base) for base in bases]
 		if not('__doc__' in clsdict and clsdict['__doc__']):
-			for mro_cls in (mro_cls for base in bases for mro_cls in base.mro()):
-				doc=mro_cls.__doc__
-				if doc:
-					clsdict['__doc__']=doc
-					break
-		for attr, attribute in clsdict.items():
-			if not attribute.__doc__:
-				for mro_cls in (mro_cls for base in bases for mro_cls in base.mro()
-					if hasattr(mro_cls, attr)):
-						doc=getattr(getattr(mro_cls,attr),'__doc__')
-						if doc:
-							attribute.__doc__=doc
-							break
+			doc = inheritedDoc(indexes, u'__doc__')
+			if doc is not None:
+				clsdict['__doc__'] = doc
+		inheritAttribDocs(clsdict, indexes)
 		return type.__new__(meta, name, bases, clsdict)
+
+class InheritDocs(object):
+
+	"""
+	desc: |
+		A base class that makes subclasses inherit docstrings from their base
+		classes, when they are created (Python 3.6 and later). Set `lazyDocs`
+		to True in a class to inherit docstrings lazily for that class and its
+		subclasses, as with [inheritDocs].
+
+	example: |
+		import yamldoc
+
+		class Base(yamldoc.InheritDocs):
+
+			lazyDocs = True
+
+			def method(self):
+
+				\"\"\"
+				desc:
+					Inherited by Derived.method().
+				\"\"\"
+
+		class Derived(Base):
+
+			def method(self):
+
+				pass
+	"""
+
+	lazyDocs = False
+
+	def __init_subclass__(cls, **kwargs):
+
+		"""
+		desc:
+			Inherits docstrings for a new subclass.
+
+		visible:	False
+		"""
+
+		super(InheritDocs, cls).__init_subclass__(**kwargs)
+		inheritDocs(cls, lazy=cls.lazyDocs)
+
+_unindexed.add(InheritDocs)
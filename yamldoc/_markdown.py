@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import re
+
+# Markdown characters that are escaped with a backslash. All characters are
+# escaped in a single pass, so backslashes that are added by escaping are not
+# escaped again.
+escapeChars = u'\\_*[]{}()#+.!'
+escapeTable = dict((ord(ch), u'\\' + ch) for ch in escapeChars)
+# Matches runs of three or more newlines.
+tripleNewlines = re.compile(u'\n{3,}')
+
+def escape(md):
+
+	"""
+	desc:
+		Escapes Markdown characters with a backslash.
+
+	arguments:
+		md:
+			desc:	A Markdown string.
+			type:	unicode
+
+	returns:
+		desc:	The escaped string.
+		type:	unicode
+	"""
+
+	return md.translate(escapeTable)
+
+def emit(chunks):
+
+	"""
+	desc:
+		Passes a stream of Markdown chunks through while collapsing runs of
+		more than two newlines (i.e. more than one blank line) into a single
+		blank line, also when a run spans multiple chunks. This is the same
+		normalization that used to be applied to the joined document, but
+		applied to the chunks as they stream past. The templates and the
+		docstrings themselves still produce such runs, for example around
+		empty sections or in prose with several blank lines, and they are
+		removed here.
+
+	visible:	False
+
+	arguments:
+		chunks:	An iterable of unicode chunks.
+
+	returns:
+		desc:	A generator of unicode chunks.
+		type:	generator
+	"""
+
+	# Trailing newlines are held back until we know how long the run is.
+	pending = 0
+	for chunk in chunks:
+		body = chunk.rstrip(u'\n')
+		if not body:
+			pending += len(chunk)
+			continue
+		trailing = len(chunk) - len(body)
+		leading = len(body) - len(body.lstrip(u'\n'))
+		if leading:
+			body = body[leading:]
+		if u'\n\n\n' in body:
+			body = tripleNewlines.sub(u'\n\n', body)
+		pending += leading
+		if pending:
+			yield u'\n' * min(pending, 2) + body
+		else:
+			yield body
+		pending = trailing
+	if pending:
+		yield u'\n' * min(pending, 2)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+from collections import OrderedDict
+
+def isPlain(value):
+
+	"""
+	desc:
+		Checks whether a value is plain data (see `plain()`).
+
+	visible:	False
+
+	arguments:
+		value:	The value to check.
+
+	returns:
+		type:	bool
+	"""
+
+	if value is None or isinstance(value, (basestring, bool, int, float)):
+		return True
+	if isinstance(value, (list, tuple)):
+		return all(isPlain(item) for item in value)
+	if isinstance(value, dict):
+		return all(isinstance(key, basestring) and isPlain(item) \
+			for key, item in value.items())
+	return False
+
+def plain(value):
+
+	"""
+	desc:
+		Converts a value to plain data, which consists only of dicts, lists,
+		strings, numbers, booleans, and None, so that it can be serialized.
+		Values that have no plain equivalent, such as arbitrary default
+		values, are converted to their `repr()`.
+
+	visible:	False
+
+	arguments:
+		value:	The value to convert.
+
+	returns:
+		The plain value.
+	"""
+
+	if value is None or isinstance(value, (basestring, bool, int, float)):
+		return value
+	if isinstance(value, Node):
+		return value.asDict()
+	if isinstance(value, (list, tuple)):
+		return [plain(item) for item in value]
+	if isinstance(value, dict):
+		return OrderedDict((safe_decode(str(key)), plain(item)) \
+			for key, item in value.items())
+	return safe_decode(repr(value))
+
+class Node(object):
+
+	"""
+	desc:
+		The base class for the nodes of the document model. The document model
+		is an immutable representation of the parsed documentation of an
+		object, which is built once and then consumed by the renderers. Nodes
+		use `__slots__`, so that they are more compact than the dicts that they
+		are built from.
+
+	visible:	False
+	"""
+
+	__slots__ = ()
+	# All slots, including those of parent classes, in order.
+	fields = ()
+
+	def __init__(self, **kwargs):
+
+		for field in self.fields:
+			object.__setattr__(self, field, kwargs.pop(field, None))
+		if kwargs:
+			raise TypeError(u'%s has no field(s): %s' % (
+				self.__class__.__name__, u', '.join(kwargs)))
+
+	def __setattr__(self, name, value):
+
+		raise AttributeError(u'%s is immutable' % self.__class__.__name__)
+
+	def __delattr__(self, name):
+
+		raise AttributeError(u'%s is immutable' % self.__class__.__name__)
+
+	def __eq__(self, other):
+
+		return self.__class__ is other.__class__ and all(
+			getattr(self, field) == getattr(other, field) \
+			for field in self.fields)
+
+	def __ne__(self, other):
+
+		return not self == other
+
+	__hash__ = None
+
+	def __repr__(self):
+
+		return u'%s(%s)' % (self.__class__.__name__, u', '.join(
+			u'%s=%r' % (field, getattr(self, field)) for field in self.fields))
+
+	def asDict(self):
+
+		"""
+		desc:
+			Gets a plain representation of the node, which can be serialized,
+			for example as JSON.
+
+		returns:
+			desc:	An OrderedDict with field names as keys.
+			type:	OrderedDict
+		"""
+
+		return OrderedDict((field, plain(getattr(self, field))) \
+			for field in self.fields)
+
+class Entry(Node):
+
+	"""
+	desc:
+		An argument, keyword, or return-value entry of a function.
+
+	visible:	False
+	"""
+
+	__slots__ = ('name', 'desc', 'props')
+	fields = __slots__
+
+	@classmethod
+	def fromDict(cls, name, _dict):
+
+		"""
+		desc:
+			Creates an entry from a value dictionary, such as the ones
+			generated by [FunctionDoc.valDict].
+
+		arguments:
+			name:
+				desc:	The name of the argument or keyword, or None for
+						return values.
+				type:	[str, unicode, NoneType]
+			_dict:
+				desc:	A value dictionary.
+				type:	dict
+
+		returns:
+			type:	Entry
+		"""
+
+		props = []
+		for prop, val in _dict.items():
+			if prop == u'desc':
+				continue
+			if prop in (u'type', u'valid') and isinstance(val, list):
+				val = tuple(val)
+			props.append((prop, val))
+		return cls(name=name, desc=_dict[u'desc'], props=tuple(props))
+
+	def get(self, prop, default=None):
+
+		"""
+		desc:
+			Gets a property, such as 'type', 'valid', or 'default'.
+
+		arguments:
+			prop:
+				desc:	The property name.
+				type:	[str, unicode]
+
+		keywords:
+			default:	The value to return if the property doesn't exist.
+
+		returns:
+			desc:	The property value.
+		"""
+
+		for key, val in self.props:
+			if key == prop:
+				return val
+		return default
+
+	def asDict(self):
+
+		return OrderedDict([
+			(u'name',	self.name),
+			(u'desc',	self.desc),
+			(u'props',	OrderedDict((prop, plain(val)) \
+				for prop, val in self.props)),
+			])
+
+class DocNode(Node):
+
+	"""
+	desc:
+		The parsed documentation of an object. The kind is 'function',
+		'class', 'module', 'property', or None.
+
+	visible:	False
+	"""
+
+	__slots__ = ('kind', 'name', 'id', 'desc', 'visible', 'example',
+		'source')
+	fields = __slots__
+
+	def __getitem__(self, key):
+
+		# The header(), sections(), and misc() methods of doc objects used
+		# to receive the docstring dict. Overrides that still call their
+		# argument _dict receive a DocDict (see BaseDoc.hook()). Others that
+		# index their argument as a dict get an explanation instead of a bare
+		# TypeError.
+		raise TypeError(
+			u'header(), sections(), and misc() receive a %s instead of a '
+			u'docstring dict. Use its attributes, such as node.desc, instead '
+			u'of node[%r].' % (self.__class__.__name__, key))
+
+class DocDict(OrderedDict):
+
+	"""
+	desc:
+		The docstring dict that is passed to hooks that are overridden in the
+		old way (see [BaseDoc.hook]). Attributes are looked up on the
+		document-model node, so that the dict can be passed on to the hooks
+		of the base class.
+
+	visible:	False
+	"""
+
+	def __init__(self, node, _dict):
+
+		super(DocDict, self).__init__(_dict)
+		self.node = node
+
+	def __getattr__(self, name):
+
+		if name == u'node':
+			raise AttributeError(name)
+		return getattr(self.node, name)
+
+	def copy(self):
+
+		return DocDict(self.node, self)
+
+class FunctionNode(DocNode):
+
+	"""
+	desc: |
+		The parsed documentation of a function or method. The signature is
+		described by:
+
+		- `args`: a tuple of argument names.
+		- `defaults`: a tuple of (keyword, default) tuples.
+		- `argumentList`: the name of the argument list, or None.
+		- `keywordDict`: the name of the keyword dictionary, or None.
+		- `kwonlyArgs`: a tuple of keyword-only argument names.
+		- `kwonlyDefaults`: a tuple of (keyword, default) tuples for the
+		  keyword-only arguments that have a default.
+
+		The documentation sections are described by `arguments` and
+		`keywords`, which are tuples of [Entry] objects, `argumentListEntries`
+		and `keywordDictEntries`, which are tuples of (name, desc) tuples, and
+		`returns` and `yields`, which are [Entry] objects. Sections that are
+		not documented are None.
+
+	visible:	False
+	"""
+
+	__slots__ = ('args', 'defaults', 'argumentList', 'keywordDict',
+		'kwonlyArgs', 'kwonlyDefaults', 'arguments', 'keywords', 'argumentListEntries', 'keywordDictEntries',
+		'returns', 'yields')
+	fields = DocNode.fields + __slots__
+
+	def asDict(self):
+
+		# Default values can be of any type, so they are represented by their
+		# repr(), and also by their value if that is plain data.
+		d = DocNode.asDict(self)
+		for field in (u'defaults', u'kwonlyDefaults'):
+			d[field] = [OrderedDict([
+				(u'name',	kw),
+				(u'value',	plain(default) if isPlain(default) else None),
+				(u'repr',	safe_decode(repr(default))),
+				]) for kw, default in getattr(self, field)]
+		for field in (u'argumentListEntries', u'keywordDictEntries'):
+			if d[field] is not None:
+				d[field] = [OrderedDict([(u'name', name), (u'desc', desc)]) \
+					for name, desc in getattr(self, field)]
+		return d
+
+class ClassNode(DocNode):
+
+	"""
+	desc:
+		The parsed documentation of a class. The descriptor is a custom
+		descriptor that replaces 'class' in the header, or None.
+
+	visible:	False
+	"""
+
+	__slots__ = ('descriptor',)
+	fields = DocNode.fields + __slots__
+
+class ModuleNode(DocNode):
+
+	"""
+	desc:
+		The parsed documentation of a module.
+
+	visible:	False
+	"""
+
+	__slots__ = ()
+	fields = DocNode.fields
+
+class PropertyNode(DocNode):
+
+	"""
+	desc:
+		The parsed documentation of a property.
+
+	visible:	False
+	"""
+
+	__slots__ = ()
+	fields = DocNode.fields
@@ -20,7 +20,7 @@ along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
 
 from yamldoc.py3compat import *
 from yamldoc._basedoc import BaseDoc
-from yamldoc._docfactory import DocFactory
+from yamldoc._model import ModuleNode
 
 class ModuleDoc(BaseDoc):
 
@@ -31,26 +31,30 @@ class ModuleDoc(BaseDoc):
 		False
 	"""
 
-	def header(self, _dict):
+	kind = u'module'
+	nodeClass = ModuleNode
 
-		return u'*module* %s' % self.name()
+	def header(self, node):
 
-	def misc(self, _dict):
+		return u'*module* %s' % node.name
+
+	def children(self, node):
 
-		md = u''
 		if self.onlyContents:
 			prefix = u''
 		else:
-			prefix = u'%s.' % self.name()
-		for attribName, attrib in self.objAttribs():
+			prefix = u'%s.' % node.name
+		types = [u'class', u'function']
+		if self.submodules:
+			types.append(u'module')
+		for attribName, attrib in self.traced(u'objAttribs',
+			self.objAttribs, types=types):
 			if attribName in self.exclude:
 				continue
-			df = DocFactory(attrib, types=[u'class', u'function', u'module'],
-				namePrefix=prefix, level=self.level+1, container=self.container,
-				exclude=self.exclude)
+			df = self.docFactory(attrib, types=types, namePrefix=prefix,
+				level=self.level+1, **self.childOptions())
 			if df is not None:
-				md += str(df)
-		return md
+				yield df
 
 	def name(self):
 
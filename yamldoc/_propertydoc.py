@@ -20,6 +20,7 @@ along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
 
 from yamldoc.py3compat import *
 from yamldoc._basedoc import BaseDoc
+from yamldoc._model import PropertyNode
 
 class PropertyDoc(BaseDoc):
 
@@ -30,13 +31,22 @@ class PropertyDoc(BaseDoc):
 		False
 	"""
 
-	def header(self, _dict):
+	kind = u'property'
+	nodeClass = PropertyNode
+	# The name from the docstring, which is kept so that the docstring doesn't
+	# need to be parsed again after the document model has been built.
+	_docName = None
 
-		return u'property __%s__' % self.name()
+	def header(self, node):
+
+		return u'property __%s__' % node.name
 
 	def _name(self):
 
-		_dict = self._dict()
+		if self._docName is not None:
+			return self._docName
+		_dict = self.docDict()
 		if u'name' not in _dict:
 			raise Exception(u'Property docstrings require a name attribute')
-		return _dict[u'name']
+		self._docName = _dict[u'name']
+		return self._docName
@@ -0,0 +1,1099 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+from yamldoc.py3compat import ArgSpec
+import os
+import ast
+import io
+import operator
+from collections import OrderedDict
+from yamldoc._functiondoc import FunctionDoc
+from yamldoc._classdoc import ClassDoc
+from yamldoc._moduledoc import ModuleDoc
+from yamldoc._propertydoc import PropertyDoc
+from yamldoc._exceptions import YAMLDocError
+from yamldoc._build import findSpec, functionDefs
+
+# Statements that contain other statements that are executed (or not) in the
+# same namespace.
+compoundStatements = tuple(getattr(ast, name) for name in (u'If', u'Try',
+	u'TryStar', u'TryExcept', u'TryFinally', u'With') if hasattr(ast, name))
+
+# Arithmetic that is evaluated in constant expressions, such as `64*1024**2`
+arithmetic = {
+	ast.Add			: operator.add,
+	ast.Sub			: operator.sub,
+	ast.Mult		: operator.mul,
+	ast.Div			: operator.truediv,
+	ast.FloorDiv	: operator.floordiv,
+	ast.Mod			: operator.mod,
+	ast.Pow			: operator.pow,
+	}
+
+def evaluateConstant(node):
+
+	"""
+	desc:
+		Evaluates a literal, or simple arithmetic on numeric literals, without
+		executing code.
+
+	visible:	False
+
+	arguments:
+		node:	An expression node.
+
+	returns:
+		The value of the expression.
+	"""
+
+	if isinstance(node, ast.BinOp) and type(node.op) in arithmetic:
+		left = evaluateConstant(node.left)
+		right = evaluateConstant(node.right)
+		if not all(isinstance(value, (int, float)) and \
+			not isinstance(value, bool) for value in (left, right)):
+			raise ValueError(u'Not a numeric expression')
+		# Refuse to compute absurdly large powers
+		if isinstance(node.op, ast.Pow) and abs(right) > 64:
+			raise ValueError(u'Exponent too large')
+		return arithmetic[type(node.op)](left, right)
+	return ast.literal_eval(node)
+
+def statements(body):
+
+	"""
+	desc:
+		Walks through a list of statements, including those that are nested in
+		if, try, and with statements, in order of execution.
+
+	visible:	False
+
+	arguments:
+		body:
+			desc:	A list of statement nodes.
+			type:	list
+
+	returns:
+		desc:	A generator of statement nodes.
+		type:	generator
+	"""
+
+	for stmt in body:
+		if not isinstance(stmt, compoundStatements):
+			yield stmt
+			continue
+		for field in (u'body', u'orelse', u'finalbody'):
+			for child in statements(getattr(stmt, field, [])):
+				yield child
+		for handler in getattr(stmt, u'handlers', []):
+			for child in statements(handler.body):
+				yield child
+
+# Parsed source files by (path, modification time, size), so that modules that
+# are imported by many other modules are parsed only once per process.
+_parsed = {}
+maxParsed = 1024
+
+def parseSource(path):
+
+	"""
+	desc:
+		Reads and parses a source file, taking its encoding declaration into
+		account.
+
+	visible:	False
+
+	arguments:
+		path:
+			desc:	The source file.
+			type:	[str, unicode]
+
+	returns:
+		desc:	A (source, tree) tuple.
+		type:	tuple
+	"""
+
+	stat = os.stat(path)
+	key = path, stat.st_mtime, stat.st_size
+	if key in _parsed:
+		return _parsed[key]
+	if py3:
+		import tokenize
+		with tokenize.open(path) as fd:
+			source = fd.read()
+	else:
+		with io.open(path, u'rb') as fd:
+			source = fd.read()
+	if len(_parsed) >= maxParsed:
+		_parsed.clear()
+	_parsed[key] = source, ast.parse(source, path)
+	return _parsed[key]
+
+class SourceExpr(object):
+
+	"""
+	desc:
+		Stands in for a default value that is not a literal, and that is
+		therefore represented by its source code.
+
+	visible:	False
+	"""
+
+	def __init__(self, text):
+
+		self.text = text
+
+	def __str__(self):
+
+		return self.text
+
+	__unicode__ = __repr__ = __str__
+
+	def __eq__(self, other):
+
+		return isinstance(other, SourceExpr) and other.text == self.text
+
+	def __ne__(self, other):
+
+		return not self == other
+
+	def __hash__(self):
+
+		return hash(self.text)
+
+class StaticObject(object):
+
+	"""
+	desc:
+		The base class for objects that are found by parsing source code. They
+		stand in for the live objects that [DocFactory] documents, and have a
+		`__name__` just like them.
+
+	visible:	False
+	"""
+
+	kind = None
+
+	def __init__(self, name, doc, module, owner=None):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			name:
+				desc:	The name of the object.
+				type:	[str, unicode]
+			doc:
+				desc:	The docstring, or None.
+				type:	[str, unicode, NoneType]
+			module:
+				desc:	The module in which the object is defined.
+				type:	StaticModule
+
+		keywords:
+			owner:
+				desc:	The class in which the object is defined, if any.
+				type:	[StaticClass, NoneType]
+		"""
+
+		self.__name__ = name
+		self.__module__ = module.__name__
+		self.__qualname__ = name if owner is None else u'%s.%s' % (
+			owner.__qualname__, name)
+		self.doc = doc
+		self.module = module
+		self.owner = owner
+
+	def docString(self):
+
+		"""
+		desc:
+			Gets the docstring. Like `inspect.getdoc()` on Python 3, methods
+			and properties without a docstring inherit the docstring of the
+			attribute that they override.
+
+		returns:
+			desc:	The docstring, or None.
+			type:	[str, unicode, NoneType]
+		"""
+
+		if self.doc is not None or not py3 or self.owner is None:
+			return self.doc
+		for cls in self.owner.mro()[1:]:
+			attrib = cls.namespace().get(self.__name__)
+			if isinstance(attrib, StaticObject) and attrib.doc is not None:
+				return attrib.doc
+		return None
+
+	def attribs(self, inherited=True):
+
+		"""
+		desc:
+			Gets the attributes of the object.
+
+		keywords:
+			inherited:
+				desc:	Indicates whether inherited attributes should be
+						included. Only applicable to classes.
+				type:	bool
+
+		returns:
+			desc:	A list of (name, object) tuples, sorted by name.
+			type:	list
+		"""
+
+		return []
+
+	def lookup(self, name):
+
+		"""
+		desc:
+			Gets an attribute of the object.
+
+		arguments:
+			name:
+				desc:	The attribute name.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The attribute, or None if it is not known.
+			type:	[StaticObject, NoneType]
+		"""
+
+		return None
+
+	def __repr__(self):
+
+		return u'<static %s %s>' % (self.kind, self.__name__)
+
+class StaticFunction(StaticObject):
+
+	"""
+	desc:
+		A function or method that is defined in source code.
+
+	visible:	False
+	"""
+
+	kind = u'function'
+
+	def __init__(self, node, module, owner=None):
+
+		StaticObject.__init__(self, node.name, ast.get_docstring(node),
+			module, owner=owner)
+		self.node = node
+
+	@property
+	def __argspec__(self):
+
+		"""
+		desc:
+			The argument specification, which [FunctionDoc] uses instead of
+			introspection. Default values that are literals are evaluated;
+			other default values are represented by their source code.
+		"""
+
+		arguments = self.node.args
+		args = [self.argName(arg) for arg in \
+			getattr(arguments, u'posonlyargs', []) + arguments.args]
+		defaults = tuple(self.module.evaluate(default) \
+			for default in arguments.defaults)
+		return ArgSpec(args, self.argName(arguments.vararg),
+			self.argName(arguments.kwarg), defaults if defaults else None)
+
+	@property
+	def __kwonlyargs__(self):
+
+		"""
+		desc:
+			The keyword-only arguments, as a list of names and a dict of
+			default values, which [FunctionDoc] uses instead of
+			introspection.
+		"""
+
+		arguments = self.node.args
+		kwonlyArgs = [self.argName(arg) for arg in \
+			getattr(arguments, u'kwonlyargs', [])]
+		kwonlyDefaults = {}
+		for kw, default in zip(kwonlyArgs,
+			getattr(arguments, u'kw_defaults', [])):
+			if default is not None:
+				kwonlyDefaults[kw] = self.module.evaluate(default)
+		return kwonlyArgs, kwonlyDefaults
+
+	def argName(self, arg):
+
+		"""
+		desc:
+			Gets the name of an argument node.
+
+		visible:	False
+
+		arguments:
+			arg:	An argument node, a name (on Python 2), or None.
+
+		returns:
+			desc:	The argument name, or None.
+			type:	[str, unicode, NoneType]
+		"""
+
+		if arg is None or isinstance(arg, basestring):
+			return arg
+		if isinstance(arg, ast.Name):
+			return arg.id
+		return arg.arg
+
+class StaticProperty(StaticObject):
+
+	"""
+	desc:
+		A property that is defined in source code.
+
+	visible:	False
+	"""
+
+	kind = u'property'
+
+class StaticClass(StaticObject):
+
+	"""
+	desc:
+		A class that is defined in source code.
+
+	visible:	False
+	"""
+
+	kind = u'class'
+
+	def __init__(self, node, module, owner=None):
+
+		StaticObject.__init__(self, node.name, ast.get_docstring(node),
+			module, owner=owner)
+		self.node = node
+		self._namespace = None
+		self._mro = None
+
+	def docString(self):
+
+		# Like inspect.getdoc() on Python 3, classes without a docstring
+		# inherit the docstring of their base classes.
+		if self.doc is not None or not py3:
+			return self.doc
+		for cls in self.mro()[1:]:
+			if cls.doc is not None:
+				return cls.doc
+		return None
+
+	def mangle(self, name):
+
+		"""
+		desc:
+			Mangles private names, as Python does for class attributes.
+
+		visible:	False
+
+		arguments:
+			name:
+				desc:	An attribute name.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The mangled name.
+			type:	[str, unicode]
+		"""
+
+		if name.startswith(u'__') and not name.endswith(u'__') and \
+			self.__name__.lstrip(u'_'):
+			return u'_%s%s' % (self.__name__.lstrip(u'_'), name)
+		return name
+
+	def namespace(self):
+
+		"""
+		desc:
+			Gets the attributes that are defined in the class body, not
+			including inherited attributes.
+
+		visible:	False
+
+		returns:
+			desc:	An OrderedDict with attribute names as keys.
+			type:	OrderedDict
+		"""
+
+		if self._namespace is not None:
+			return self._namespace
+		ns = self._namespace = OrderedDict()
+		for stmt in statements(self.node.body):
+			if isinstance(stmt, functionDefs):
+				name = self.mangle(stmt.name)
+				decorators = [self.module.dottedName(decorator) \
+					for decorator in stmt.decorator_list]
+				if u'property' in decorators:
+					ns[name] = StaticProperty(name, ast.get_docstring(stmt),
+						self.module, owner=self)
+				elif any(decorator is not None and decorator.endswith(
+					(u'.setter', u'.getter', u'.deleter')) \
+					for decorator in decorators):
+					# The property has already been defined
+					continue
+				else:
+					ns[name] = StaticFunction(stmt, self.module, owner=self)
+			elif isinstance(stmt, ast.ClassDef):
+				ns[self.mangle(stmt.name)] = StaticClass(stmt, self.module,
+					owner=self)
+			elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 \
+				and isinstance(stmt.targets[0], ast.Name):
+				name = self.mangle(stmt.targets[0].id)
+				value = stmt.value
+				if isinstance(value, ast.Name):
+					# An alias of another attribute
+					obj = ns.get(value.id) or self.module.lookup(value.id)
+					if obj is not None:
+						ns[name] = obj
+				elif isinstance(value, ast.Call) and \
+					self.module.dottedName(value.func) == u'property':
+					ns[name] = StaticProperty(name,
+						self.propertyDoc(value, ns), self.module, owner=self)
+		return ns
+
+	def propertyDoc(self, call, ns):
+
+		"""
+		desc:
+			Gets the docstring of a property that is created by calling
+			`property()`, which is either passed as the `doc` keyword or
+			taken from the getter.
+
+		visible:	False
+
+		arguments:
+			call:	A call node.
+			ns:
+				desc:	The class namespace so far.
+				type:	dict
+
+		returns:
+			desc:	The docstring, or None.
+			type:	[str, unicode, NoneType]
+		"""
+
+		for keyword in call.keywords:
+			if keyword.arg == u'doc':
+				doc = self.module.evaluate(keyword.value)
+				return doc if isinstance(doc, basestring) else None
+		getter = call.args[0] if call.args else None
+		for keyword in call.keywords:
+			if keyword.arg == u'fget':
+				getter = keyword.value
+		if isinstance(getter, ast.Name):
+			obj = ns.get(getter.id)
+			if isinstance(obj, StaticFunction):
+				return obj.doc
+		return None
+
+	def bases(self):
+
+		"""
+		desc:
+			Gets the base classes that can be found in the source code of the
+			package. Other base classes are ignored.
+
+		visible:	False
+
+		returns:
+			desc:	A list of StaticClass objects.
+			type:	list
+		"""
+
+		bases = []
+		for base in self.node.bases:
+			obj = self.module.resolve(base)
+			if isinstance(obj, StaticClass):
+				bases.append(obj)
+		return bases
+
+	def mro(self):
+
+		"""
+		desc:
+			Gets the method-resolution order, which is the class itself
+			followed by its base classes, depth first.
+
+		visible:	False
+
+		returns:
+			desc:	A list of StaticClass objects.
+			type:	list
+		"""
+
+		if self._mro is not None:
+			return self._mro
+		# Guard against (invalid) circular inheritance
+		self._mro = [self]
+		mro = [self]
+		for base in self.bases():
+			for cls in base.mro():
+				if cls not in mro:
+					mro.append(cls)
+		self._mro = mro
+		return mro
+
+	def lookup(self, name):
+
+		for cls in self.mro():
+			obj = cls.namespace().get(name)
+			if obj is not None:
+				return obj
+		return None
+
+	def attribs(self, inherited=True):
+
+		if not inherited:
+			return sorted(self.namespace().items())
+		attribs = {}
+		for cls in self.mro():
+			for name, obj in cls.namespace().items():
+				attribs.setdefault(name, obj)
+		return sorted(attribs.items())
+
+class StaticModule(StaticObject):
+
+	"""
+	desc:
+		A module that is parsed from a source file.
+
+	visible:	False
+	"""
+
+	kind = u'module'
+
+	def __init__(self, name, path, loader, isPackage=False):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			name:
+				desc:	The full module name.
+				type:	[str, unicode]
+			path:
+				desc:	The source file.
+				type:	[str, unicode]
+			loader:
+				desc:	The loader that keeps track of all modules.
+				type:	StaticLoader
+
+		keywords:
+			isPackage:
+				desc:	Indicates whether the module is a package.
+				type:	bool
+		"""
+
+		self.source, self.tree = parseSource(path)
+		StaticObject.__init__(self, name, ast.get_docstring(self.tree), self)
+		self.path = path
+		self.loader = loader
+		self.isPackage = isPackage
+		self._namespace = None
+		self._resolving = set()
+
+	def absoluteName(self, node):
+
+		"""
+		desc:
+			Gets the full name of the module that a from-import statement
+			imports from, resolving relative imports.
+
+		visible:	False
+
+		arguments:
+			node:	An ImportFrom node.
+
+		returns:
+			desc:	The full module name.
+			type:	[str, unicode]
+		"""
+
+		if not node.level:
+			return node.module
+		parts = self.__name__.split(u'.')
+		if not self.isPackage:
+			parts = parts[:-1]
+		if node.level > 1:
+			parts = parts[:-(node.level-1)]
+		if node.module:
+			parts.append(node.module)
+		return u'.'.join(parts)
+
+	def namespace(self):
+
+		"""
+		desc:
+			Gets the names that are bound at the top level of the module. The
+			values are StaticObject objects for functions and classes that are
+			defined in the module, and (kind, ...) tuples for names that
+			still need to be resolved.
+
+		visible:	False
+
+		returns:
+			desc:	An OrderedDict with names as keys.
+			type:	OrderedDict
+		"""
+
+		if self._namespace is not None:
+			return self._namespace
+		ns = self._namespace = OrderedDict()
+		self.starImports = []
+		# Importing a submodule makes it an attribute of its parent package
+		submodules = []
+		for stmt in statements(self.tree.body):
+			if isinstance(stmt, functionDefs):
+				ns[stmt.name] = StaticFunction(stmt, self)
+			elif isinstance(stmt, ast.ClassDef):
+				ns[stmt.name] = StaticClass(stmt, self)
+			elif isinstance(stmt, ast.Import):
+				for alias in stmt.names:
+					submodules.append(alias.name)
+					if alias.asname is not None:
+						ns[alias.asname] = (u'module', alias.name)
+					else:
+						top = alias.name.split(u'.')[0]
+						ns[top] = (u'module', top)
+			elif isinstance(stmt, ast.ImportFrom):
+				base = self.absoluteName(stmt)
+				for alias in stmt.names:
+					if alias.name == u'*':
+						self.starImports.append(base)
+						continue
+					submodules.append(u'%s.%s' % (base, alias.name))
+					ns[alias.asname or alias.name] = (u'from', base,
+						alias.name)
+			elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 \
+				and isinstance(stmt.targets[0], ast.Name) and \
+				isinstance(stmt.value, (ast.Name, ast.Attribute)):
+				ns[stmt.targets[0].id] = (u'alias', stmt.value)
+		if self.isPackage:
+			prefix = self.__name__ + u'.'
+			for name in submodules:
+				if name.startswith(prefix):
+					child = name[len(prefix):].split(u'.')[0]
+					if child not in ns:
+						ns[child] = (u'module', prefix + child)
+		return ns
+
+	def publicNames(self):
+
+		"""
+		desc:
+			Gets the names that `from module import *` imports.
+
+		visible:	False
+
+		returns:
+			desc:	A list of names.
+			type:	list
+		"""
+
+		ns = self.namespace()
+		for stmt in statements(self.tree.body):
+			if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 \
+				and isinstance(stmt.targets[0], ast.Name) and \
+				stmt.targets[0].id == u'__all__':
+				names = self.evaluate(stmt.value)
+				if isinstance(names, (list, tuple)):
+					return list(names)
+		return [name for name in ns if not name.startswith(u'_')]
+
+	def lookup(self, name):
+
+		ns = self.namespace()
+		if name not in ns:
+			for base in self.starImports:
+				module = self.loader.module(base)
+				if module is not None and name in module.publicNames():
+					return module.lookup(name)
+			return None
+		value = ns[name]
+		if isinstance(value, StaticObject):
+			return value
+		if name in self._resolving:
+			return None
+		self._resolving.add(name)
+		try:
+			kind = value[0]
+			if kind == u'module':
+				return self.loader.module(value[1])
+			if kind == u'alias':
+				return self.resolve(value[1])
+			module = self.loader.module(value[1])
+			obj = None if module is None else module.lookup(value[2])
+			if obj is None:
+				obj = self.loader.module(u'%s.%s' % (value[1], value[2]))
+			return obj
+		finally:
+			self._resolving.discard(name)
+
+	def attribs(self, inherited=True):
+
+		names = set(self.namespace())
+		for base in self.starImports:
+			module = self.loader.module(base)
+			if module is not None:
+				names.update(module.publicNames())
+		attribs = []
+		for name in sorted(names):
+			obj = self.lookup(name)
+			if obj is not None:
+				attribs.append((name, obj))
+		return attribs
+
+	def resolve(self, node):
+
+		"""
+		desc:
+			Resolves a name or attribute expression, such as a base class, in
+			the module namespace.
+
+		visible:	False
+
+		arguments:
+			node:	An expression node.
+
+		returns:
+			desc:	The object that the expression refers to, or None if it is
+					not known.
+			type:	[StaticObject, NoneType]
+		"""
+
+		if isinstance(node, ast.Name):
+			return self.lookup(node.id)
+		if isinstance(node, ast.Attribute):
+			obj = self.resolve(node.value)
+			return None if obj is None else obj.lookup(node.attr)
+		return None
+
+	def dottedName(self, node):
+
+		"""
+		desc:
+			Gets the source text of a dotted name, such as a decorator.
+
+		visible:	False
+
+		arguments:
+			node:	An expression node.
+
+		returns:
+			desc:	The dotted name, or None if the expression is not a
+					dotted name.
+			type:	[str, unicode, NoneType]
+		"""
+
+		if isinstance(node, ast.Name):
+			return node.id
+		if isinstance(node, ast.Attribute):
+			prefix = self.dottedName(node.value)
+			if prefix is not None:
+				return u'%s.%s' % (prefix, node.attr)
+		return None
+
+	def evaluate(self, node):
+
+		"""
+		desc:
+			Evaluates an expression, such as a default value, without
+			executing code.
+
+		visible:	False
+
+		arguments:
+			node:	An expression node.
+
+		returns:
+			desc:	The value if the expression is a literal or simple
+					arithmetic, and otherwise a SourceExpr object.
+		"""
+
+		try:
+			return evaluateConstant(node)
+		except Exception:
+			pass
+		text = None
+		if hasattr(ast, u'get_source_segment'):
+			text = ast.get_source_segment(self.source, node)
+		if text is None and hasattr(ast, u'unparse'):
+			text = ast.unparse(node)
+		return SourceExpr(text if text is not None else u'...')
+
+class StaticLoader(object):
+
+	"""
+	desc:
+		Finds and parses the modules of a package, without importing them.
+		Each module is parsed only once. Names that are imported from outside
+		of the package are not resolved, because that would require parsing
+		(or importing) the modules that they come from.
+
+	visible:	False
+	"""
+
+	def __init__(self, package):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			package:
+				desc:	The name of the top-level package.
+				type:	[str, unicode]
+		"""
+
+		self.package = package
+		self.modules = {}
+
+	def module(self, name, path=None):
+
+		"""
+		desc:
+			Gets a module of the package.
+
+		arguments:
+			name:
+				desc:	The full module name.
+				type:	[str, unicode]
+
+		keywords:
+			path:
+				desc:	The source file, or None to find it.
+				type:	[str, unicode, NoneType]
+
+		returns:
+			desc:	The module, or None if it is outside of the package, or
+					has no Python source file.
+			type:	[StaticModule, NoneType]
+		"""
+
+		if name in self.modules:
+			return self.modules[name]
+		module = None
+		if path is not None:
+			module = StaticModule(name, path, self,
+				isPackage=path.endswith(u'__init__.py'))
+		elif name == self.package or name.startswith(self.package + u'.'):
+			try:
+				path, isPackage, locations = findSpec(name)
+			except (YAMLDocError, ImportError, ValueError):
+				path = None
+			if path is not None and path.endswith(u'.py'):
+				module = StaticModule(name, path, self, isPackage=isPackage)
+		self.modules[name] = module
+		return module
+
+	def resolve(self, name, path=None):
+
+		"""
+		desc:
+			Gets a module, or an object in a module, by its full name.
+
+		arguments:
+			name:
+				desc:	A full name, such as `package.module.Class.method`.
+				type:	[str, unicode]
+
+		keywords:
+			path:
+				desc:	The source file of the module, or None to find it.
+				type:	[str, unicode, NoneType]
+
+		returns:
+			desc:	The object, or None if it cannot be found.
+			type:	[StaticObject, NoneType]
+		"""
+
+		module = self.module(name, path=path)
+		if module is not None or u'.' not in name:
+			return module
+		parent, attrib = name.rsplit(u'.', 1)
+		obj = self.resolve(parent, path=path)
+		return None if obj is None else obj.lookup(attrib)
+
+def StaticDocFactory(obj, types=[u'function', u'class', u'module',
+	u'property'], *args, **kwargs):
+
+	"""
+	desc:
+		Creates a type-specific doc object for a StaticObject. This is the
+		static counterpart of [DocFactory].
+
+	visible:	False
+
+	arguments:
+		obj:	The StaticObject to document.
+
+	keywords:
+		types:
+			desc:	A list of types that should be documented.
+			type:	list
+
+	argument-list:
+		See [BaseDoc.__init__] for a description of available arguments.
+
+	keyword-dict:
+		See [BaseDoc.__init__] for a description of available keywords.
+
+	returns:
+		A doc object, or None.
+	"""
+
+	if not isinstance(obj, StaticObject) or obj.kind not in types:
+		return None
+	return staticDocClasses[obj.kind](obj, *args, **kwargs)
+
+class StaticDoc(object):
+
+	"""
+	desc:
+		A mixin for doc objects that document a StaticObject, rather than a
+		live object.
+
+	visible:	False
+	"""
+
+	def docString(self):
+
+		return self.obj.docString()
+
+	def objAttribs(self, types=None):
+
+		return [(name, obj) for name, obj in \
+			self.obj.attribs(inherited=self.inherited) \
+			if types is None or obj.kind in types]
+
+	def docFactory(self, obj, **kwargs):
+
+		if not self.inPackage(obj):
+			return None
+		return StaticDocFactory(obj, **kwargs)
+
+class StaticFunctionDoc(StaticDoc, FunctionDoc):
+
+	"""
+	desc:
+		A docstring processor for functions and methods in source code.
+	visible:
+		False
+	"""
+
+	className = u'FunctionDoc'
+
+class StaticClassDoc(StaticDoc, ClassDoc):
+
+	"""
+	desc:
+		A docstring processor for classes in source code.
+	visible:
+		False
+	"""
+
+	className = u'ClassDoc'
+
+class StaticModuleDoc(StaticDoc, ModuleDoc):
+
+	"""
+	desc:
+		A docstring processor for modules in source code.
+	visible:
+		False
+	"""
+
+	className = u'ModuleDoc'
+
+class StaticPropertyDoc(StaticDoc, PropertyDoc):
+
+	"""
+	desc:
+		A docstring processor for properties in source code.
+	visible:
+		False
+	"""
+
+	className = u'PropertyDoc'
+
+staticDocClasses = {
+	u'function'	: StaticFunctionDoc,
+	u'class'	: StaticClassDoc,
+	u'module'	: StaticModuleDoc,
+	u'property'	: StaticPropertyDoc,
+	}
+
+def staticDoc(name, path=None, **kwargs):
+
+	"""
+	desc: |
+		Creates a doc object by parsing source code, rather than by importing
+		modules and inspecting live objects. This is faster, does not run any
+		code in the documented modules, and works for modules whose
+		dependencies are not installed. The resulting documentation is the
+		same as that of [DocFactory], except that:
+
+		- Only functions, classes, and modules that are defined in the
+		  package itself are documented.
+		- Default values that are not literals (or simple arithmetic on
+		  numbers) are shown as source code.
+		- Functions that are created or modified dynamically, for example by
+		  decorators that change their signature, are documented as they
+		  appear in the source code.
+
+	example: |
+		import yamldoc
+
+		df = yamldoc.staticDoc(u'mypackage.mymodule')
+		print(df)
+		# Classes and functions can be documented as well
+		print(yamldoc.staticDoc(u'mypackage.mymodule.MyClass'))
+
+	arguments:
+		name:
+			desc:	The full name of a module, or of a class or function in a
+					module.
+			type:	[str, unicode]
+
+	keywords:
+		path:
+			desc:	The source file of the module, or None to find the module
+					in the same way as `import` would.
+			type:	[str, unicode, NoneType]
+
+	keyword-dict:
+		kwargs:		Keywords that are passed to [DocFactory].
+
+	returns:
+		A doc object.
+	"""
+
+	obj = StaticLoader(name.split(u'.')[0]).resolve(name, path=path)
+	if obj is None:
+		raise YAMLDocError(u'Not found in source code: %s' % name)
+	return StaticDocFactory(obj, **kwargs)
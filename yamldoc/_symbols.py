@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import io
+import json
+from collections import OrderedDict
+
+def objectKey(obj):
+
+	"""
+	desc:
+		Gets a name that identifies an object, regardless of the name under
+		which it is documented. This is the name of the module for modules,
+		and the module name followed by the qualified name for classes and
+		functions.
+
+	visible:	False
+
+	arguments:
+		obj:	An object.
+
+	returns:
+		desc:	The identifying name, or None if the object has none.
+		type:	[unicode, NoneType]
+	"""
+
+	# Properties are identified by their getter, but not by the same name,
+	# because the getter may be documented as a function as well.
+	if isinstance(obj, property):
+		key = objectKey(obj.fget)
+		return None if key is None else key + u':property'
+	module = getattr(obj, u'__module__', None)
+	name = getattr(obj, u'__qualname__', getattr(obj, u'__name__', None))
+	if not isinstance(name, basestring):
+		return None
+	if not isinstance(module, basestring):
+		# Modules don't have a __module__
+		return safe_decode(name) if type(obj).__name__ == u'module' else None
+	return u'%s.%s' % (module, name)
+
+class SymbolIndex(object):
+
+	"""
+	desc: |
+		A table of all documented objects, which maps names to the ids of the
+		headers under which the objects are documented. Each object is
+		registered under its full name, such as `yamldoc.BaseDoc.__init__`,
+		and under each shorter name that is obtained by removing leading
+		parts, such as `BaseDoc.__init__` and `__init__`.
+
+		- A full name always refers to the header with that name. If the same
+		  name is registered more than once, the first registration wins.
+		- A shorter name refers to the first documentation of the object. If
+		  a shorter name refers to different objects, it is ambiguous, and is
+		  left out of the table.
+
+		The index is filled while the documentation is generated, and ends up
+		as a single table of Markdown link references, so that names between
+		square brackets, such as [DocFactory], link to the documentation of
+		the object.
+
+	example: |
+		import yamldoc
+
+		symbols = yamldoc.SymbolIndex()
+		md = unicode(yamldoc.DocFactory(yamldoc, symbols=symbols))
+		print(symbols.resolve(u'DocFactory'))
+		with open(u'symbols.json', u'w') as fd:
+			symbols.dump(fd)
+	"""
+
+	def __init__(self):
+
+		"""
+		desc:
+			Constructor.
+		"""
+
+		# The registrations as (name, id, key) tuples, in order, which is all
+		# that is needed to merge indices.
+		self.entries = []
+		self.names = OrderedDict()
+		self.fullNames = set()
+		self.ambiguous = set()
+		self.targets = {}
+
+	def add(self, name, id, key=None):
+
+		"""
+		desc:
+			Registers a documented object.
+
+		arguments:
+			name:
+				desc:	The full name under which the object is documented.
+				type:	[str, unicode]
+			id:
+				desc:	The id of the header.
+				type:	[str, unicode]
+
+		keywords:
+			key:
+				desc:	A name that identifies the object (see
+						`objectKey()`), so that shorter names refer to the
+						first documentation of an object that is documented
+						more than once, or None.
+				type:	[str, unicode, NoneType]
+		"""
+
+		self.entries.append((name, id, key))
+		if name not in self.fullNames:
+			self.fullNames.add(name)
+			self.names[name] = id
+		target = id if key is None else self.targets.setdefault(key, id)
+		parts = name.split(u'.')
+		for i in range(1, len(parts)):
+			suffix = u'.'.join(parts[i:])
+			if suffix in self.fullNames or suffix in self.ambiguous:
+				continue
+			existing = self.names.get(suffix)
+			if existing is None:
+				self.names[suffix] = target
+			elif existing != target:
+				self.ambiguous.add(suffix)
+				del self.names[suffix]
+
+	def merge(self, other):
+
+		"""
+		desc:
+			Adds all registrations of another index, as if they had been made
+			after those of this index. This is used to combine the indices of
+			modules that are documented separately.
+
+		arguments:
+			other:
+				desc:	Another index, or a list of (name, id, key) entries.
+				type:	[SymbolIndex, list]
+		"""
+
+		entries = other.entries if isinstance(other, SymbolIndex) else other
+		for name, id, key in entries:
+			self.add(name, id, key)
+
+	def resolve(self, name):
+
+		"""
+		desc:
+			Gets the header id of a name.
+
+		arguments:
+			name:
+				desc:	A full or shorter name.
+				type:	[str, unicode]
+
+		returns:
+			desc:	The header id, or None if the name is not known or is
+					ambiguous.
+			type:	[unicode, NoneType]
+		"""
+
+		return self.names.get(name)
+
+	def __contains__(self, name):
+
+		return name in self.names
+
+	def __len__(self):
+
+		return len(self.names)
+
+	def referenceChunks(self):
+
+		"""
+		desc:
+			Generates the Markdown link references for all names.
+
+		visible:	False
+
+		returns:
+			desc:	A generator of unicode fragments.
+			type:	generator
+		"""
+
+		if not self.names:
+			return
+		yield u'\n'
+		for name, id in self.names.items():
+			yield u'[%s]: #%s\n' % (name, id)
+
+	def asDict(self):
+
+		"""
+		desc:
+			Gets a JSON-compatible representation of the index.
+
+		returns:
+			desc:	A dict with a `symbols` dict that maps names to header ids,
+					and an `entries` list with all registrations, from which
+					the index can be restored (see [SymbolIndex.fromDict]).
+			type:	dict
+		"""
+
+		return OrderedDict([
+			(u'symbols', self.names),
+			(u'entries', [list(entry) for entry in self.entries]),
+			])
+
+	@classmethod
+	def fromDict(cls, d):
+
+		"""
+		desc:
+			Restores an index from its JSON-compatible representation.
+
+		arguments:
+			d:
+				desc:	A dict as returned by [SymbolIndex.asDict].
+				type:	dict
+
+		returns:
+			type:	SymbolIndex
+		"""
+
+		index = cls()
+		index.merge([tuple(entry) for entry in d[u'entries']])
+		return index
+
+	def dump(self, stream):
+
+		"""
+		desc:
+			Writes the index as JSON.
+
+		arguments:
+			stream:
+				desc:	A file-like object that accepts unicode strings.
+		"""
+
+		stream.write(safe_decode(json.dumps(self.asDict(), indent=1)))
+
+	@classmethod
+	def load(cls, stream):
+
+		"""
+		desc:
+			Reads an index from JSON.
+
+		arguments:
+			stream:
+				desc:	A file-like object.
+
+		returns:
+			type:	SymbolIndex
+		"""
+
+		return cls.fromDict(json.load(stream))
@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+from yamldoc._symbols import objectKey
+from collections import OrderedDict
+import json
+import time
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+timer = getattr(time, u'perf_counter', time.time)
+# The phases in the order in which they are reported
+tracePhases = [u'getdoc', u'parse', u'parseArgSpec', u'objAttribs',
+	u'sections', u'misc', u'assembly']
+
+class TraceFrame(object):
+
+	"""
+	desc:
+		A phase that is currently being traced.
+
+	visible:	False
+	"""
+
+	__slots__ = u'stats', u't0', u'elapsed', u'mem0', u'peak'
+
+	def __init__(self, stats):
+
+		self.stats = stats
+		self.t0 = timer()
+		self.elapsed = 0
+		self.mem0 = None
+		self.peak = 0
+
+class Tracer(object):
+
+	"""
+	desc: |
+		Measures how much time documentation generation spends in each of the
+		following phases, per object and per module:
+
+		- getdoc: getting docstrings
+		- parse: parsing YAML docstrings
+		- parseArgSpec: getting the argument specifications of functions
+		- objAttribs: enumerating the attributes of modules and classes
+		- sections: generating the documentation sections
+		- misc: generating the documentation of children, apart from the
+		  documentation itself
+		- assembly: filling in templates and joining the documentation
+
+		Time is exclusive, so when a phase starts while another phase is
+		active, for example when a docstring is parsed while the children of
+		a module are documented, the time is counted only for the phase that
+		started last.
+
+		Tracing is opt-in: pass a tracer as the `tracer` keyword to
+		[DocFactory], and it is passed on to the doc objects of children.
+
+	example: |
+		import yamldoc
+
+		tracer = yamldoc.Tracer()
+		str(yamldoc.DocFactory(yamldoc, tracer=tracer))
+		tracer.report()
+		with open(u'trace.json', u'w') as fd:
+			tracer.dump(fd)
+	"""
+
+	def __init__(self, memory=False):
+
+		"""
+		desc:
+			Constructor.
+
+		keywords:
+			memory:
+				desc:	Indicates whether the peak memory of each phase should
+						be measured with `tracemalloc` as well. This requires
+						Python 3.9 or later, and is ignored otherwise. Memory
+						tracing slows down documentation generation
+						considerably.
+				type:	bool
+		"""
+
+		self.memory = memory and tracemalloc is not None and \
+			hasattr(tracemalloc, u'reset_peak')
+		self.startedTracemalloc = False
+		if self.memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			self.startedTracemalloc = True
+		self.stack = []
+		# Maps object keys onto (module, {phase: [calls, seconds, peak]})
+		# tuples
+		self.objects = OrderedDict()
+
+	def close(self):
+
+		"""
+		desc:
+			Stops memory tracing, if the tracer started it.
+		"""
+
+		if self.startedTracemalloc:
+			tracemalloc.stop()
+			self.startedTracemalloc = False
+
+	def statsFor(self, phase, df):
+
+		"""
+		desc:
+			Gets the statistics of a phase for a doc object.
+
+		visible:	False
+
+		returns:
+			desc:	A [calls, seconds, peak] list.
+			type:	list
+		"""
+
+		obj = df.obj
+		# Modules are identified by their name, also in static mode, where
+		# they do have a __module__.
+		if df.kind == u'module':
+			key = safe_decode(obj.__name__)
+		else:
+			key = objectKey(obj)
+			if key is None:
+				key = u'%s %s' % (df.kind, df._name())
+		entry = self.objects.get(key)
+		if entry is None:
+			if df.kind == u'module':
+				module = key
+			else:
+				# Properties have no __module__, but their getters do
+				module = safe_decode(getattr(obj, u'__module__', None) or
+					getattr(getattr(obj, u'fget', None), u'__module__',
+					None) or u'')
+			entry = module, {}
+			self.objects[key] = entry
+		phases = entry[1]
+		stats = phases.get(phase)
+		if stats is None:
+			stats = phases[phase] = [0, 0., None]
+		return stats
+
+	def push(self, stats):
+
+		"""
+		desc:
+			Starts a phase, and pauses the phase that is currently active.
+
+		visible:	False
+
+		arguments:
+			stats:
+				desc:	The statistics of the phase for a doc object, as
+						returned by [Tracer.statsFor].
+				type:	list
+		"""
+
+		if self.stack:
+			outer = self.stack[-1]
+			outer.elapsed += timer() - outer.t0
+			if self.memory:
+				outer.peak = max(outer.peak,
+					tracemalloc.get_traced_memory()[1] - outer.mem0)
+		frame = TraceFrame(stats)
+		if self.memory:
+			tracemalloc.reset_peak()
+			frame.mem0 = tracemalloc.get_traced_memory()[0]
+		self.stack.append(frame)
+		frame.t0 = timer()
+
+	def pause(self):
+
+		"""
+		desc:
+			Stops the active phase, and resumes the phase that was active
+			before.
+
+		visible:	False
+		"""
+
+		frame = self.stack.pop()
+		frame.elapsed += timer() - frame.t0
+		stats = frame.stats
+		stats[1] += frame.elapsed
+		if self.memory:
+			peak = max(frame.peak,
+				tracemalloc.get_traced_memory()[1] - frame.mem0)
+			stats[2] = peak if stats[2] is None else max(stats[2], peak)
+		if self.stack:
+			outer = self.stack[-1]
+			if self.memory:
+				tracemalloc.reset_peak()
+			outer.t0 = timer()
+
+	def call(self, phase, df, func, *args, **kwargs):
+
+		"""
+		desc:
+			Calls a function as a phase.
+
+		visible:	False
+
+		arguments:
+			phase:		The name of the phase.
+			df:			The doc object for which the function is called.
+			func:		The function.
+
+		argument-list:
+			args:		The arguments for the function.
+
+		keyword-dict:
+			kwargs:		The keywords for the function.
+
+		returns:
+			The return value of the function.
+		"""
+
+		stats = self.statsFor(phase, df)
+		stats[0] += 1
+		self.push(stats)
+		try:
+			return func(*args, **kwargs)
+		finally:
+			self.pause()
+
+	def chunks(self, phase, df, chunks):
+
+		"""
+		desc:
+			Wraps a generator, such that generating items is traced as a
+			phase. The phase is counted as a single call.
+
+		visible:	False
+
+		arguments:
+			phase:		The name of the phase.
+			df:			The doc object for which items are generated.
+			chunks:		A generator.
+
+		returns:
+			type:	generator
+		"""
+
+		stats = self.statsFor(phase, df)
+		stats[0] += 1
+		it = iter(chunks)
+		while True:
+			self.push(stats)
+			try:
+				chunk = next(it)
+			except StopIteration:
+				return
+			finally:
+				self.pause()
+			yield chunk
+
+	def phaseTotals(self, objects=None):
+
+		"""
+		desc:
+			Sums the statistics of each phase over objects.
+
+		visible:	False
+
+		keywords:
+			objects:
+				desc:	A list of (module, phases) tuples, or None for all
+						objects.
+				type:	[list, NoneType]
+
+		returns:
+			desc:	A dict that maps phases onto [calls, seconds, peak]
+					lists.
+			type:	OrderedDict
+		"""
+
+		if objects is None:
+			objects = self.objects.values()
+		totals = OrderedDict((phase, [0, 0., None]) for phase in tracePhases)
+		for module, phases in objects:
+			for phase, (calls, seconds, peak) in phases.items():
+				total = totals.setdefault(phase, [0, 0., None])
+				total[0] += calls
+				total[1] += seconds
+				if peak is not None:
+					total[2] = peak if total[2] is None else max(total[2],
+						peak)
+		return totals
+
+	def modules(self):
+
+		"""
+		desc:
+			Aggregates the statistics per module.
+
+		returns:
+			desc:	A dict that maps module names onto the statistics of each
+					phase, as in [Tracer.phaseTotals].
+			type:	OrderedDict
+		"""
+
+		byModule = OrderedDict()
+		for module, phases in self.objects.values():
+			byModule.setdefault(module, []).append((module, phases))
+		return OrderedDict((module, self.phaseTotals(objects)) \
+			for module, objects in byModule.items())
+
+	def asDict(self):
+
+		"""
+		desc:
+			Gets the statistics as a dict, which can be serialized as JSON.
+			Statistics are given per phase, per module, and per object, as
+			dicts with calls, seconds, and peak (in bytes, or None if memory
+			was not traced) as keys.
+
+		returns:
+			type:	dict
+		"""
+
+		def phaseDict(totals):
+			return OrderedDict((phase, OrderedDict([
+				(u'calls', calls),
+				(u'seconds', seconds),
+				(u'peak', peak)
+				])) for phase, (calls, seconds, peak) in totals.items() \
+				if calls)
+		return OrderedDict([
+			(u'memory', self.memory),
+			(u'phases', phaseDict(self.phaseTotals())),
+			(u'modules', OrderedDict((module, phaseDict(totals)) \
+				for module, totals in self.modules().items())),
+			(u'objects', OrderedDict((key, OrderedDict([
+				(u'module', module),
+				(u'phases', phaseDict(self.phaseTotals([(module,
+					phases)])))
+				])) for key, (module, phases) in self.objects.items()))
+			])
+
+	def dump(self, stream):
+
+		"""
+		desc:
+			Writes the statistics as JSON (see [Tracer.asDict]).
+
+		arguments:
+			stream:
+				desc:	A file-like object that accepts unicode strings.
+		"""
+
+		stream.write(safe_decode(json.dumps(self.asDict(), indent=1)))
+
+	def report(self, stream=None, limit=20):
+
+		"""
+		desc:
+			Writes a report with the time spent in each phase, in total and
+			for the slowest modules and objects.
+
+		keywords:
+			stream:
+				desc:	A file-like object that accepts unicode strings, or
+						None to write to the standard output.
+			limit:
+				desc:	The maximum number of modules and objects, or None to
+						report all of them.
+				type:	[int, NoneType]
+		"""
+
+		if stream is None:
+			import sys
+			stream = sys.stdout
+		totals = self.phaseTotals()
+		seconds = sum(total[1] for total in totals.values())
+		stream.write(u'%-16s%10s%12s%8s%12s\n' % (u'phase', u'calls', u'ms',
+			u'%', u'peak kB'))
+		for phase, (calls, t, peak) in totals.items():
+			stream.write(u'%-16s%10d%12.1f%8.1f%12s\n' % (phase, calls,
+				1000 * t, 100 * t / seconds if seconds else 0,
+				u'-' if peak is None else u'%.1f' % (peak / 1024.)))
+		stream.write(u'%-16s%10s%12.1f\n' % (u'total', u'', 1000 * seconds))
+		for title, rows in [
+			(u'module', self.modules().items()),
+			(u'object', ((key, self.phaseTotals([entry])) \
+				for key, entry in self.objects.items()))
+			]:
+			rows = sorted(((sum(total[1] for total in totals.values()),
+				name, totals) for name, totals in rows), reverse=True)
+			if limit is not None:
+				rows = rows[:limit]
+			stream.write(u'\n%-40s%10s  %s\n' % (title, u'ms',
+				u'slowest phases'))
+			for t, name, totals in rows:
+				slowest = sorted(((total[1], phase) for phase, total in \
+					totals.items() if total[0]), reverse=True)[:3]
+				stream.write(u'%-40s%10.1f  %s\n' % (name, 1000 * t,
+					u', '.join(u'%s %.1f' % (phase, 1000 * pt) \
+					for pt, phase in slowest)))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import types
+import importlib
+from yamldoc._exceptions import YAMLDocError
+
+try:
+	import builtins
+except ImportError:
+	import __builtin__ as builtins
+
+# Type names that cannot be resolved by simply looking them up in the builtins
+# or `types` modules, or whose meaning differs between Python 2 and 3.
+typeRegistry = {
+	u'NoneType'	: type(None),
+	u'None'		: type(None),
+	u'function'	: types.FunctionType,
+	u'method'	: types.MethodType,
+	u'module'	: types.ModuleType,
+	u'unicode'	: str,
+	}
+if not py3:
+	typeRegistry[u'int'] = (int, long)
+	typeRegistry[u'str'] = bytes
+
+# Resolved type specifications, indexed by a tuple of type names.
+_cache = {}
+
+def registerType(name, _type):
+
+	"""
+	desc:
+		Registers a custom type name that can be used in the `type` field of
+		argument, keyword, and return-value specifications.
+
+	example: |
+		import yamldoc
+
+		yamldoc.registerType(u'positive', lambda val: val > 0)
+		yamldoc.registerType(u'number', (int, float))
+
+	arguments:
+		name:
+			desc:	The type name.
+			type:	[str, unicode]
+		_type:
+			desc:	A type, a tuple of types, or a predicate function that
+					accepts a value and returns True if the value is of the
+					specified type. Types are checked with a single
+					`isinstance()` call, so they are faster than predicates.
+	"""
+
+	if not isinstance(_type, (type, tuple)) and not callable(_type):
+		raise YAMLDocError(
+			u'A type should be a type, a tuple of types, or a function')
+	typeRegistry[name] = _type
+	_cache.clear()
+
+def resolveType(name):
+
+	"""
+	desc:
+		Resolves a single type name to a type object, a tuple of type objects,
+		or a predicate function. Names are looked up in the registry, the
+		builtins, and the `types` module. Dotted names, such as
+		`collections.OrderedDict`, are imported.
+
+	visible:	False
+
+	arguments:
+		name:
+			desc:	A type name.
+			type:	[str, unicode]
+
+	returns:
+		desc:	A type, tuple of types, or predicate, or None if the name could
+				not be resolved.
+	"""
+
+	if name in typeRegistry:
+		return typeRegistry[name]
+	if u'.' in name:
+		moduleName, attrib = name.rsplit(u'.', 1)
+		try:
+			_type = getattr(importlib.import_module(moduleName), attrib)
+		except (ImportError, AttributeError):
+			return None
+	else:
+		_type = getattr(builtins, name, None)
+		if not isinstance(_type, type):
+			_type = getattr(types, name, None)
+	if isinstance(_type, type):
+		return _type
+	return None
+
+def resolveTypes(names):
+
+	"""
+	desc:
+		Resolves a list of type names, such as the `type` field of an argument
+		specification, into a tuple of types that can be passed to
+		`isinstance()`, plus an optional predicate for registered predicate
+		functions and names that could not be resolved. Unresolved names are
+		compared to the name of the value's class, which is how types were
+		checked before the names were resolved. The result is cached.
+
+	visible:	False
+
+	arguments:
+		names:
+			desc:	A list of type names.
+			type:	[list, tuple]
+
+	returns:
+		desc:	A (types, predicate) tuple, where predicate is None if all
+				names were resolved to types.
+		type:	tuple
+	"""
+
+	key = tuple(names)
+	if key in _cache:
+		return _cache[key]
+	_types = []
+	predicates = []
+	unresolved = set()
+	for name in names:
+		name = safe_decode(str(name))
+		_type = resolveType(name)
+		if _type is None:
+			unresolved.add(name)
+		elif isinstance(_type, tuple):
+			_types += list(_type)
+		elif isinstance(_type, type):
+			_types.append(_type)
+		else:
+			predicates.append(_type)
+	if unresolved:
+		predicates.append(lambda val: val.__class__.__name__ in unresolved \
+			or u'%s.%s' % (val.__class__.__module__, val.__class__.__name__) \
+			in unresolved)
+	if not predicates:
+		predicate = None
+	elif len(predicates) == 1:
+		predicate = predicates[0]
+	else:
+		predicate = lambda val: any(p(val) for p in predicates)
+	_cache[key] = tuple(_types), predicate
+	return _cache[key]
+
+def isOfType(val, names):
+
+	"""
+	desc:
+		Checks whether a value matches a list of type names.
+
+	visible:	False
+
+	arguments:
+		val:	A value to check.
+		names:
+			desc:	A list of type names.
+			type:	[list, tuple]
+
+	returns:
+		desc:	True if the value matches any of the types, False otherwise.
+		type:	bool
+	"""
+
+	_types, predicate = resolveTypes(names)
+	return isinstance(val, _types) or (predicate is not None and \
+		predicate(val))
@@ -18,10 +18,317 @@ along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from yamldoc.py3compat import *
+import os
 import inspect
+import warnings
+import itertools
+from collections import OrderedDict
+try:
+	from time import perf_counter as timer
+except ImportError:
+	from time import time as timer
 from yamldoc._functiondoc import FunctionDoc
+from yamldoc._types import resolveTypes, isOfType
 from yamldoc._exceptions import InvalidReturnValue, InvalidArgument, \
-	InvalidKeyword
+	InvalidKeyword, InvalidYieldValue, YAMLDocError
+
+if py3:
+	from yamldoc._validategen import validatedGenerator
+else:
+	validatedGenerator = None
+
+validationModes = u'on', u'off', u'sample'
+# By default, validation is enabled, unless Python runs in optimized mode (-O),
+# in which case assertions are disabled as well.
+_mode = u'on' if __debug__ else u'off'
+_sampleRate = 100
+_moduleSampleRates = {}
+
+def setValidationMode(mode, sampleRate=None):
+
+	"""
+	desc: |
+		Sets the global validation mode of the @[validate] decorator. The
+		mode is applied when a function is decorated, so it should be set
+		before the modules that use the decorator are imported. The mode can
+		also be set with the `YAMLDOC_VALIDATE` environment variable, and the
+		sample rate with the `YAMLDOC_SAMPLE_RATE` environment variable.
+		Invalid values of these variables are ignored with a warning.
+
+		- In 'on' mode, every call is validated. This is the default, unless
+		  Python runs in optimized mode (`python -O`).
+		- In 'off' mode, the decorator returns the original function, so that
+		  validation doesn't cost anything.
+		- In 'sample' mode, only one in every N calls is validated.
+
+	example: |
+		import yamldoc
+		yamldoc.setValidationMode(u'sample', sampleRate=1000)
+
+	arguments:
+		mode:
+			desc:	The validation mode.
+			type:	[str, unicode]
+			valid:	['on', 'off', sample]
+
+	keywords:
+		sampleRate:
+			desc:	The default N for 'sample' mode, or None to keep the
+					current value. See also [setSampleRate].
+			type:	[int, NoneType]
+	"""
+
+	global _mode
+	if mode not in validationModes:
+		raise YAMLDocError(u'Invalid validation mode: %s' % mode)
+	_mode = mode
+	if sampleRate is not None:
+		setSampleRate(sampleRate)
+
+def validationMode():
+
+	"""
+	desc:
+		Gets the global validation mode.
+
+	returns:
+		desc:	The validation mode ('on', 'off', or 'sample').
+		type:	unicode
+	"""
+
+	return _mode
+
+def setSampleRate(sampleRate, module=None):
+
+	"""
+	desc:
+		Sets how many calls there are for each validated call in 'sample'
+		mode, either globally or for the functions of a specific module or
+		package. A rate that is passed directly to the @[validate] decorator
+		takes precedence over both.
+
+	example: |
+		import yamldoc
+		# Validate one in 100 calls, but one in 10000 calls for `mypkg.core`
+		yamldoc.setSampleRate(100)
+		yamldoc.setSampleRate(10000, module=u'mypkg.core')
+
+	arguments:
+		sampleRate:
+			desc:	N, such that one in every N calls is validated.
+			type:	int
+
+	keywords:
+		module:
+			desc:	The name of a module or package, or None to set the
+					default rate.
+			type:	[str, unicode, NoneType]
+	"""
+
+	global _sampleRate
+	if not isinstance(sampleRate, int) or sampleRate < 1:
+		raise YAMLDocError(u'The sample rate should be a positive integer')
+	if module is None:
+		_sampleRate = sampleRate
+	else:
+		_moduleSampleRates[module] = sampleRate
+
+def sampleRateFor(func):
+
+	"""
+	desc:
+		Gets the sample rate for a function, based on the module that it is
+		defined in.
+
+	visible:	False
+
+	arguments:
+		func:
+			desc:	A function.
+			type:	function
+
+	returns:
+		type:	int
+	"""
+
+	module = getattr(func, u'__module__', None)
+	while module:
+		if module in _moduleSampleRates:
+			return _moduleSampleRates[module]
+		module = module.rpartition(u'.')[0]
+	return _sampleRate
+
+class ValidationStats(object):
+
+	"""
+	desc:
+		Instrumentation counters for a single validated function. Counters are
+		updated without locking, so they may be slightly off when a function
+		is called from multiple threads at the same time.
+
+	visible:	False
+	"""
+
+	__slots__ = ('calls', 'validatedCalls', 'argumentFailures',
+		'keywordFailures', 'returnFailures', 'yieldFailures', 'validationTime',
+		'functionTime')
+
+	def __init__(self):
+
+		self.reset()
+
+	def reset(self):
+
+		"""
+		desc:
+			Resets all counters to zero.
+		"""
+
+		for key in self.__slots__:
+			setattr(self, key, 0)
+
+	def asDict(self):
+
+		"""
+		desc:
+			Gets a dict representation of the counters.
+
+		returns:
+			type:	OrderedDict
+		"""
+
+		return OrderedDict((key, getattr(self, key)) for key in self.__slots__)
+
+_instrument = False
+_stats = OrderedDict()
+
+def setInstrumentation(enabled):
+
+	"""
+	desc: |
+		Enables or disables instrumentation of the @[validate] decorator. For
+		each instrumented function, yamldoc keeps track of the number of calls,
+		the number of validated calls (which differs in 'sample' mode), the
+		number of failed argument, keyword, and return-value checks, and the
+		cumulative time (in seconds) spent in validation and in the function
+		itself. See also [instrumentationSnapshot].
+
+		Like the validation mode, instrumentation is applied when a function
+		is decorated, so that functions that are decorated while
+		instrumentation is disabled don't pay for it. Instrumentation can also
+		be enabled by setting the `YAMLDOC_INSTRUMENT` environment variable
+		to 1.
+
+	arguments:
+		enabled:
+			desc:	Indicates whether instrumentation should be enabled.
+			type:	bool
+	"""
+
+	global _instrument
+	_instrument = enabled
+
+def instrumentationSnapshot():
+
+	"""
+	desc:
+		Gets a snapshot of the instrumentation counters of all instrumented
+		functions. Functions are identified by their module and (qualified)
+		name. Functions that share a name share counters.
+
+	example: |
+		import yamldoc
+
+		stats = yamldoc.instrumentationSnapshot()
+		for name, d in sorted(stats.items(),
+			key=lambda item: -item[1][u'validationTime']):
+			print(name, d[u'calls'], d[u'validationTime'])
+
+	returns:
+		desc:	An OrderedDict with function names as keys, and OrderedDicts
+				with counters as values.
+		type:	OrderedDict
+	"""
+
+	return OrderedDict((name, stats.asDict()) for name, stats in \
+		_stats.items())
+
+def resetInstrumentation():
+
+	"""
+	desc:
+		Resets the instrumentation counters of all instrumented functions to
+		zero.
+	"""
+
+	for stats in _stats.values():
+		stats.reset()
+
+def statsFor(func):
+
+	"""
+	desc:
+		Gets the instrumentation counters for a function, and creates them if
+		necessary.
+
+	visible:	False
+
+	arguments:
+		func:
+			desc:	A function.
+			type:	function
+
+	returns:
+		type:	ValidationStats
+	"""
+
+	name = u'%s.%s' % (getattr(func, u'__module__', None),
+		getattr(func, u'__qualname__', func.__name__))
+	if name not in _stats:
+		_stats[name] = ValidationStats()
+	return _stats[name]
+
+def configure(environ):
+
+	"""
+	desc:
+		Applies the `YAMLDOC_INSTRUMENT`, `YAMLDOC_VALIDATE`, and
+		`YAMLDOC_SAMPLE_RATE` environment variables. Invalid values are
+		ignored with a warning that names the variable, so that they don't
+		prevent yamldoc from being imported.
+
+	visible:	False
+
+	arguments:
+		environ:
+			desc:	The environment variables.
+			type:	dict
+	"""
+
+	if u'YAMLDOC_INSTRUMENT' in environ:
+		setInstrumentation(environ[u'YAMLDOC_INSTRUMENT'].strip() not in \
+			(u'', u'0'))
+	if u'YAMLDOC_VALIDATE' in environ:
+		mode = environ[u'YAMLDOC_VALIDATE'].strip().lower()
+		if mode in validationModes:
+			setValidationMode(mode)
+		else:
+			warnings.warn(u'Ignoring YAMLDOC_VALIDATE=%r, which should be '
+				u'one of: %s' % (environ[u'YAMLDOC_VALIDATE'],
+				u', '.join(validationModes)), RuntimeWarning)
+	if u'YAMLDOC_SAMPLE_RATE' in environ:
+		try:
+			sampleRate = int(environ[u'YAMLDOC_SAMPLE_RATE'])
+		except ValueError:
+			sampleRate = 0
+		if sampleRate >= 1:
+			setSampleRate(sampleRate)
+		else:
+			warnings.warn(u'Ignoring YAMLDOC_SAMPLE_RATE=%r, which should be '
+				u'a positive integer' % environ[u'YAMLDOC_SAMPLE_RATE'],
+				RuntimeWarning)
+
+configure(os.environ)
 
 def checkVal(val, spec):
 
@@ -41,22 +348,501 @@ def checkVal(val, spec):
 	"""
 
 	if u'type' in spec:
-		_type = type(val)
-		if val.__class__.__name__ not in spec[u'type']:
+		if not isOfType(val, spec[u'type']):
 			return False
 	if u'valid' in spec:
 		if val not in spec[u'valid']:
 			return False
 	return True
 
-def validate(func):
+def compileSpec(spec):
+
+	"""
+	desc:
+		Compiles a value specification into a `(types, predicate, valid)`
+		check, so that the specification doesn't need to be inspected again
+		for every call. Type names are resolved to type objects (see
+		[registerType]), so that a type check is usually a single
+		`isinstance()` call.
+
+	visible:	False
+
+	arguments:
+		spec:
+			desc:	A value specification.
+			type:	dict
+
+	returns:
+		desc:	A `(types, predicate, valid)` tuple, where `types` and
+				`valid` are None if the specification doesn't constrain them,
+				and `predicate` is None if the type check only requires
+				`isinstance()`; or None if the specification doesn't constrain
+				the value at all.
+		type:	[tuple, NoneType]
+	"""
+
+	types = spec.get(u'type', None)
+	valid = spec.get(u'valid', None)
+	if types is None and valid is None:
+		return None
+	predicate = None
+	if types is not None:
+		types, predicate = resolveTypes(types)
+	return types, predicate, valid
+
+def specMessage(spec):
+
+	"""
+	desc:
+		Generates the part of an error message that describes a value
+		specification.
+
+	visible:	False
+
+	arguments:
+		spec:
+			desc:	A value specification.
+			type:	dict
+
+	returns:
+		type:	unicode
+	"""
+
+	msg = u''
+	if u'type' in spec:
+		msg += u' Type should be one of "%s"' % spec[u'type']
+	if u'valid' in spec:
+		msg += u' Value should be one of "%s"' % spec[u'valid']
+	return msg
+
+class ValidationPlan(object):
+
+	"""
+	desc:
+		A flat validation plan that is compiled once, when a function is
+		decorated, from the function's docstring and argument specification.
+		Arguments are bound to parameters in the same way as Python does it.
+		Positional arguments bind to parameters by position (and surplus
+		arguments go into the argument list, if any), and keywords bind to
+		parameters by name (and unknown keywords go into the keyword
+		dictionary, if any). Keyword-only parameters bind only by name.
+
+	visible:	False
+	"""
+
+	def __init__(self, func, argSpec, _dict, kwonlyArgs=()):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			func:		The function to validate.
+			argSpec:	The argument specification of the function.
+			_dict:
+				desc:	The docstring dictionary of the function, as
+						generated by [FunctionDoc].
+				type:	dict
+
+		keywords:
+			kwonlyArgs:
+				desc:	The names of the keyword-only parameters.
+				type:	[list, tuple]
+		"""
+
+		self.name = func.__name__
+		params = list(argSpec.args) if argSpec.args is not None else []
+		# Ignore the self argument for methods
+		self.offset = 1 if len(params) > 0 and params[0] == u'self' else 0
+		params = params[self.offset:]
+		self.nParams = len(params)
+		self.hasArgumentList = argSpec.varargs is not None
+		self.hasKeywordDict = argSpec.keywords is not None
+		specs = {}
+		if u'arguments' in _dict:
+			specs.update(_dict[u'arguments'])
+		if u'keywords' in _dict:
+			specs.update(_dict[u'keywords'])
+		# Positional checks are (index, types, predicate, valid, msg) tuples,
+		# and only exist for parameters that are actually constrained.
+		self.positional = []
+		# Keyword checks map parameter names onto (types, predicate, valid,
+		# msg) tuples, or None for parameters that are not constrained.
+		self.keywords = {}
+		for i, param in enumerate(params):
+			spec = specs.get(param, {})
+			check = compileSpec(spec)
+			if check is None:
+				self.keywords[param] = None
+				continue
+			msg = u'%s(): Invalid type or value for argument "%s".' \
+				% (self.name, i+1) + specMessage(spec)
+			self.positional.append((i+self.offset,) + check + (msg,))
+			msg = u'%s(): Invalid type or value for keyword "%s".' \
+				% (self.name, param) + specMessage(spec)
+			self.keywords[param] = check + (msg,)
+		for param in kwonlyArgs:
+			spec = specs.get(param, {})
+			check = compileSpec(spec)
+			if check is None:
+				self.keywords[param] = None
+				continue
+			msg = u'%s(): Invalid type or value for keyword "%s".' \
+				% (self.name, param) + specMessage(spec)
+			self.keywords[param] = check + (msg,)
+		self.returns = None
+		if u'returns' in _dict:
+			spec = _dict[u'returns']
+			check = compileSpec(spec)
+			if check is not None:
+				self.returns = check + (u'%s(): Return value should be of ' \
+					u'type(s) %s, not %%s' % (self.name, spec.get(u'type')),)
+		self.yields = None
+		if u'yields' in _dict:
+			spec = _dict[u'yields']
+			check = compileSpec(spec)
+			if check is not None:
+				self.yields = check + (u'%s(): Invalid type or value for ' \
+					u'yielded item of type %%s.' % self.name + \
+					specMessage(spec),)
+
+	def checkArguments(self, args, kwargs):
+
+		"""
+		desc:
+			Checks positional and keyword arguments.
+
+		arguments:
+			args:
+				desc:	A tuple of positional arguments.
+				type:	tuple
+			kwargs:
+				desc:	A dict of keyword arguments.
+				type:	dict
+		"""
+
+		nArgs = len(args)
+		if nArgs - self.offset > self.nParams and not self.hasArgumentList:
+			raise InvalidArgument(
+				u'%s(): Too many arguments. Expecting at most %d.' \
+				% (self.name, self.nParams))
+		for i, types, predicate, valid, msg in self.positional:
+			if i >= nArgs:
+				break
+			val = args[i]
+			if (types is not None and not isinstance(val, types) and \
+				(predicate is None or not predicate(val))) \
+				or (valid is not None and val not in valid):
+				raise InvalidArgument(msg)
+		if not kwargs:
+			return
+		keywords = self.keywords
+		for kw, val in kwargs.items():
+			if kw not in keywords:
+				if self.hasKeywordDict:
+					continue
+				raise InvalidKeyword(u'%s(): Unexpected keyword: %s' \
+					% (self.name, kw))
+			check = keywords[kw]
+			if check is None:
+				continue
+			types, predicate, valid, msg = check
+			if (types is not None and not isinstance(val, types) and \
+				(predicate is None or not predicate(val))) \
+				or (valid is not None and val not in valid):
+				raise InvalidKeyword(msg)
+
+	def checkReturnValue(self, retVal):
+
+		"""
+		desc:
+			Checks a return value.
+
+		arguments:
+			retVal:		The return value.
+		"""
+
+		types, predicate, valid, msg = self.returns
+		if (types is not None and not isinstance(retVal, types) and \
+			(predicate is None or not predicate(retVal))) \
+			or (valid is not None and retVal not in valid):
+			raise InvalidReturnValue(msg % retVal.__class__.__name__)
+
+	def checkItem(self, item):
+
+		"""
+		desc:
+			Checks an item that is yielded by a generator or iterator.
+
+		arguments:
+			item:		The item.
+		"""
+
+		types, predicate, valid, msg = self.yields
+		if (types is not None and not isinstance(item, types) and \
+			(predicate is None or not predicate(item))) \
+			or (valid is not None and item not in valid):
+			raise InvalidYieldValue(msg % item.__class__.__name__)
+
+class ItemChecker(object):
+
+	"""
+	desc:
+		The base class for objects that check the items of an iterator as
+		they are consumed, so that the iterator is never materialized.
+
+	visible:	False
+	"""
+
+	def __init__(self, check, sampleRate):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			check:		A function that checks a single item.
+			sampleRate:
+				desc:	N, such that one in every N items is checked,
+						starting with the first item.
+				type:	int
+		"""
+
+		self.check = check
+		self.sampleRate = sampleRate
+		self.count = 0
+
+	def checked(self, item):
+
+		"""
+		desc:
+			Checks an item, if it is sampled.
+
+		arguments:
+			item:		The item.
+
+		returns:
+			The item.
+		"""
+
+		if self.count % self.sampleRate == 0:
+			self.check(item)
+		self.count += 1
+		return item
+
+class ValidatedIterator(ItemChecker):
+
+	"""
+	desc:
+		Wraps an iterator that is not a generator, or a generator on Python
+		2, and checks items as they are consumed. The `send()`, `throw()`,
+		and `close()` methods of generators are passed on.
+
+	visible:	False
+	"""
+
+	def __init__(self, it, check, sampleRate):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			it:			The iterator.
+			check:		A function that checks a single item.
+			sampleRate:
+				desc:	N, such that one in every N items is checked.
+				type:	int
+		"""
+
+		super(ValidatedIterator, self).__init__(check, sampleRate)
+		self.it = it
+
+	def __iter__(self):
+
+		return self
+
+	def __next__(self):
+
+		return self.checked(next(self.it))
+
+	next = __next__
+
+	def send(self, value):
+
+		return self.checked(self.it.send(value))
+
+	def throw(self, *args):
+
+		return self.checked(self.it.throw(*args))
+
+	def close(self):
+
+		return self.it.close()
+
+class ValidatedAsyncIterator(ItemChecker):
+
+	"""
+	desc:
+		Wraps an asynchronous iterator, such as an asynchronous generator,
+		and checks items as they are consumed. The `asend()`, `athrow()`, and
+		`aclose()` methods of asynchronous generators are passed on.
+
+	visible:	False
+	"""
+
+	def __init__(self, it, check, sampleRate):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			it:			The asynchronous iterable.
+			check:		A function that checks a single item.
+			sampleRate:
+				desc:	N, such that one in every N items is checked.
+				type:	int
+		"""
+
+		super(ValidatedAsyncIterator, self).__init__(check, sampleRate)
+		self.it = it.__aiter__()
+
+	def __aiter__(self):
+
+		return self
+
+	def __anext__(self):
+
+		return ValidatedAwaitable(self.it.__anext__(), self.checked)
+
+	def asend(self, value):
+
+		return ValidatedAwaitable(self.it.asend(value), self.checked)
+
+	def athrow(self, *args):
+
+		return ValidatedAwaitable(self.it.athrow(*args), self.checked)
+
+	def aclose(self):
+
+		return self.it.aclose()
+
+class ValidatedAwaitable(object):
+
+	"""
+	desc:
+		Wraps an awaitable, and checks its result. This is implemented as an
+		iterator that delegates to the iterator of the awaitable, so that no
+		syntax is needed that is specific to Python 3.
+
+	visible:	False
+	"""
+
+	def __init__(self, awaitable, checked):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			awaitable:	The awaitable.
+			checked:	A function that checks the result.
+		"""
+
+		self.awaitable = awaitable
+		self.checked = checked
+		self.it = None
+
+	def __await__(self):
+
+		self.it = self.awaitable.__await__()
+		return self
+
+	def __iter__(self):
+
+		return self
+
+	def __next__(self):
+
+		return self.send(None)
+
+	next = __next__
+
+	def send(self, value):
+
+		try:
+			return self.it.send(value)
+		except StopIteration as e:
+			# The awaitable is done, and its result is the item
+			self.checked(e.value)
+			raise
+
+	def throw(self, *args):
+
+		try:
+			return self.it.throw(*args)
+		except StopIteration as e:
+			self.checked(e.value)
+			raise
+
+	def close(self):
+
+		return self.it.close()
+
+def validateItems(retVal, check, sampleRate):
+
+	"""
+	desc:
+		Validates the items that a function returns. Iterators, such as
+		generators, and asynchronous iterables, such as asynchronous
+		generators, are wrapped so that items are checked as they are
+		consumed; generators are wrapped in generators. Other iterables that
+		have a length, such as lists, strings, and range objects, are checked
+		right away, and returned as they are. Iterables without a length are
+		returned as they are, because they may be infinite.
+
+	visible:	False
+
+	arguments:
+		retVal:		The return value.
+		check:		A function that checks a single item.
+		sampleRate:
+			desc:	N, such that one in every N items is checked.
+			type:	int
+
+	returns:
+		The wrapped iterator, or the return value itself.
+	"""
+
+	if hasattr(retVal, u'__aiter__'):
+		return ValidatedAsyncIterator(retVal, check, sampleRate)
+	if not hasattr(retVal, u'__iter__') and \
+		not hasattr(retVal, u'__getitem__'):
+		raise InvalidYieldValue(
+			u'Return value should be iterable, not %s' \
+			% retVal.__class__.__name__)
+	if validatedGenerator is not None and inspect.isgenerator(retVal):
+		return validatedGenerator(retVal, check, sampleRate)
+	if hasattr(retVal, u'__next__') or hasattr(retVal, u'next'):
+		return ValidatedIterator(retVal, check, sampleRate)
+	if hasattr(retVal, u'__len__'):
+		for i, item in enumerate(retVal):
+			if i % sampleRate == 0:
+				check(item)
+	return retVal
+
+def validate(func=None, sampleRate=None, itemSampleRate=1):
 
 	"""
 	desc:
 		A decorator to validate arguments and return values for a function or
 		method. This decorator allows you to fully specify and check the input
 		and output of a function or method through a properly formatted
-		docstring.
+		docstring. How often a function is validated depends on the
+		validation mode (see [setValidationMode]). Validated functions can be
+		instrumented to measure the overhead of validation (see
+		[setInstrumentation]).
 
 	example: |
 
@@ -85,12 +871,78 @@ def validate(func):
 
 			return True
 
-	arguments:
+		# In 'sample' mode, validate only one in 1000 calls of this function
+		@yamldoc.validate(sampleRate=1000)
+		def hot(a):
+
+			pass
+
+		# Items are checked as they are consumed, here one in every 100
+		@yamldoc.validate(itemSampleRate=100)
+		def stream(n):
+
+			\"\"\"
+			desc:
+				Example generator.
+
+			arguments:
+				n:
+					desc:	The number of items.
+					type:	int
+
+			yields:
+				desc:	Items.
+				type:	int
+			\"\"\"
+
+			for i in range(n):
+				yield i
+
+	keywords:
 		func:
-			desc:	The function to validate.
-			type:	[function, method]
+			desc:	The function to validate. If no function is passed,
+					a decorator is returned, so that you can specify keywords.
+			type:	[function, method, NoneType]
+		sampleRate:
+			desc:	N, such that one in every N calls is validated in 'sample'
+					mode, or None to use the rate for the function's module
+					(see [setSampleRate]).
+			type:	[int, NoneType]
+		itemSampleRate:
+			desc:	N, such that one in every N items that a generator or
+					iterator yields is checked against the `yields` section,
+					starting with the first item.
+			type:	int
 	"""
 
+	if sampleRate is not None and (not isinstance(sampleRate, int) or
+		sampleRate < 1):
+		raise YAMLDocError(u'The sample rate should be a positive integer')
+	if not isinstance(itemSampleRate, int) or itemSampleRate < 1:
+		raise YAMLDocError(
+			u'The item sample rate should be a positive integer')
+	if func is None:
+		return lambda func: validate(func, sampleRate=sampleRate,
+			itemSampleRate=itemSampleRate)
+	if _mode == u'off':
+		return func
+	if _mode == u'sample':
+		if sampleRate is None:
+			sampleRate = sampleRateFor(func)
+	else:
+		sampleRate = 1
+	# The docstring is parsed and compiled into a validation plan only once,
+	# so that calling the decorated function is cheap.
+	argSpec = getargspec(func)
+	_dict = FunctionDoc(func)._dict()
+	kwonlyArgs = getkwonlyargs(func)
+	plan = ValidationPlan(func, argSpec, _dict, kwonlyArgs[0])
+	checkArguments = plan.checkArguments
+	checkReturnValue = plan.checkReturnValue if plan.returns is not None \
+		else None
+	checkItem = plan.checkItem if plan.yields is not None else None
+	counter = itertools.count()
+
 	def inner(*args, **kwargs):
 
 		"""
@@ -108,64 +960,102 @@ def validate(func):
 			The function's return value.
 		"""
 
-
-		# First check all arguments. Because keywords can also be passed as
-		# regular arguments, we treat these as regular arguments as well.
-		argSpec = []
-		if u'arguments' in inner._dict:
-			argSpec += inner._dict[u'arguments'].values()
-		if u'keywords' in inner._dict:
-			argSpec += inner._dict[u'keywords'].values()
-		# Ignore the self argument for methods
-		_args = list(args)
-		if inner.__argspec__.args is not None and inner.__argspec__.args[0] == \
-			u'self':
-			_args = _args[1:]
-		if len(_args) > len(argSpec):
-			raise InvalidArgument(
-				u'%s(): Too many arguments. Expecting at most %d.' \
-				% (func.__name__, len(argSpec)))
-		for i in range(len(_args)):
-			if not checkVal(_args[i], argSpec[i]):
-				msg = u'%s(): Invalid type or value for argument "%s".' \
-					% (func.__name__, i+1)
-				if u'type' in argSpec[i]:
-					msg += u' Type should be one of "%s"' % argSpec[i][u'type']
-				if u'valid' in argSpec[i]:
-					msg += u' Value should be one of "%s"' \
-						% argSpec[i][u'valid']
-				raise InvalidArgument(msg)
-		# Next check the keyword arguments
-		kwSpec = {}
-		if u'keywords' in inner._dict:
-			kwSpec.update(inner._dict[u'keywords'])
-		for kw, val in kwargs.items():
-			if kw not in kwSpec:
-				raise InvalidKeyword(u'%s(): Unexpected keyword: %s' \
-					% (func.__name__, kw))
-			if not checkVal(kwargs[kw], kwSpec[kw]):
-				msg = u'%s(): Invalid type or value for keyword "%s".' \
-					% (func.__name__, kw)
-				if u'type' in kwSpec[kw]:
-					msg += u' Type should be one of "%s"' % kwSpec[kw][u'type']
-				if u'valid' in kwSpec[kw]:
-					msg += u' Value should be one of "%s"' \
-						% kwSpec[kw][u'valid']
-				raise InvalidKeyword(msg)
-		# Call the function
+		checkArguments(args, kwargs)
 		retVal = func(*args, **kwargs)
-		# Check the return value
-		if u'returns' in inner._dict:
-			if not checkVal(retVal, inner._dict[u'returns']):
-				raise InvalidReturnValue(
-					u'%s(): Return value should be of type(s) %s, not %s' \
-					% (func.__name__, inner._dict[u'returns'][u'type'],
-					retVal.__class__.__name__))
+		if checkReturnValue is not None:
+			checkReturnValue(retVal)
+		if checkItem is not None:
+			retVal = validateItems(retVal, checkItem, itemSampleRate)
 		return retVal
 
+	def sampledInner(*args, **kwargs):
+
+		"""
+		desc:
+			The decorator inner function for 'sample' mode, which validates
+			only one in every N calls.
+		"""
+
+		if next(counter) % sampleRate:
+			return func(*args, **kwargs)
+		return inner(*args, **kwargs)
+
+	def instrumentedInner(*args, **kwargs):
+
+		"""
+		desc:
+			The decorator inner function when instrumentation is enabled,
+			which keeps track of calls, failures, and timing.
+		"""
+
+		stats.calls += 1
+		if sampleRate > 1 and next(counter) % sampleRate:
+			t0 = timer()
+			try:
+				return func(*args, **kwargs)
+			finally:
+				stats.functionTime += timer() - t0
+		stats.validatedCalls += 1
+		t0 = timer()
+		try:
+			checkArguments(args, kwargs)
+		except InvalidArgument:
+			stats.argumentFailures += 1
+			raise
+		except InvalidKeyword:
+			stats.keywordFailures += 1
+			raise
+		finally:
+			t1 = timer()
+			stats.validationTime += t1 - t0
+		try:
+			retVal = func(*args, **kwargs)
+		finally:
+			t2 = timer()
+			stats.functionTime += t2 - t1
+		if checkReturnValue is not None:
+			try:
+				checkReturnValue(retVal)
+			except InvalidReturnValue:
+				stats.returnFailures += 1
+				raise
+			finally:
+				stats.validationTime += timer() - t2
+		if checkItem is not None:
+			retVal = validateItems(retVal, instrumentedCheckItem,
+				itemSampleRate)
+		return retVal
+
+	def instrumentedCheckItem(item):
+
+		"""
+		desc:
+			Checks a yielded item when instrumentation is enabled, which keeps
+			track of failures and timing.
+		"""
+
+		t0 = timer()
+		try:
+			checkItem(item)
+		except InvalidYieldValue:
+			stats.yieldFailures += 1
+			raise
+		finally:
+			stats.validationTime += timer() - t0
+
+	if _instrument:
+		stats = statsFor(func)
+		wrapper = instrumentedInner
+	elif sampleRate == 1:
+		wrapper = inner
+	else:
+		wrapper = sampledInner
 	# We need to copy the docstring and argument specification, otherwise using
 	# this decorator will break the documentation functions.
-	inner.__doc__ = func.__doc__
-	inner.__argspec__ = inspect.getargspec(func)
-	inner._dict = FunctionDoc(func)._dict()
-	return inner
+	wrapper.__doc__ = func.__doc__
+	wrapper.__name__ = func.__name__
+	wrapper.__argspec__ = argSpec
+	wrapper.__kwonlyargs__ = kwonlyArgs
+	wrapper._dict = _dict
+	wrapper._plan = plan
+	return wrapper
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# This module is only imported on Python 3, because generators cannot return
+# a value on Python 2.
+
+import sys
+
+def validatedGenerator(gen, check, sampleRate):
+
+	"""
+	desc:
+		Wraps a generator in another generator that checks items as they are
+		consumed. Values and exceptions that are passed to `send()` and
+		`throw()`, closing, and the return value are passed on, so that the
+		wrapper can be used just like the generator itself.
+
+	visible:	False
+
+	arguments:
+		gen:		The generator.
+		check:		A function that checks a single item.
+		sampleRate:
+			desc:	N, such that one in every N items is checked, starting
+					with the first item.
+			type:	int
+
+	returns:
+		A generator.
+	"""
+
+	try:
+		item = next(gen)
+	except StopIteration as e:
+		return e.value
+	count = 0
+	while True:
+		# The item is checked outside of the try block, so that an invalid
+		# item is not thrown into the generator.
+		if count % sampleRate == 0:
+			check(item)
+		count += 1
+		try:
+			value = yield item
+		except GeneratorExit:
+			gen.close()
+			raise
+		except BaseException:
+			try:
+				item = gen.throw(*sys.exc_info())
+			except StopIteration as e:
+				return e.value
+		else:
+			try:
+				item = gen.send(value)
+			except StopIteration as e:
+				return e.value
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+
+"""
+This file is part of YAMLDoc.
+
+YAMLDoc is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+YAMLDoc is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with YAMLDoc.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from yamldoc.py3compat import *
+import os
+import sys
+import time
+from yamldoc._build import PackageBuild, findModules
+
+class Watcher(object):
+
+	"""
+	desc:
+		Keeps the documentation of a package up to date while its source is
+		being edited. The modification times of the source files are polled,
+		so that no file-system notification library is needed. When files
+		change, the watcher waits until they have been quiet for a moment,
+		and then updates the documentation incrementally (see
+		[PackageBuild.update]). Only the changed modules, and the modules that
+		import them, are documented again. Modules are always documented in
+		fresh worker processes, so that edited modules are actually reloaded.
+
+	example: |
+		import yamldoc
+
+		yamldoc.Watcher(u'mypackage', u'doc').watch()
+	"""
+
+	def __init__(self, package, outDir, interval=.5, debounce=.3,
+		stream=None, **kwargs):
+
+		"""
+		desc:
+			Constructor.
+
+		arguments:
+			package:
+				desc:	The name of the package.
+				type:	[str, unicode]
+			outDir:
+				desc:	The output folder.
+				type:	[str, unicode]
+
+		keywords:
+			interval:
+				desc:	The interval in seconds at which the source files are
+						polled.
+				type:	[int, float]
+			debounce:
+				desc:	The time in seconds during which no further changes
+						should occur before the documentation is updated.
+				type:	[int, float]
+			stream:
+				desc:	A file-like object to report progress to, or None to
+						use `sys.stderr`.
+
+		keyword-dict:
+			kwargs:		Keywords that are passed to [PackageBuild].
+		"""
+
+		self.package = package
+		self.outDir = outDir
+		self.interval = interval
+		self.debounce = debounce
+		self.stream = sys.stderr if stream is None else stream
+		kwargs[u'isolated'] = True
+		self.kwargs = kwargs
+		self.mtimes = {}
+
+	def snapshot(self):
+
+		"""
+		desc:
+			Gets the modification times of the source files of the package.
+			New and removed modules are detected as well, because modules are
+			found again each time.
+
+		visible:	False
+
+		returns:
+			desc:	A dict with paths as keys and modification times as
+					values.
+			type:	dict
+		"""
+
+		mtimes = {}
+		for name, path in findModules(self.package):
+			if path is None:
+				continue
+			try:
+				mtimes[path] = os.stat(path).st_mtime
+			except OSError:
+				pass
+		return mtimes
+
+	def report(self, msg):
+
+		"""
+		desc:
+			Reports progress.
+
+		visible:	False
+
+		arguments:
+			msg:	The message.
+		"""
+
+		self.stream.write(msg + u'\n')
+		self.stream.flush()
+
+	def update(self):
+
+		"""
+		desc:
+			Updates the documentation, and reports which modules were
+			documented again and how long that took.
+
+		returns:
+			desc:	The build.
+			type:	PackageBuild
+		"""
+
+		t0 = time.time()
+		build = PackageBuild(self.package, **self.kwargs).update(self.outDir)
+		latency = time.time() - t0
+		if build.rendered:
+			self.report(u'Documented %s in %.2f s' % (
+				u', '.join(build.rendered), latency))
+		else:
+			self.report(u'Up to date (%.2f s)' % latency)
+		for name, error in build.errors.items():
+			self.report(u'Failed to document %s\n%s' % (name, error))
+		return build
+
+	def poll(self):
+
+		"""
+		desc:
+			Checks once whether source files have changed, and if so waits
+			for the changes to settle and updates the documentation.
+
+		returns:
+			desc:	The build, or None if nothing changed.
+			type:	[PackageBuild, NoneType]
+		"""
+
+		mtimes = self.snapshot()
+		if mtimes == self.mtimes:
+			return None
+		# Debounce: editors often write files in several steps, and several
+		# files may be saved at once.
+		while True:
+			time.sleep(self.debounce)
+			settled = self.snapshot()
+			if settled == mtimes:
+				break
+			mtimes = settled
+		self.mtimes = mtimes
+		return self.update()
+
+	def watch(self, maxUpdates=None):
+
+		"""
+		desc:
+			Updates the documentation once, and then keeps updating it when
+			source files change, until interrupted with Ctrl+C.
+
+		keywords:
+			maxUpdates:
+				desc:	The maximum number of updates after the first one, or
+						None to keep watching indefinitely.
+				type:	[int, NoneType]
+		"""
+
+		self.mtimes = self.snapshot()
+		self.update()
+		self.report(u'Watching %s for changes (Ctrl+C to stop)' % \
+			self.package)
+		updates = 0
+		try:
+			while maxUpdates is None or updates < maxUpdates:
+				if self.poll() is not None:
+					updates += 1
+				else:
+					time.sleep(self.interval)
+		except KeyboardInterrupt:
+			pass
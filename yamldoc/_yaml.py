@@ -19,20 +19,35 @@ from yamldoc.py3compat import *
 import yaml
 from collections import OrderedDict
 
-def orderedLoad(stream, Loader=yaml.Loader, object_pairs_hook=OrderedDict):
+# Use the fast libyaml-based loader if it is available. We only use safe
+# loaders, because docstrings should never construct arbitrary Python objects.
+try:
+	from yaml import CSafeLoader as SafeLoader
+	libyaml = True
+except ImportError:
+	from yaml import SafeLoader
+	libyaml = False
+
+def orderedLoader(Loader=SafeLoader, object_pairs_hook=OrderedDict):
 
 	"""
 	desc:
-		Loads YAML strings while treating dictionaries as OrderedDict objects,
-		so that argument order is preserved.
+		Creates a YAML loader class that constructs mappings with a specific
+		function, so that key order can be preserved.
 
-	arguments:
-		stream:
-			desc:	YAML text.
-			type:	[str, unicode]
+	visible:	False
+
+	keywords:
+		Loader:
+			desc:	The YAML loader class to derive from.
+			type:	type
+		object_pairs_hook:
+			desc:	A function that constructs a mapping from a list of
+					key-value pairs.
 
 	returns:
-		desc:	A data structure.
+		desc:	A loader class.
+		type:	type
 	"""
 
 	class OrderedLoader(Loader):
@@ -43,4 +58,40 @@ def orderedLoad(stream, Loader=yaml.Loader, object_pairs_hook=OrderedDict):
 	OrderedLoader.add_constructor(
 		yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
 		construct_mapping)
-	return yaml.load(stream, OrderedLoader)
+	return OrderedLoader
+
+# The loader that is used by default. Other loaders are created when they are
+# first requested, and then reused.
+OrderedLoader = orderedLoader()
+_loaders = {(SafeLoader, OrderedDict) : OrderedLoader}
+
+def orderedLoad(stream, Loader=SafeLoader, object_pairs_hook=OrderedDict):
+
+	"""
+	desc:
+		Loads YAML strings while treating dictionaries as OrderedDict objects,
+		so that argument order is preserved. By default, the safe loader from
+		libyaml is used if available, and the safe pure-Python loader
+		otherwise.
+
+	arguments:
+		stream:
+			desc:	YAML text.
+			type:	[str, unicode]
+
+	keywords:
+		Loader:
+			desc:	The YAML loader class to derive from.
+			type:	type
+		object_pairs_hook:
+			desc:	A function that constructs a mapping from a list of
+					key-value pairs.
+
+	returns:
+		desc:	A data structure.
+	"""
+
+	key = Loader, object_pairs_hook
+	if key not in _loaders:
+		_loaders[key] = orderedLoader(Loader, object_pairs_hook)
+	return yaml.load(stream, _loaders[key])
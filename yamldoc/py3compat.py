@@ -18,6 +18,8 @@ along with zoteromarkdown.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import sys
+import inspect
+from collections import namedtuple
 
 if sys.version_info >= (3,0,0):
 	py3 = True
@@ -37,7 +39,29 @@ def safe_encode(s, enc='utf-8', errors='strict'):
 		return s
 	return s.encode(enc, errors)
 
-__all__ = ['py3', 'safe_decode', 'safe_encode']
+if not hasattr(inspect, 'getfullargspec'):
+	ArgSpec = inspect.ArgSpec
+	getargspec = inspect.getargspec
+	def getkwonlyargs(func):
+		return [], {}
+else:
+	# inspect.getargspec() has been removed in Python 3.11, and fails for
+	# functions with keyword-only arguments before that. We emulate it with
+	# getfullargspec(), so that the rest of the code can keep using the
+	# (args, varargs, keywords, defaults) tuple.
+	ArgSpec = namedtuple('ArgSpec', ['args', 'varargs', 'keywords',
+		'defaults'])
+	def getargspec(func):
+		spec = inspect.getfullargspec(func)
+		return ArgSpec(spec.args, spec.varargs, spec.varkw, spec.defaults)
+	# Keyword-only arguments are returned separately, as a list of names and
+	# a dict of defaults for those that have one.
+	def getkwonlyargs(func):
+		spec = inspect.getfullargspec(func)
+		return list(spec.kwonlyargs), dict(spec.kwonlydefaults or {})
+
+__all__ = ['py3', 'safe_decode', 'safe_encode', 'getargspec',
+	'getkwonlyargs']
 if not py3:
 	__all__ += ['str', 'bytes']
 else: